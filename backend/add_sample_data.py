@@ -65,17 +65,12 @@ def add_sample_notes():
     
     logger.info("Örnek notlar ekleniyor...")
     
-    for note in sample_notes:
-        note_id = firebase_service.create_note(
-            title=note["title"],
-            content=note["content"],
-            user_id=note["user_id"]
-        )
-        
-        if note_id:
-            logger.info(f"✓ Not eklendi: {note['title']} (ID: {note_id})")
-        else:
-            logger.error(f"✗ Not eklenemedi: {note['title']}")
+    # Tek tek set yerine BulkWriter ile toplu yaz
+    counts = firebase_service.create_notes_bulk(sample_notes)
+    logger.info(f"✓ {counts['written']} not eklendi")
+    if counts["failed"] or counts["invalid"]:
+        logger.error(f"✗ {counts['failed'] + counts['invalid']} not eklenemedi")
+        return False
     
     return True
 
@@ -136,18 +131,11 @@ def add_sample_events():
     
     logger.info("Örnek toplantılar ekleniyor...")
     
-    for event in sample_events:
-        event_id = firebase_service.create_event(
-            title=event["title"],
-            datetime_str=event["datetime"],
-            description=event["description"],
-            user_id=event["user_id"]
-        )
-        
-        if event_id:
-            logger.info(f"✓ Etkinlik eklendi: {event['title']} (ID: {event_id})")
-        else:
-            logger.error(f"✗ Etkinlik eklenemedi: {event['title']}")
+    counts = firebase_service.create_events_bulk(sample_events)
+    logger.info(f"✓ {counts['written']} etkinlik eklendi")
+    if counts["failed"] or counts["invalid"]:
+        logger.error(f"✗ {counts['failed'] + counts['invalid']} etkinlik eklenemedi")
+        return False
     
     return True
 
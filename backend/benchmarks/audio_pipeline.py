@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Ses pipeline benchmark'ı - eski geçici dosyalı yol ile bellek içi yolu karşılaştırır
+
+Kullanım (backend klasöründen):
+    python benchmarks/audio_pipeline.py [--repeat 5] [--backend google]
+
+Sentetik klipler ffmpeg ile üretilir. Decode sonrası NumPy ön işlemesinin (sessizlik
+kırpma + 16 kHz) süresi ve recognizer'a giden yükün önce/sonra boyutu raporlanır.
+--backend verilirse tanıma süresi de ham ve ön işlenmiş PCM için ölçülür.
+"""
+
+import os
+import io
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from fastapi import UploadFile
+from pydub import AudioSegment
+from services.audio_service import AudioService
+from services.stt_backends import STT_BACKENDS
+
+FORMATS = {
+    "wav": ["-c:a", "pcm_s16le"],
+    "m4a": ["-c:a", "aac"],
+    "webm": ["-c:a", "libopus"]
+}
+DURATIONS = [3, 15, 60]
+
+def make_clip(ffmpeg: str, audio_format: str, seconds: int) -> bytes:
+    """Konuşmaya benzer sentetik klip üret (gürültü + sessizlik aralıkları)"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, f"clip.{audio_format}")
+        subprocess.run([
+            ffmpeg, "-nostdin", "-loglevel", "error", "-y",
+            "-f", "lavfi", "-i", f"anoisesrc=d={seconds}:c=pink:r=44100:a=0.3",
+            "-af", "volume='if(lt(mod(t,2),1.2),1,0.02)':eval=frame",
+            "-ac", "2", *FORMATS[audio_format], path
+        ], check=True)
+        with open(path, "rb") as f:
+            return f.read()
+
+def legacy_decode(data: bytes, audio_format: str):
+    """Eski yol: upload -> geçici dosya -> pydub -> geçici WAV -> sr.AudioFile"""
+    import speech_recognition as sr
+    disk_bytes = 0
+    paths = []
+    try:
+        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{audio_format}") as temp_file:
+            temp_file.write(data)
+            paths.append(temp_file.name)
+        disk_bytes += len(data)
+
+        audio = AudioSegment.from_file(paths[0])
+        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_wav:
+            paths.append(temp_wav.name)
+        audio.export(paths[1], format="wav")
+        disk_bytes += os.path.getsize(paths[1])
+
+        with sr.AudioFile(paths[1]) as source:
+            sr.Recognizer().record(source)
+        return disk_bytes
+    finally:
+        for path in paths:
+            if os.path.exists(path):
+                os.unlink(path)
+
+async def in_memory_decode(service: AudioService, data: bytes, audio_format: str):
+    """Yeni yol: upload tek tampona okunur -> ffmpeg stdin'ine (veya memfd) verilir -> PCM"""
+    before = service.stats["disk_bytes_written"]
+    upload = UploadFile(io.BytesIO(data), filename=f"clip.{audio_format}")
+    audio_data = await service.decode_upload(upload)
+    return audio_data, service.stats["disk_bytes_written"] - before
+
+def recognize_ms(backend, audio_data) -> float:
+    import speech_recognition as sr
+    started = time.perf_counter()
+    try:
+        backend.recognize(audio_data)
+    except (sr.UnknownValueError, sr.RequestError):
+        pass
+    return (time.perf_counter() - started) * 1000
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+async def main():
+    parser = argparse.ArgumentParser(description="Ses pipeline benchmark'ı")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--backend", choices=list(STT_BACKENDS), help="Tanıma süresini de ölç")
+    args = parser.parse_args()
+
+    service = AudioService()
+    service.start()
+    backend = STT_BACKENDS[args.backend]() if args.backend else None
+    print(f"{'klip':<14}{'yol':<11}{'ms (medyan)':>12}{'disk bayt':>12}")
+    preprocess_rows = []
+
+    for audio_format in FORMATS:
+        for seconds in DURATIONS:
+            data = make_clip(service.ffmpeg, audio_format, seconds)
+            name = f"{audio_format}/{seconds}s"
+
+            try:
+                timings = []
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    disk_bytes = legacy_decode(data, audio_format)
+                    timings.append(time.perf_counter() - started)
+                print(f"{name:<14}{'legacy':<11}{median(timings) * 1000:>12.1f}{disk_bytes:>12}")
+            except Exception as e:
+                print(f"{name:<14}{'legacy':<11}{'hata':>12}  {str(e)[:40]}")
+
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                audio_data, disk_bytes = await in_memory_decode(service, data, audio_format)
+                timings.append(time.perf_counter() - started)
+            print(f"{name:<14}{'in-memory':<11}{median(timings) * 1000:>12.1f}{disk_bytes:>12}")
+
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                processed = await service.preprocess(audio_data)
+                timings.append(time.perf_counter() - started)
+            row = [name, len(audio_data.frame_data), len(processed.frame_data), median(timings) * 1000]
+            if backend:
+                row += [recognize_ms(backend, audio_data), recognize_ms(backend, processed)]
+            preprocess_rows.append(row)
+
+    print(f"\n{'klip':<14}{'ham bayt':>12}{'işlenmiş':>12}{'ön işleme ms':>14}"
+          + (f"{'tanıma ms (ham)':>17}{'tanıma ms (işl.)':>18}" if backend else ""))
+    for row in preprocess_rows:
+        line = f"{row[0]:<14}{row[1]:>12}{row[2]:>12}{row[3]:>14.1f}"
+        if backend:
+            line += f"{row[4]:>17.1f}{row[5]:>18.1f}"
+        print(line)
+
+    print(f"\ndecoder havuzu: {service.decoder_pool.stats()}")
+    service.shutdown()
+
+if __name__ == "__main__":
+    asyncio.run(main())
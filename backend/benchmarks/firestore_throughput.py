@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Firestore benchmark'ı - async route içinden senkron client ile AsyncClient'ı karşılaştırır
+
+Kullanım (backend klasöründen, Firestore emulator'ü çalışırken):
+    gcloud emulators firestore start --host-port=localhost:8080
+    FIRESTORE_EMULATOR_HOST=localhost:8080 python benchmarks/firestore_throughput.py [--concurrency 1,10,50]
+
+Her eşzamanlılık seviyesinde N coroutine, route'ların yaptığı işi taklit eder
+(not oluştur + kullanıcının notlarını ve etkinliklerini oku). "sync" modunda
+FirebaseService doğrudan coroutine içinden çağrılır (eski router'lar gibi event
+loop bloklanır), "async" modunda AsyncFirebaseService await edilir.
+Saniyedeki istek, p50/p95 gecikme ve en uzun event loop gecikmesi raporlanır.
+"""
+
+import os
+import sys
+import time
+import uuid
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+if not os.getenv("FIRESTORE_EMULATOR_HOST"):
+    sys.exit("❌ FIRESTORE_EMULATOR_HOST tanımlı değil - benchmark yalnızca emulator'e karşı çalışır")
+# Emulator ile credential gerekmez, proje adı yeterli
+os.environ.setdefault("GOOGLE_CLOUD_PROJECT", "firestore-benchmark")
+os.environ.pop("FIREBASE_SERVICE_ACCOUNT_KEY_PATH", None)
+
+from services.firebase_service import FirebaseService
+from services.async_firebase_service import AsyncFirebaseService
+
+def percentile(values, fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+async def sync_request(service: FirebaseService, user_id: str):
+    service.create_note("benchmark", "içerik", user_id)
+    service.get_notes(user_id)
+    service.get_events(user_id)
+
+async def async_request(service: AsyncFirebaseService, user_id: str):
+    await service.create_note("benchmark", "içerik", user_id)
+    await service.get_notes(user_id)
+    await service.get_events(user_id)
+
+async def measure_loop_lag(stop: asyncio.Event, interval: float = 0.01):
+    """Event loop'un zamanında uyanamadığı en uzun süre (ms)"""
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - started - interval)
+    return worst * 1000
+
+async def run_level(mode: str, service, concurrency: int, requests_per_worker: int):
+    handler = sync_request if mode == "sync" else async_request
+    latencies = []
+
+    async def worker(index: int):
+        user_id = f"bench-{uuid.uuid4().hex[:8]}-{index}"
+        for _ in range(requests_per_worker):
+            started = time.perf_counter()
+            await handler(service, user_id)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_loop_lag(stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    loop_lag = await lag_task
+
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.5),
+        "p95_ms": percentile(latencies, 0.95),
+        "loop_lag_ms": loop_lag
+    }
+
+async def run_all(concurrency_levels, requests_per_worker: int):
+    # AsyncClient'ın gRPC kanalı oluşturulduğu event loop'a bağlı - hepsi tek loop'ta
+    sync_service = FirebaseService()
+    async_service = AsyncFirebaseService()
+    if not sync_service.is_available() or not async_service.is_available():
+        sys.exit("❌ Firestore client'ları başlatılamadı")
+
+    print(f"{'mod':<8}{'eşzamanlı':>10}{'istek/sn':>11}{'p50 ms':>10}{'p95 ms':>10}{'loop gecikme':>14}")
+    for concurrency in concurrency_levels:
+        for mode, service in (("sync", sync_service), ("async", async_service)):
+            row = await run_level(mode, service, concurrency, requests_per_worker)
+            print(f"{mode:<8}{concurrency:>10}{row['rps']:>11.1f}{row['p50_ms']:>10.1f}"
+                  f"{row['p95_ms']:>10.1f}{row['loop_lag_ms']:>14.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Firestore sync vs async throughput benchmark'ı")
+    parser.add_argument("--concurrency", default="1,10,50", help="Eşzamanlı istek sayıları, virgülle ayrılmış")
+    parser.add_argument("--requests", type=int, default=20, help="Coroutine başına istek")
+    args = parser.parse_args()
+
+    print(f"🔥 Emulator: {os.environ['FIRESTORE_EMULATOR_HOST']}, coroutine başına {args.requests} istek")
+    asyncio.run(run_all([int(value) for value in args.concurrency.split(",")], args.requests))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark corpus'u üretir - mobil istemcilerin gönderdiği formatlarda sentetik klipler
+
+Kullanım (backend klasöründen):
+    python benchmarks/make_corpus.py [--corpus benchmarks/corpus] [--durations 3,15,60,120]
+
+Sentetik klipler konuşma ritmini taklit eder (~4 Hz hece zarfı, cümle arası
+sessizlikler); tanıma referansı yoktur ("synthetic": true). Kaydedilmiş Türkçe
+klipler corpus/recorded/ altına konup manifest.jsonl'a referans metinleriyle
+eklenir; bu satırlar yeniden üretimde korunur:
+    {"audio": "recorded/yarin_toplanti.m4a", "text": "yarın saat onda toplantı oluştur"}
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pydub.utils import which
+
+# iOS: AAC/m4a (moov atom sonda), Android/web: Opus/webm, eski istemciler: WAV
+FORMATS = {
+    "wav": ["-ar", "44100", "-ac", "2", "-c:a", "pcm_s16le"],
+    "m4a": ["-ar", "44100", "-ac", "1", "-c:a", "aac", "-b:a", "64k"],
+    "webm": ["-ar", "48000", "-ac", "1", "-c:a", "libopus", "-b:a", "32k"]
+}
+DEFAULT_DURATIONS = "3,15,60,120"
+
+# Hece zarfı + her 4 sn'de 1 sn sessizlik
+SPEECH_ENVELOPE = "volume='(0.6+0.4*sin(2*PI*4*t))*if(lt(mod(t,4),3),1,0.01)':eval=frame"
+
+def make_clip(ffmpeg: str, path: str, audio_format: str, seconds: int):
+    subprocess.run([
+        ffmpeg, "-nostdin", "-loglevel", "error", "-y",
+        "-f", "lavfi", "-i", f"anoisesrc=d={seconds}:c=pink:r=48000:a=0.3:s=42",
+        "-af", SPEECH_ENVELOPE,
+        *FORMATS[audio_format], path
+    ], check=True)
+
+def read_manifest(path: str):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark corpus'u üret")
+    parser.add_argument("--corpus", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus"))
+    parser.add_argument("--durations", default=DEFAULT_DURATIONS, help="Saniye, virgülle ayrılmış")
+    args = parser.parse_args()
+
+    ffmpeg = which("ffmpeg") or "ffmpeg"
+    synthetic_dir = os.path.join(args.corpus, "synthetic")
+    os.makedirs(synthetic_dir, exist_ok=True)
+    manifest_path = os.path.join(args.corpus, "manifest.jsonl")
+
+    # Kaydedilmiş klipler korunur, sentetikler yeniden yazılır
+    entries = [item for item in read_manifest(manifest_path) if not item.get("synthetic")]
+    for audio_format in FORMATS:
+        for seconds in (int(value) for value in args.durations.split(",")):
+            name = f"synthetic/{audio_format}_{seconds}s.{audio_format}"
+            make_clip(ffmpeg, os.path.join(args.corpus, name), audio_format, seconds)
+            entries.append({"audio": name, "text": "", "format": audio_format, "seconds": seconds, "synthetic": True})
+            print(f"✅ {name}")
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        for item in entries:
+            f.write(json.dumps(item, ensure_ascii=False) + "\n")
+    print(f"📂 {len(entries)} klip: {manifest_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Ses tanıma backend karşılaştırması - klip başına gecikme ve kelime hata oranı (WER)
+
+Kullanım (backend klasöründen):
+    python benchmarks/stt_backends.py --corpus benchmarks/corpus --backends google,vosk,whisper
+
+Corpus klasöründe manifest.jsonl bulunur; her satır bir klip:
+    {"audio": "clips/yarin_toplanti.wav", "text": "yarın saat onda toplantı oluştur"}
+"""
+
+import os
+import io
+import re
+import sys
+import json
+import time
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import speech_recognition as sr
+from fastapi import UploadFile
+from services.audio_service import AudioService
+from services.stt_backends import STT_BACKENDS
+from utils.gazetteer import turkish_lower
+
+def normalize_words(text: str):
+    """Karşılaştırma için küçük harf, noktalama temizliği"""
+    return re.findall(r"\w+", turkish_lower(text))
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Kelime düzeyinde Levenshtein mesafesi / referans kelime sayısı"""
+    ref, hyp = normalize_words(reference), normalize_words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word)
+            ))
+        previous = current
+    return previous[-1] / len(ref)
+
+def load_corpus(corpus_dir: str):
+    with open(os.path.join(corpus_dir, "manifest.jsonl"), encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                item = json.loads(line)
+                # Sentetik kliplerin referans metni yok - WER ölçülemez
+                if item.get("synthetic"):
+                    continue
+                with open(os.path.join(corpus_dir, item["audio"]), "rb") as audio_file:
+                    yield item["audio"], audio_file.read(), item["text"]
+
+async def decode_corpus(corpus_dir: str):
+    service = AudioService()
+    clips = []
+    for name, data, text in load_corpus(corpus_dir):
+        audio_data = await service.decode_upload(UploadFile(io.BytesIO(data), filename=name))
+        clips.append((name, audio_data, text))
+    return clips
+
+def run_backend(name: str, clips, language: str):
+    started = time.perf_counter()
+    try:
+        backend = STT_BACKENDS[name]()
+    except Exception as e:
+        return {"backend": name, "error": str(e)}
+    load_seconds = time.perf_counter() - started
+
+    results = []
+    for clip_name, audio_data, reference in clips:
+        started = time.perf_counter()
+        try:
+            hypothesis = backend.recognize(audio_data, language)
+        except (sr.UnknownValueError, sr.RequestError) as e:
+            hypothesis = ""
+            error = type(e).__name__
+        else:
+            error = None
+        results.append({
+            "clip": clip_name,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+            "wer": round(word_error_rate(reference, hypothesis), 3),
+            "hypothesis": hypothesis,
+            "error": error
+        })
+
+    return {
+        "backend": name,
+        "offline": backend.offline,
+        "load_ms": round(load_seconds * 1000, 1),
+        "avg_latency_ms": round(sum(r["latency_ms"] for r in results) / len(results), 1) if results else 0.0,
+        "avg_wer": round(sum(r["wer"] for r in results) / len(results), 3) if results else 0.0,
+        "clips": results
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Ses tanıma backend karşılaştırması")
+    parser.add_argument("--corpus", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus"))
+    parser.add_argument("--backends", default=",".join(STT_BACKENDS))
+    parser.add_argument("--language", default="tr-TR")
+    parser.add_argument("--json", help="Sonuçları JSON olarak bu dosyaya yaz")
+    args = parser.parse_args()
+
+    clips = asyncio.run(decode_corpus(args.corpus))
+    print(f"📂 {len(clips)} klip: {args.corpus}")
+
+    reports = []
+    for name in args.backends.split(","):
+        report = run_backend(name.strip(), clips, args.language)
+        reports.append(report)
+        if "error" in report:
+            print(f"❌ {report['backend']:<8} yüklenemedi: {report['error']}")
+        else:
+            print(f"✅ {report['backend']:<8} yükleme {report['load_ms']:>8.1f} ms | "
+                  f"ort. gecikme {report['avg_latency_ms']:>8.1f} ms | ort. WER {report['avg_wer']:.3f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(reports, f, ensure_ascii=False, indent=2)
+
+if __name__ == "__main__":
+    main()
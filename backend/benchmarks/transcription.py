@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Ses transcription benchmark'ı - /api/chat/audio-message pipeline'ı format ve uzunluğa göre
+
+Kullanım (backend klasöründen):
+    python benchmarks/make_corpus.py
+    python benchmarks/transcription.py --json results/1.4.0.json [--compare results/1.3.0.json]
+
+Her klip AudioService ile decode + ön işleme + (parçalı) tanımadan geçer. Varsayılan
+recognizer yerel bir stand-in'dir: ses süresinin --rtf katı kadar bekler, ağ çağrısı
+yapmaz. --backend vosk|whisper|google ile gerçek backend ölçülür.
+Her klip ayrı bir process'te ölçülür; tepe RSS klipler arasında karışmaz.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import resource
+import subprocess
+import multiprocessing
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import speech_recognition as sr
+from services.audio_service import AudioService
+from services.stt_backends import RecognizerBackend, STT_BACKENDS
+from services.transcription_worker import UNRECOGNIZED_TEXT, SERVICE_ERROR_TEXT
+from benchmarks.stt_backends import word_error_rate
+
+class StandInBackend(RecognizerBackend):
+    """Ağ/model gerektirmeyen recognizer: ses süresi * rtf kadar bekler"""
+
+    name = "stand-in"
+    offline = True
+
+    def __init__(self, rtf: float):
+        self.rtf = rtf
+
+    def recognize(self, audio_data: sr.AudioData, language: str = "tr-TR") -> str:
+        seconds = len(audio_data.frame_data) / (audio_data.sample_rate * audio_data.sample_width)
+        time.sleep(seconds * self.rtf)
+        return "stand-in"
+
+class BenchmarkAudioService(AudioService):
+    """Tanımayı process havuzu yerine bu process'te çalıştırır (RSS ölçümüne dahil olur)"""
+
+    def __init__(self, backend: RecognizerBackend):
+        super().__init__()
+        self.backend = backend
+
+    async def speech_to_text(self, audio_data: sr.AudioData, language: str = "tr-TR") -> str:
+        try:
+            return await asyncio.to_thread(self.backend.recognize, audio_data, language)
+        except sr.UnknownValueError:
+            return UNRECOGNIZED_TEXT
+        except sr.RequestError:
+            return SERVICE_ERROR_TEXT
+
+def rss_mb(who: int) -> float:
+    # Linux'ta ru_maxrss KB cinsindendir
+    return round(resource.getrusage(who).ru_maxrss / 1024, 1)
+
+def io_write_bytes() -> int:
+    """Process'in depolamaya yazdığı bayt (Linux /proc/self/io)"""
+    try:
+        with open("/proc/self/io") as f:
+            for line in f:
+                if line.startswith("write_bytes:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+def measure_clip(task):
+    """Tek klibi ölç (ayrı process içinde çalışır)"""
+    corpus_dir, item, backend_name, rtf, repeat, language = task
+    backend = StandInBackend(rtf) if backend_name == "stand-in" else STT_BACKENDS[backend_name]()
+    service = BenchmarkAudioService(backend)
+    service.start()
+    with open(os.path.join(corpus_dir, item["audio"]), "rb") as f:
+        data = f.read()
+    audio_format = service.audio_format(item["audio"])
+    baseline_rss = rss_mb(resource.RUSAGE_SELF)
+    io_before = io_write_bytes()
+
+    async def run_once():
+        started = time.perf_counter()
+        audio_data = await service.decode_bytes(data, audio_format)
+        decoded = time.perf_counter()
+        processed = await service.preprocess(audio_data)
+        preprocessed = time.perf_counter()
+        segments = await service.transcribe_segments(processed, language)
+        finished = time.perf_counter()
+        return {
+            "decode_ms": (decoded - started) * 1000,
+            "preprocess_ms": (preprocessed - decoded) * 1000,
+            "recognize_ms": (finished - preprocessed) * 1000,
+            "total_ms": (finished - started) * 1000,
+            "pcm_bytes": len(audio_data.frame_data),
+            "payload_bytes": len(processed.frame_data),
+            "segments": len(segments),
+            "text": service.stitch_segments(segments)
+        }
+
+    async def run_all():
+        return [await run_once() for _ in range(repeat)]
+
+    try:
+        runs = asyncio.run(run_all())
+    finally:
+        service.shutdown()
+
+    result = {
+        "clip": item["audio"],
+        "format": item.get("format", audio_format),
+        "seconds": item.get("seconds") or round(runs[0]["pcm_bytes"] / (16000 * 2), 1),
+        "synthetic": bool(item.get("synthetic")),
+        "upload_bytes": len(data)
+    }
+    for key in ("decode_ms", "preprocess_ms", "recognize_ms", "total_ms"):
+        result[key] = round(median([run[key] for run in runs]), 1)
+    result.update({
+        "pcm_bytes": runs[0]["pcm_bytes"],
+        "payload_bytes": runs[0]["payload_bytes"],
+        "segments": runs[0]["segments"],
+        "baseline_rss_mb": baseline_rss,
+        "peak_rss_mb": rss_mb(resource.RUSAGE_SELF),
+        "decoder_peak_rss_mb": rss_mb(resource.RUSAGE_CHILDREN),
+        "temp_file_bytes": service.stats["disk_bytes_written"] // repeat,
+        "io_write_bytes": (io_write_bytes() - io_before) // repeat
+    })
+    if item.get("text"):
+        result["wer"] = round(word_error_rate(item["text"], runs[0]["text"]), 3)
+    return result
+
+def load_manifest(corpus_dir: str):
+    with open(os.path.join(corpus_dir, "manifest.jsonl"), encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def environment(backend: str, rtf: float, repeat: int):
+    """Sonuçların karşılaştırılabilmesi için ortam bilgisi"""
+    def command_output(*command):
+        try:
+            return subprocess.run(command, capture_output=True, text=True, timeout=10).stdout.strip()
+        except Exception:
+            return None
+
+    ffmpeg_version = command_output(AudioService().ffmpeg, "-version")
+    return {
+        "created_at": datetime.now().isoformat(),
+        "git_commit": command_output("git", "rev-parse", "--short", "HEAD"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "ffmpeg": ffmpeg_version.splitlines()[0] if ffmpeg_version else None,
+        "backend": backend,
+        "rtf": rtf if backend == "stand-in" else None,
+        "repeat": repeat
+    }
+
+def print_comparison(results, previous_path: str):
+    with open(previous_path, encoding="utf-8") as f:
+        previous = {row["clip"]: row for row in json.load(f)["results"]}
+    print(f"\n📊 Karşılaştırma: {previous_path}")
+    print(f"{'klip':<28}{'toplam ms':>12}{'değişim':>10}{'tepe RSS':>11}{'değişim':>10}")
+    for row in results:
+        old = previous.get(row["clip"])
+        if not old:
+            continue
+        total_change = (row["total_ms"] - old["total_ms"]) / old["total_ms"] * 100 if old["total_ms"] else 0.0
+        print(f"{row['clip']:<28}{row['total_ms']:>12.1f}{total_change:>+9.1f}%"
+              f"{row['peak_rss_mb']:>11.1f}{row['peak_rss_mb'] - old['peak_rss_mb']:>+10.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Ses transcription benchmark'ı")
+    parser.add_argument("--corpus", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus"))
+    parser.add_argument("--backend", default="stand-in", choices=["stand-in", *STT_BACKENDS])
+    parser.add_argument("--rtf", type=float, default=0.05, help="Stand-in recognizer gerçek zaman katsayısı")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--language", default="tr-TR")
+    parser.add_argument("--json", help="Sonuçları JSON olarak bu dosyaya yaz")
+    parser.add_argument("--compare", help="Önceki JSON sonucu ile karşılaştır")
+    args = parser.parse_args()
+
+    items = load_manifest(args.corpus)
+    tasks = [(args.corpus, item, args.backend, args.rtf, args.repeat, args.language) for item in items]
+    print(f"📂 {len(items)} klip, recognizer: {args.backend}")
+    print(f"{'klip':<28}{'decode':>9}{'ön işl.':>9}{'tanıma':>9}{'toplam':>9}{'parça':>7}{'tepe RSS':>10}{'ffmpeg RSS':>11}{'temp bayt':>11}")
+
+    # Her klip temiz bir process'te: tepe RSS ve I/O yalnızca o klibe ait
+    context = multiprocessing.get_context("spawn")
+    results = []
+    with context.Pool(1, maxtasksperchild=1) as pool:
+        for row in pool.imap(measure_clip, tasks):
+            results.append(row)
+            print(f"{row['clip']:<28}{row['decode_ms']:>9.1f}{row['preprocess_ms']:>9.1f}{row['recognize_ms']:>9.1f}"
+                  f"{row['total_ms']:>9.1f}{row['segments']:>7}{row['peak_rss_mb']:>10.1f}"
+                  f"{row['decoder_peak_rss_mb']:>11.1f}{row['temp_file_bytes']:>11}")
+
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(args.backend, args.rtf, args.repeat), "results": results},
+                      f, ensure_ascii=False, indent=2)
+        print(f"\n💾 {args.json}")
+
+    if args.compare:
+        print_comparison(results, args.compare)
+
+if __name__ == "__main__":
+    main()
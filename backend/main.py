@@ -4,12 +4,19 @@ from fastapi.responses import JSONResponse
 import os
 from dotenv import load_dotenv
 import logging
+from contextlib import asynccontextmanager
 
 # Routers
 from routers import chat, notes, calendar, weather, reminders
 
 # Services
 from services.firebase_service import firebase_service
+from services.chat_session_service import chat_session_manager
+from services.transcription_pool import transcription_pool
+from services.audio_service import audio_service
+from services.tts_service import tts_service
+from services.snapshot_mirror import snapshot_mirror
+from services.gemini_service import CANNED_REPLIES
 
 # Load environment variables
 load_dotenv()
@@ -18,11 +25,28 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Worker başına paylaşılan servisleri başlat, kapanışta process'leri ve dinleyicileri kapat"""
+    # STT backend yüklenemezse açılış burada durur
+    transcription_pool.start()
+    audio_service.start()
+    tts_service.start(CANNED_REPLIES)
+    snapshot_mirror.start(firebase_service.db if firebase_service.is_available() else None)
+    # HTTP'den yapılan takvim yazmaları WebSocket oturumlarının context önbelleğini düşürür
+    firebase_service.add_write_listener(chat_session_manager.note_write)
+    yield
+    snapshot_mirror.shutdown()
+    tts_service.shutdown()
+    audio_service.shutdown()
+    transcription_pool.shutdown()
+
 # Create FastAPI app
 app = FastAPI(
     title="Kişisel Asistan API",
     description="Sesli komut ve doğal dil işleme tabanlı mobil kişisel asistan backend API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware
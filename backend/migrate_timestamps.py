@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Etkinlik ve hatırlatıcılardaki ISO string zamanları Firestore Timestamp'e çeviren script
+
+Zaman aralığı sorguları (ör. bugünkü etkinlikler) yalnızca Timestamp değerleri eşler;
+string olarak kalan eski dokümanlar okunmaya devam eder ama aralık sorgularında görünmez.
+
+Kullanım (backend klasöründen):
+    python migrate_timestamps.py --dry-run
+    python migrate_timestamps.py
+"""
+
+import sys
+import os
+import logging
+import argparse
+
+# Current directory'yi path'e ekle
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.firebase_service import FirebaseService, BATCH_WRITE_LIMIT
+from utils.timestamps import TIME_FIELDS, to_timestamp
+
+# Logging setup
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def migrate_collection(firebase_service: FirebaseService, collection: str, dry_run: bool) -> dict:
+    """Koleksiyonu sayfa sayfa dolaşıp string zaman alanlarını Timestamp'e çevir"""
+    field = TIME_FIELDS[collection]
+    counts = {"scanned": 0, "converted": 0, "invalid": 0}
+    last_doc = None
+
+    while True:
+        query = firebase_service.db.collection(collection).order_by('__name__').limit(BATCH_WRITE_LIMIT)
+        if last_doc is not None:
+            query = query.start_after(last_doc)
+        docs = list(query.stream())
+        if not docs:
+            break
+        last_doc = docs[-1]
+
+        batch = firebase_service.db.batch()
+        pending = 0
+        for doc in docs:
+            counts["scanned"] += 1
+            value = (doc.to_dict() or {}).get(field)
+            if not isinstance(value, str):
+                continue
+            try:
+                converted = to_timestamp(value)
+            except ValueError:
+                counts["invalid"] += 1
+                logger.warning(f"✗ {collection}/{doc.id}: ayrıştırılamayan {field} değeri: {value!r}")
+                continue
+            counts["converted"] += 1
+            if not dry_run:
+                batch.update(doc.reference, {field: converted})
+                pending += 1
+        if pending:
+            batch.commit()
+        logger.info(f"{collection}: {counts['scanned']} doküman tarandı, {counts['converted']} çevrildi")
+
+    return counts
+
+def main():
+    """Ana fonksiyon"""
+    parser = argparse.ArgumentParser(description="events/reminders zaman alanlarını Timestamp'e çevir")
+    parser.add_argument("--dry-run", action="store_true", help="Yazmadan yalnızca çevrilecekleri say")
+    args = parser.parse_args()
+
+    firebase_service = FirebaseService()
+    if not firebase_service.is_available():
+        logger.error("Firebase kullanılamıyor! Lütfen Firebase ayarlarını kontrol edin.")
+        return False
+
+    for collection in TIME_FIELDS:
+        counts = migrate_collection(firebase_service, collection, args.dry_run)
+        prefix = "(dry-run) " if args.dry_run else ""
+        logger.info(f"✓ {prefix}{collection}: {counts['converted']}/{counts['scanned']} çevrildi, "
+                    f"{counts['invalid']} geçersiz")
+
+    # Eski değerleri içeren önbellek/ayna girdileri servis yeniden başlatılınca temizlenir
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -11,12 +11,32 @@ class ChatRequest(BaseModel):
     message: str = Field(..., description="Kullanıcı mesajı")
     message_type: MessageType = Field(default=MessageType.TEXT, description="Mesaj tipi")
     user_id: Optional[str] = Field(None, description="Kullanıcı ID")
+    tts: bool = Field(default=False, description="Yanıtın sesli halini de iste (audio_url)")
 
 class ChatResponse(BaseModel):
     response: str = Field(..., description="AI yanıtı")
     message_id: str = Field(..., description="Mesaj ID")
     timestamp: datetime = Field(default_factory=datetime.now)
     original_audio_text: Optional[str] = Field(None, description="Orijinal ses metni")
+    audio_url: Optional[str] = Field(None, description="Yanıtın sesi (TTS açıksa, akış olarak indirilir)")
+
+class AudioJobAccepted(BaseModel):
+    message: str = Field(..., description="Durum açıklaması")
+    job_id: str = Field(..., description="Arka plan işi ID")
+    status: str = Field(..., description="İş durumu")
+    status_url: str = Field(..., description="İş durumu adresi")
+
+class BatchChatRequest(BaseModel):
+    messages: List[ChatRequest] = Field(..., min_length=1, description="Sıralı mesaj listesi (çevrimdışı kuyruk)")
+    user_id: Optional[str] = Field(None, description="Kullanıcı ID (mesajda yoksa kullanılır)")
+
+class BatchChatResponse(BaseModel):
+    responses: List[ChatResponse] = Field(..., description="Mesaj sırasıyla AI yanıtları")
+    count: int = Field(..., description="İşlenen mesaj sayısı")
+
+class TTSRequest(BaseModel):
+    text: str = Field(..., min_length=1, description="Okunacak metin")
+    format: Optional[str] = Field(None, description="Ses codec'i: opus veya aac (varsayılan TTS_FORMAT)")
 
 class NoteRequest(BaseModel):
     title: str = Field(..., description="Not başlığı")
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Request
 from models.schemas import CalendarEventRequest, CalendarEventResponse
+from services.async_firebase_service import async_firebase_service
 from services.firebase_service import firebase_service
-from typing import List
+from services.bulk_import_service import create_import_job, import_ndjson
+from typing import List, Optional
+from utils.timestamps import to_timestamp, utc_now
 import uuid
 from datetime import datetime, timedelta
 import logging
@@ -20,8 +23,8 @@ async def get_all_events():
     """
     try:
         # Firebase kullanılabilirse Firebase'den al
-        if firebase_service.is_available():
-            firebase_events = firebase_service.get_events()
+        if async_firebase_service.is_available():
+            firebase_events = await async_firebase_service.get_events()
             return {
                 "events": firebase_events,
                 "count": len(firebase_events)
@@ -40,7 +43,7 @@ async def get_all_events():
         ]
         
         # Başlangıç zamanına göre sırala
-        all_events.sort(key=lambda x: x["datetime"])
+        all_events.sort(key=lambda x: to_timestamp(x["datetime"]))
         
         return {
             "events": all_events,
@@ -61,8 +64,8 @@ async def create_calendar_event_simple(title: str, datetime_str: str, descriptio
     """
     try:
         # Firebase kullanılabilirse Firebase'e kaydet
-        if firebase_service.is_available():
-            event_id = firebase_service.create_event(title, datetime_str, description, user_id)
+        if async_firebase_service.is_available():
+            event_id = await async_firebase_service.create_event(title, datetime_str, description, user_id)
             if event_id:
                 logger.info(f"Calendar event created in Firebase: {event_id}")
                 # Firebase'den kaydedilen etkinliği döndür
@@ -127,8 +130,8 @@ async def create_calendar_event(request: CalendarEventRequest):
             )
         
         # Firebase kullanılabilirse Firebase'e kaydet
-        if firebase_service.is_available():
-            event_id = firebase_service.create_event(
+        if async_firebase_service.is_available():
+            event_id = await async_firebase_service.create_event(
                 title=request.title,
                 datetime_str=request.start_time.isoformat(),
                 description=request.description,
@@ -174,21 +177,73 @@ async def create_calendar_event(request: CalendarEventRequest):
             detail="Takvim etkinliği oluşturulurken hata oluştu"
         )
 
+@router.post("/import")
+async def import_events(request: Request, user_id: str = None, job_id: Optional[str] = Header(None)):
+    """
+    NDJSON gövdesinden toplu etkinlik içe aktar (satır başına {"title", "datetime", "description", "user_id"})
+    
+    Gövde akış olarak okunur ve BulkWriter ile yazılır; yanıtta yazılan, geçersiz ve
+    doküman/sn bilgisi döner. user_id verilirse user_id alanı olmayan satırlara uygulanır.
+    İstemcinin ürettiği UUID Job-Id header'ı ile gönderilirse ilerleme içe aktarma sürerken
+    /api/chat/jobs/{job_id} ile izlenebilir.
+    """
+    if not firebase_service.is_available():
+        raise HTTPException(
+            status_code=503,
+            detail="Firebase kullanılamıyor, içe aktarma yapılamaz"
+        )
+    
+    try:
+        job = create_import_job("events", user_id, job_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        )
+    
+    await import_ndjson(request, job, firebase_service.create_events_bulk)
+    if job.status == "failed":
+        raise HTTPException(
+            status_code=500,
+            detail="Etkinlikler içe aktarılırken hata oluştu"
+        )
+    return job.to_dict()
+
 @router.get("/events/{user_id}", response_model=List[CalendarEventResponse])
 async def get_user_events(user_id: str, start_date: str = None, end_date: str = None):
     """
     Kullanıcının takvim etkinliklerini listele
     """
     try:
+        try:
+            start_dt = to_timestamp(start_date) if start_date else None
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail="Geçersiz başlangıç tarihi formatı (YYYY-MM-DD kullanın)"
+            )
+        try:
+            end_dt = to_timestamp(end_date) if end_date else None
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail="Geçersiz bitiş tarihi formatı (YYYY-MM-DD kullanın)"
+            )
+
         # Firebase kullanılabilirse Firebase'den al
-        if firebase_service.is_available():
-            firebase_events = firebase_service.get_events(user_id=user_id)
+        if async_firebase_service.is_available():
+            # Tarih aralığı sorguya eklenir (bitiş = başlangıç + 1 saat)
+            firebase_events = await async_firebase_service.get_events(
+                user_id=user_id,
+                start=start_dt,
+                end=end_dt - timedelta(hours=1) if end_dt else None
+            )
             user_events = []
             
             for event in firebase_events:
                 try:
-                    # Firebase'den gelen datetime string'ini parse et
-                    event_datetime = datetime.fromisoformat(event["datetime"].replace('Z', '+00:00'))
+                    # Firebase'den gelen datetime servis tarafından datetime'a çevrilir
+                    event_datetime = event["datetime"]
                     user_events.append(CalendarEventResponse(
                         id=event["id"],
                         title=event["title"],
@@ -209,29 +264,15 @@ async def get_user_events(user_id: str, start_date: str = None, end_date: str =
                 if event["user_id"] == user_id
             ]
         
-        # Tarih filtresi uygula
-        if start_date:
-            try:
-                start_dt = datetime.fromisoformat(start_date)
-                user_events = [e for e in user_events if e.start_time >= start_dt]
-            except ValueError:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Geçersiz başlangıç tarihi formatı (YYYY-MM-DD kullanın)"
-                )
+        # Tarih filtresi uygula (sınırlar ve etkinlik zamanları UTC)
+        if start_dt:
+            user_events = [e for e in user_events if to_timestamp(e.start_time) >= start_dt]
         
-        if end_date:
-            try:
-                end_dt = datetime.fromisoformat(end_date)
-                user_events = [e for e in user_events if e.end_time <= end_dt]
-            except ValueError:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Geçersiz bitiş tarihi formatı (YYYY-MM-DD kullanın)"
-                )
+        if end_dt:
+            user_events = [e for e in user_events if to_timestamp(e.end_time) <= end_dt]
         
         # Başlangıç zamanına göre sırala
-        user_events.sort(key=lambda x: x.start_time)
+        user_events.sort(key=lambda x: to_timestamp(x.start_time))
         
         return user_events
         
@@ -250,18 +291,18 @@ async def get_today_events(user_id: str):
     Bugünkü etkinlikleri getir
     """
     try:
-        today = datetime.now().date()
-        today_start = datetime.combine(today, datetime.min.time())
-        today_end = datetime.combine(today, datetime.max.time())
+        today = utc_now().date()
+        today_start = to_timestamp(datetime.combine(today, datetime.min.time()))
+        today_end = to_timestamp(datetime.combine(today, datetime.max.time()))
         
         # Firebase kullanılabilirse Firebase'den al
-        if firebase_service.is_available():
-            firebase_events = firebase_service.get_events(user_id=user_id)
+        if async_firebase_service.is_available():
+            firebase_events = await async_firebase_service.get_events(user_id=user_id, start=today_start, end=today_end)
             today_events = []
             
             for event in firebase_events:
                 try:
-                    event_datetime = datetime.fromisoformat(event["datetime"].replace('Z', '+00:00'))
+                    event_datetime = event["datetime"]
                     if today_start <= event_datetime <= today_end:
                         today_events.append(CalendarEventResponse(
                             id=event["id"],
@@ -281,11 +322,11 @@ async def get_today_events(user_id: str):
                 CalendarEventResponse(**event)
                 for event in events_storage.values()
                 if (event["user_id"] == user_id and 
-                    today_start <= event["start_time"] <= today_end)
+                    today_start <= to_timestamp(event["start_time"]) <= today_end)
             ]
         
         # Başlangıç zamanına göre sırala
-        today_events.sort(key=lambda x: x.start_time)
+        today_events.sort(key=lambda x: to_timestamp(x.start_time))
         
         return {
             "date": today.isoformat(),
@@ -306,17 +347,17 @@ async def get_upcoming_events(user_id: str, days: int = 7):
     Yaklaşan etkinlikleri getir (varsayılan 7 gün)
     """
     try:
-        now = datetime.now()
+        now = utc_now()
         future_limit = now + timedelta(days=days)
         
         # Firebase kullanılabilirse Firebase'den al
-        if firebase_service.is_available():
-            firebase_events = firebase_service.get_events(user_id=user_id)
+        if async_firebase_service.is_available():
+            firebase_events = await async_firebase_service.get_events(user_id=user_id, start=now, end=future_limit)
             upcoming_events = []
             
             for event in firebase_events:
                 try:
-                    event_datetime = datetime.fromisoformat(event["datetime"].replace('Z', '+00:00'))
+                    event_datetime = event["datetime"]
                     if now <= event_datetime <= future_limit:
                         upcoming_events.append(CalendarEventResponse(
                             id=event["id"],
@@ -336,11 +377,11 @@ async def get_upcoming_events(user_id: str, days: int = 7):
                 CalendarEventResponse(**event)
                 for event in events_storage.values()
                 if (event["user_id"] == user_id and 
-                    now <= event["start_time"] <= future_limit)
+                    now <= to_timestamp(event["start_time"]) <= future_limit)
             ]
         
         # Başlangıç zamanına göre sırala
-        upcoming_events.sort(key=lambda x: x.start_time)
+        upcoming_events.sort(key=lambda x: to_timestamp(x.start_time))
         
         return {
             "period_days": days,
@@ -362,8 +403,8 @@ async def delete_event(event_id: str):
     """
     try:
         # Firebase kullanılabilirse Firebase'den sil
-        if firebase_service.is_available():
-            if firebase_service.delete_event(event_id):
+        if async_firebase_service.is_available():
+            if await async_firebase_service.delete_event(event_id):
                 logger.info(f"Calendar event deleted from Firebase: {event_id}")
                 return {
                     "message": "Etkinlik başarıyla silindi",
@@ -413,8 +454,8 @@ async def update_event(event_id: str, request: CalendarEventRequest):
             )
         
         # Firebase kullanılabilirse Firebase'de güncelle
-        if firebase_service.is_available():
-            if firebase_service.update_event(
+        if async_firebase_service.is_available():
+            if await async_firebase_service.update_event(
                 event_id=event_id,
                 title=request.title,
                 datetime_str=request.start_time.isoformat(),
@@ -1,8 +1,24 @@
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File
-from models.schemas import ChatRequest, ChatResponse
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, WebSocket, WebSocketDisconnect, Header, Response, Query, BackgroundTasks
+from fastapi.responses import StreamingResponse, JSONResponse
+from models.schemas import ChatRequest, ChatResponse, AudioJobAccepted, BatchChatRequest, BatchChatResponse, TTSRequest
 from services.gemini_service import get_gemini_service
 from services.firebase_service import firebase_service
-from services.audio_service import AudioService
+from services.async_firebase_service import async_firebase_service
+from services.collection_cache import collection_cache
+from services.snapshot_mirror import snapshot_mirror
+from services.audio_service import audio_service
+from services.transcription_pool import TranscriptionQueueFull, TranscriptionTimeout
+from services.transcription_worker import UNRECOGNIZED_TEXT, SERVICE_ERROR_TEXT
+from services.chat_session_service import chat_session_manager, ChatSession
+from services.idempotency_service import idempotency_store
+from services.job_service import job_registry, Job
+from services.admission_service import chat_admission, AdmissionRejected
+from services.keyed_lock_service import user_locks
+from services.tts_service import tts_service, TTS_FORMATS
+from utils.gazetteer import gazetteer
+from utils.vad import EnergyVAD
+from utils.timestamps import to_timestamp
+from typing import Optional, Dict, Any, List
 import uuid
 from datetime import datetime, timedelta
 import logging
@@ -10,17 +26,36 @@ import requests
 import tempfile
 import os
 import re
+import json
+import asyncio
+import speech_recognition as sr
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
-audio_service = AudioService()
+
+# Mesajda şehir geçmediğinde kullanılacak şehir
+DEFAULT_WEATHER_CITY = os.getenv("DEFAULT_WEATHER_CITY", "Istanbul")
+
+# Chat geçmişi sayfalama ayarları
+MAX_HISTORY_PAGE_SIZE = 200
+CHAT_HISTORY_FIELDS = {"user_message", "ai_response", "user_id", "intent", "timestamp"}
+DELETE_PAGE_SIZE = int(os.getenv("CHAT_DELETE_PAGE_SIZE", 500))
+
+# Yük altında kabul edilmeyen istekler: "fallback" (basit yanıt) veya "reject" (503)
+SHED_MODE = os.getenv("CHAT_SHED_MODE", "fallback")
+
+# Tek batch isteğinde işlenecek en fazla mesaj
+MAX_BATCH_MESSAGES = int(os.getenv("CHAT_BATCH_MAX_MESSAGES", 50))
+
+# Bundan uzun sesli mesajlar (sessizlik kırpıldıktan sonra, sn) arka plan işinde tanınır
+AUDIO_SYNC_MAX_SECONDS = float(os.getenv("AUDIO_SYNC_MAX_SECONDS", 30))
 
 async def get_calendar_data():
     """Takvim verilerini al - Firebase'den direkt"""
     try:
         # Firebase'den direkt al
-        events = firebase_service.get_events() if firebase_service.is_available() else []
+        events = await async_firebase_service.get_events() if async_firebase_service.is_available() else []
         logger.info(f"Firebase returned {len(events)} calendar events")
         
         # Eğer events dict listesi değilse düzelt
@@ -29,10 +64,12 @@ async def get_calendar_data():
             formatted_events = []
             for event in events:
                 if isinstance(event, dict):
+                    # Firestore Timestamp'leri datetime gelir - context ISO string kullanır
+                    event_datetime = event.get("datetime") or ""
                     formatted_events.append({
                         "id": event.get("id", ""),
                         "title": event.get("title", ""),
-                        "datetime": event.get("datetime", ""),
+                        "datetime": event_datetime.isoformat() if isinstance(event_datetime, datetime) else event_datetime,
                         "description": event.get("description", "")
                     })
             
@@ -43,56 +80,18 @@ async def get_calendar_data():
         logger.error(f"Error getting calendar data: {e}")
         return {"events": [], "count": 0}
 
-def extract_city_from_message(message: str) -> str:
-    """Mesajdan şehir ismini çıkar"""
-    message_lower = message.lower()
-    
-    # Türkiye'deki büyük şehirler
-    cities = {
-        "istanbul": "Istanbul",
-        "ankara": "Ankara", 
-        "izmir": "Izmir",
-        "bursa": "Bursa",
-        "antalya": "Antalya",
-        "adana": "Adana",
-        "konya": "Konya",
-        "gaziantep": "Gaziantep",
-        "mersin": "Mersin",
-        "diyarbakır": "Diyarbakir",
-        "kayseri": "Kayseri",
-        "eskişehir": "Eskisehir",
-        "samsun": "Samsun",
-        "denizli": "Denizli",
-        "şanlıurfa": "Sanliurfa",
-        "adapazarı": "Adapazari",
-        "malatya": "Malatya",
-        "kahramanmaraş": "Kahramanmaras",
-        "erzurum": "Erzurum",
-        "van": "Van",
-        "batman": "Batman",
-        "elazığ": "Elazig",
-        "şırnak": "Sirnak",
-        "siirt": "Siirt",
-        "mardin": "Mardin",
-        "manisa": "Manisa",
-        "muğla": "Mugla",
-        "balıkesir": "Balikesir",
-        "tekirdağ": "Tekirdag",
-        "aydın": "Aydin",
-        "sakarya": "Sakarya",
-        "ordu": "Ordu",
-        "trabzon": "Trabzon",
-        "hatay": "Hatay",
-        "uşak": "Usak"
-    }
-    
-    # Mesajda şehir ismi var mı kontrol et
-    for city_key, city_name in cities.items():
-        if city_key in message_lower:
-            return city_name
-    
-    # Şehir bulunamazsa varsayılan olarak İstanbul
-    return "Istanbul"
+def extract_city_from_message(message: str) -> Optional[str]:
+    """Mesajdan şehir/ilçe ismini çıkar - bulunamazsa None"""
+    place = gazetteer.find(message)
+    return place.weather_query if place else None
+
+def resolve_weather_city(message: str) -> str:
+    """Hava durumu için şehri belirle - mesajda yoksa varsayılan şehir"""
+    city = extract_city_from_message(message)
+    if not city:
+        logger.info(f"No city found in message, using default: {DEFAULT_WEATHER_CITY}")
+        return DEFAULT_WEATHER_CITY
+    return city
 
 async def get_weather_data(city: str = "Istanbul"):
     """Hava durumu verilerini al - direkt weather router'ından"""
@@ -108,7 +107,8 @@ async def get_weather_data(city: str = "Istanbul"):
 async def save_note(title: str, content: str):
     """Not kaydet"""
     try:
-        response = requests.post(
+        response = await asyncio.to_thread(
+            requests.post,
             "http://localhost:8000/api/notes/",
             params={"title": title, "content": content},
             timeout=3
@@ -122,7 +122,8 @@ async def save_note(title: str, content: str):
 async def create_calendar_event(title: str, datetime_str: str, description: str = ""):
     """Takvim etkinliği oluştur"""
     try:
-        response = requests.post(
+        response = await asyncio.to_thread(
+            requests.post,
             "http://localhost:8000/api/calendar/events",
             params={
                 "title": title,
@@ -137,162 +138,331 @@ async def create_calendar_event(title: str, datetime_str: str, description: str
     except:
         return None
 
-@router.post("/message", response_model=ChatResponse)
-async def send_message(request: ChatRequest):
+class ChatBatch:
     """
-    Kullanıcı mesajını işle ve AI yanıtı döndür - akıllı parsing ile
+    Batch isteği boyunca paylaşılan context ve ertelenmiş yazmalar.
+    Takvim bir kez, hava durumu şehir başına bir kez okunur; not, etkinlik ve
+    chat kayıtları toplanıp Firestore batch'leri ile yazılır.
     """
-    try:
-        # Gemini servisini al
-        gemini_service = get_gemini_service()
-        
-        # Akıllı intent analizi
-        intent_data = await gemini_service.analyze_intent(request.message)
-        intent = intent_data.get("intent", "chat")
-        entities = intent_data.get("entities", {})
+
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        self.actions: List[Dict[str, Any]] = []
+        self.chat_turns: List[Dict[str, Any]] = []
+        self._calendar_data = None
+        self._weather_data: Dict[str, Optional[Dict[str, Any]]] = {}
+
+    async def get_calendar_data(self, loader) -> Dict[str, Any]:
+        """Takvimi batch başına bir kez oku"""
+        if self._calendar_data is None:
+            self._calendar_data = await loader()
+            # Henüz yazılmamış batch etkinliklerini de ekle
+            for action in self.actions:
+                if action["type"] == "event":
+                    self._add_calendar_event(action)
+        return self._calendar_data
+
+    def _add_calendar_event(self, event: Dict[str, Any]):
+        self._calendar_data["events"].append({
+            "id": "",
+            "title": event["title"],
+            "datetime": event["datetime"],
+            "description": event["description"]
+        })
+        self._calendar_data["count"] = len(self._calendar_data["events"])
+
+    async def get_weather_data(self, city: str, loader) -> Optional[Dict[str, Any]]:
+        """Hava durumunu şehir başına bir kez oku"""
+        if city not in self._weather_data:
+            self._weather_data[city] = await loader(city)
+        return self._weather_data[city]
+
+    def queue_note(self, title: str, content: str) -> Dict[str, Any]:
+        """Not yazmasını ertele"""
+        note = {"title": title, "content": content}
+        self.actions.append({"type": "note", **note})
+        return note
+
+    def queue_event(self, title: str, datetime_str: str, description: str) -> Dict[str, Any]:
+        """Etkinlik yazmasını ertele - sonraki mesajlar takvimde görsün"""
+        event = {"title": title, "datetime": datetime_str, "description": description}
+        self.actions.append({"type": "event", **event})
+        if self._calendar_data is not None:
+            self._add_calendar_event(event)
+        return event
+
+    def queue_chat_turn(self, message: str, ai_response: str, intent: str):
+        """Chat kaydını ertele"""
+        self.chat_turns.append({"message": message, "ai_response": ai_response, "intent": intent})
+
+    async def commit_actions(self):
+        """Not ve etkinlikleri tek seferde yaz"""
+        if not self.actions:
+            return
         
-        logger.info(f"Intent: {intent}, Entities: {entities}, Message: {request.message}")
+        if async_firebase_service.is_available():
+            writes = []
+            for action in self.actions:
+                if action["type"] == "note":
+                    writes.append(("notes", async_firebase_service.note_document(
+                        action["title"], action["content"], self.user_id)))
+                else:
+                    writes.append(("events", async_firebase_service.event_document(
+                        action["title"], action["datetime"], action["description"], self.user_id)))
+            if await async_firebase_service.commit_writes(writes) is None:
+                raise HTTPException(status_code=500, detail="Mesajlar kaydedilirken hata oluştu")
+            return
         
-        # Context başlat
-        context = {}
+        # Firebase yoksa tekli yollar (in-memory fallback) kullanılır
+        for action in self.actions:
+            if action["type"] == "note":
+                await save_note(action["title"], action["content"])
+            else:
+                await create_calendar_event(action["title"], action["datetime"], action["description"])
+
+    async def commit_chat_turns(self):
+        """Chat kayıtlarını tek seferde yaz"""
+        if not self.chat_turns or not async_firebase_service.is_available():
+            return
+        writes = [
+            ("chat_messages", async_firebase_service.chat_message_document(
+                turn["message"], turn["ai_response"], self.user_id, turn["intent"]))
+            for turn in self.chat_turns
+        ]
+        if await async_firebase_service.commit_writes(writes) is None:
+            logger.warning(f"Failed to save batch chat messages for user: {self.user_id}")
+        else:
+            logger.info(f"{len(writes)} chat messages saved to Firebase for user: {self.user_id}")
+
+async def build_context(message: str, intent: str, entities: Dict[str, Any], session: Optional[ChatSession] = None,
+                        batch: Optional[ChatBatch] = None) -> Dict[str, Any]:
+    """Intent'e göre aksiyonları çalıştır ve yanıt context'ini oluştur"""
+    # Context başlat
+    context = {}
+    # Okumalar için önbellek: sıcak oturum veya batch
+    cache = session or batch
+    
+    # Intent'e göre işlem yap
+    if intent == "note":
+        # Not kaydetme
+        title = entities.get("title", "Yeni Not")
+        content = entities.get("content", message)
         
-        # Intent'e göre işlem yap
-        if intent == "note":
-            # Not kaydetme
-            title = entities.get("title", "Yeni Not")
-            content = entities.get("content", request.message)
-            
-            logger.info(f"Saving note - Title: {title}, Content: {content}")
+        logger.info(f"Saving note - Title: {title}, Content: {content}")
+        if batch:
+            saved_note = batch.queue_note(title, content)
+        else:
             saved_note = await save_note(title, content)
-            
-            if saved_note:
-                context["note_saved"] = saved_note
-                logger.info(f"Note saved successfully: {saved_note}")
-            else:
-                logger.warning("Failed to save note")
         
-        elif intent == "calendar":
-            # Etkinlik oluşturma
-            title = entities.get("title", "Yeni Etkinlik")
-            datetime_str = entities.get("datetime", "")
-            description = entities.get("description", f"Kullanıcı tarafından oluşturulan etkinlik: {request.message}")
-            
-            # Varsayılan tarih
-            if not datetime_str:
-                tomorrow = datetime.now() + timedelta(days=1)
-                datetime_str = tomorrow.replace(hour=10, minute=0, second=0, microsecond=0).isoformat()
-            
-            logger.info(f"Creating event - Title: {title}, DateTime: {datetime_str}")
+        if saved_note:
+            context["note_saved"] = saved_note
+            logger.info(f"Note saved successfully: {saved_note}")
+        else:
+            logger.warning("Failed to save note")
+    
+    elif intent == "calendar":
+        # Etkinlik oluşturma
+        title = entities.get("title", "Yeni Etkinlik")
+        datetime_str = entities.get("datetime", "")
+        description = entities.get("description", f"Kullanıcı tarafından oluşturulan etkinlik: {message}")
+        
+        # Timestamp olarak saklanır - ayrıştırılamayan tarih varsayılana döner
+        if datetime_str:
+            try:
+                to_timestamp(datetime_str)
+            except ValueError:
+                logger.warning(f"Unparseable event datetime: {datetime_str}")
+                datetime_str = ""
+        
+        # Varsayılan tarih
+        if not datetime_str:
+            tomorrow = datetime.now() + timedelta(days=1)
+            datetime_str = tomorrow.replace(hour=10, minute=0, second=0, microsecond=0).isoformat()
+        
+        logger.info(f"Creating event - Title: {title}, DateTime: {datetime_str}")
+        if batch:
+            created_event = batch.queue_event(title, datetime_str, description)
+        else:
             created_event = await create_calendar_event(title, datetime_str, description)
-            
-            if created_event:
-                context["event_created"] = created_event
-                logger.info(f"Event created successfully: {created_event}")
-            else:
-                logger.warning("Failed to create event")
         
-        elif intent == "weather":
-            # Hava durumu - şehir ismini mesajdan çıkar
-            city = extract_city_from_message(request.message)
+        if created_event:
+            context["event_created"] = created_event
+            if session:
+                session.invalidate_calendar()
+            logger.info(f"Event created successfully: {created_event}")
+        else:
+            logger.warning("Failed to create event")
+    
+    elif intent == "weather":
+        # Hava durumu - şehir ismini mesajdan çıkar
+        city = resolve_weather_city(message)
+        if cache:
+            weather_data = await cache.get_weather_data(city, get_weather_data)
+        else:
             weather_data = await get_weather_data(city)
-            if weather_data:
-                context["weather"] = weather_data
-        
-        elif intent == "chat":
-            # Takvim sorgularını kontrol et
-            if any(keyword in request.message.lower() for keyword in ["toplantı", "etkinlik", "takvim", "yarın", "bugün"]):
+        if weather_data:
+            context["weather"] = weather_data
+    
+    elif intent == "chat":
+        # Takvim sorgularını kontrol et
+        if any(keyword in message.lower() for keyword in ["toplantı", "etkinlik", "takvim", "yarın", "bugün"]):
+            if cache:
+                calendar_data = await cache.get_calendar_data(get_calendar_data)
+            else:
                 calendar_data = await get_calendar_data()
-                logger.info(f"Calendar data retrieved: {calendar_data}")
-                
-                # Tarih-based filtering
-                filtered_events = []
-                if calendar_data and "events" in calendar_data:
-                    message_lower = request.message.lower()
-                    
-                    # Türkçe ay isimleri için filtering
-                    turkish_months = {
-                        'ocak': '01', 'şubat': '02', 'mart': '03', 'nisan': '04', 
-                        'mayıs': '05', 'haziran': '06', 'temmuz': '07', 'ağustos': '08',
-                        'eylül': '09', 'ekim': '10', 'kasım': '11', 'aralık': '12'
-                    }
-                    
-                    # "13 Temmuz" formatını kontrol et
-                    for month_name, month_num in turkish_months.items():
-                        if month_name in message_lower:
-                            # Gün sayısını bul
-                            import re
-                            day_match = re.search(r'(\d{1,2})\s+' + month_name, message_lower)
-                            if day_match:
-                                day = day_match.group(1).zfill(2)
-                                target_date = f"2025-{month_num}-{day}"
-                                logger.info(f"Filtering events for date: {target_date}")
-                                
-                                # Bu tarihteki etkinlikleri filtrele
-                                for event in calendar_data["events"]:
-                                    event_date = event.get("datetime", "")
-                                    logger.info(f"Checking event: {event.get('title')} on {event_date}")
-                                    if event_date.startswith(target_date):
-                                        filtered_events.append(event)
-                                        logger.info(f"Event matched: {event.get('title')}")
-                                
-                                logger.info(f"Found {len(filtered_events)} events for {target_date}")
-                                break
-                    
-                    # Bugün/yarın kontrolü
-                    today = datetime.now().date()
-                    if "bugün" in message_lower:
-                        target_date = today.strftime("%Y-%m-%d")
-                        for event in calendar_data["events"]:
-                            event_date = event.get("datetime", "")
-                            if event_date.startswith(target_date):
-                                filtered_events.append(event)
-                    elif "yarın" in message_lower:
-                        tomorrow = (today + timedelta(days=1)).strftime("%Y-%m-%d")
-                        for event in calendar_data["events"]:
-                            event_date = event.get("datetime", "")
-                            if event_date.startswith(tomorrow):
-                                filtered_events.append(event)
+            logger.info(f"Calendar data retrieved: {calendar_data}")
+            
+            # Tarih-based filtering
+            filtered_events = []
+            if calendar_data and "events" in calendar_data:
+                message_lower = message.lower()
                 
-                # Filtrelenmiş etkinlikleri context'e ekle
-                context["calendar"] = {
-                    "events": filtered_events,
-                    "count": len(filtered_events),
-                    "query_date": request.message
+                # Türkçe ay isimleri için filtering
+                turkish_months = {
+                    'ocak': '01', 'şubat': '02', 'mart': '03', 'nisan': '04', 
+                    'mayıs': '05', 'haziran': '06', 'temmuz': '07', 'ağustos': '08',
+                    'eylül': '09', 'ekim': '10', 'kasım': '11', 'aralık': '12'
                 }
+                
+                # "13 Temmuz" formatını kontrol et
+                for month_name, month_num in turkish_months.items():
+                    if month_name in message_lower:
+                        # Gün sayısını bul
+                        import re
+                        day_match = re.search(r'(\d{1,2})\s+' + month_name, message_lower)
+                        if day_match:
+                            day = day_match.group(1).zfill(2)
+                            target_date = f"2025-{month_num}-{day}"
+                            logger.info(f"Filtering events for date: {target_date}")
+                            
+                            # Bu tarihteki etkinlikleri filtrele
+                            for event in calendar_data["events"]:
+                                event_date = event.get("datetime", "")
+                                logger.info(f"Checking event: {event.get('title')} on {event_date}")
+                                if event_date.startswith(target_date):
+                                    filtered_events.append(event)
+                                    logger.info(f"Event matched: {event.get('title')}")
+                            
+                            logger.info(f"Found {len(filtered_events)} events for {target_date}")
+                            break
+                
+                # Bugün/yarın kontrolü
+                today = datetime.now().date()
+                if "bugün" in message_lower:
+                    target_date = today.strftime("%Y-%m-%d")
+                    for event in calendar_data["events"]:
+                        event_date = event.get("datetime", "")
+                        if event_date.startswith(target_date):
+                            filtered_events.append(event)
+                elif "yarın" in message_lower:
+                    tomorrow = (today + timedelta(days=1)).strftime("%Y-%m-%d")
+                    for event in calendar_data["events"]:
+                        event_date = event.get("datetime", "")
+                        if event_date.startswith(tomorrow):
+                            filtered_events.append(event)
             
-            # Hava durumu sorgularını kontrol et
-            if "hava" in request.message.lower():
-                city = extract_city_from_message(request.message)
+            # Filtrelenmiş etkinlikleri context'e ekle
+            context["calendar"] = {
+                "events": filtered_events,
+                "count": len(filtered_events),
+                "query_date": message
+            }
+        
+        # Hava durumu sorgularını kontrol et
+        if "hava" in message.lower():
+            city = resolve_weather_city(message)
+            if cache:
+                weather_data = await cache.get_weather_data(city, get_weather_data)
+            else:
                 weather_data = await get_weather_data(city)
-                if weather_data:
-                    context["weather"] = weather_data
-        
-        # Akıllı yanıt üret
-        ai_response = await gemini_service.generate_smart_response(
-            request.message, 
-            intent_data,
-            context
-        )
+            if weather_data:
+                context["weather"] = weather_data
+    
+    return context
+
+async def save_chat_turn(message: str, ai_response: str, user_id: str, intent: str):
+    """Chat mesajını Firebase'e kaydet"""
+    if async_firebase_service.is_available():
+        try:
+            await async_firebase_service.save_chat_message(
+                message=message,
+                response=ai_response,
+                user_id=user_id,
+                intent=intent
+            )
+            logger.info(f"Chat message saved to Firebase for user: {user_id}")
+        except Exception as e:
+            logger.warning(f"Failed to save chat message to Firebase: {e}")
+
+def intent_label(intents: List[Dict[str, Any]]) -> str:
+    """Chat kaydı için intent etiketi ("calendar,weather")"""
+    return ",".join(item.get("intent", "chat") for item in intents)
+
+async def respond_to_intent(gemini_service, intent_data: Dict[str, Any],
+                            session: Optional[ChatSession] = None) -> str:
+    """Tek bir intent'in aksiyonunu çalıştır ve yanıtını üret"""
+    text = intent_data["text"]
+    context = await build_context(text, intent_data["intent"], intent_data.get("entities", {}), session=session)
+    return await gemini_service.generate_smart_response(text, intent_data, context)
+
+async def process_multi_intent(gemini_service, intents: List[Dict[str, Any]],
+                               session: Optional[ChatSession] = None) -> str:
+    """
+    Bağımsız aksiyonları (not, etkinlik, hava durumu) eşzamanlı çalıştır.
+    Yanıtlar mesajdaki sırayla tek yanıtta birleştirilir.
+    """
+    responses = await asyncio.gather(
+        *(respond_to_intent(gemini_service, intent_data, session) for intent_data in intents)
+    )
+    return "\n\n".join(responses)
+
+def tts_audio_url(text: str) -> Optional[str]:
+    """Yanıtın sesini istemcinin akış olarak indireceği URL (TTS kapalıysa None)"""
+    key = tts_service.register(text)
+    return f"/api/chat/tts/{key}" if key else None
+
+async def process_message(request: ChatRequest) -> ChatResponse:
+    """
+    Kullanıcı mesajını işle ve AI yanıtı döndür - akıllı parsing ile
+    """
+    try:
+        # Gemini servisini al
+        gemini_service = get_gemini_service()
+        
+        # Akıllı intent analizi - mesaj birden fazla aksiyon içerebilir
+        intents = await gemini_service.analyze_intents(request.message)
+        
+        if len(intents) > 1:
+            intent = intent_label(intents)
+            logger.info(f"Intents: {intent}, Message: {request.message}")
+            ai_response = await process_multi_intent(gemini_service, intents)
+        else:
+            intent_data = intents[0]
+            intent = intent_data.get("intent", "chat")
+            entities = intent_data.get("entities", {})
+            
+            logger.info(f"Intent: {intent}, Entities: {entities}, Message: {request.message}")
+            
+            # Intent'e göre işlem yap ve context oluştur
+            context = await build_context(request.message, intent, entities)
+            
+            # Akıllı yanıt üret
+            ai_response = await gemini_service.generate_smart_response(
+                request.message, 
+                intent_data,
+                context
+            )
         
         # Chat mesajını Firebase'e kaydet
         user_id = request.user_id or "default"
-        if firebase_service.is_available():
-            try:
-                firebase_service.save_chat_message(
-                    message=request.message,
-                    response=ai_response,
-                    user_id=user_id,
-                    intent=intent
-                )
-                logger.info(f"Chat message saved to Firebase for user: {user_id}")
-            except Exception as e:
-                logger.warning(f"Failed to save chat message to Firebase: {e}")
+        await save_chat_turn(request.message, ai_response, user_id, intent)
         
         # Yanıt oluştur
         response = ChatResponse(
             response=ai_response,
             message_id=str(uuid.uuid4()),
-            timestamp=datetime.now()
+            timestamp=datetime.now(),
+            audio_url=tts_audio_url(ai_response) if request.tts else None
         )
         
         logger.info(f"Chat response generated for user: {user_id}")
@@ -305,27 +475,426 @@ async def send_message(request: ChatRequest):
             detail="Mesaj işlenirken hata oluştu"
         )
 
+def shed_message(request: ChatRequest, response: Response, rejection: AdmissionRejected) -> ChatResponse:
+    """Kabul edilmeyen istek - ucuz fallback yanıtı veya Retry-After ile 503"""
+    logger.warning(f"Chat request shed ({rejection.reason}) for user: {request.user_id or 'default'}")
+    if SHED_MODE == "reject":
+        raise HTTPException(
+            status_code=503,
+            detail="Sunucu yoğun, lütfen daha sonra tekrar deneyin",
+            headers={"Retry-After": str(rejection.retry_after)}
+        )
+    
+    # Gemini ve Firestore çağrısı yapmadan basit yanıt
+    response.headers["X-Load-Shed"] = rejection.reason
+    return ChatResponse(
+        response=get_gemini_service()._generate_fallback_response(request.message),
+        message_id=str(uuid.uuid4()),
+        timestamp=datetime.now()
+    )
+
+@router.post("/message", response_model=ChatResponse)
+async def send_message(request: ChatRequest, response: Response, idempotency_key: Optional[str] = Header(None)):
+    """
+    Kullanıcı mesajını işle ve AI yanıtı döndür
+    
+    Idempotency-Key header'ı ile tekrar edilen istekler saklanan yanıtı döndürür.
+    Yük altında kuyrukta CHAT_MAX_QUEUE_WAIT süresinden fazla bekleyen istekler
+    basit yanıta düşer veya 503 alır (CHAT_SHED_MODE).
+    Aynı kullanıcının mesajları geliş sırasıyla işlenir, farklı kullanıcılar eşzamanlıdır.
+    """
+    user_id = request.user_id or "default"
+    scope = f"message:{user_id}"
+    
+    # Tamamlanmış isteğin tekrarı kabul kontrolüne girmez
+    if idempotency_key:
+        found, result = idempotency_store.get(scope, idempotency_key)
+        if found:
+            response.headers["Idempotent-Replayed"] = "true"
+            return result
+    
+    try:
+        # Önce kabul: kullanıcı kilidini bekleyen istekler de kuyruk sınırına dahil
+        async with chat_admission.admit():
+            async with user_locks.hold(user_id):
+                if not idempotency_key:
+                    return await process_message(request)
+                
+                result, replayed = await idempotency_store.run(
+                    scope,
+                    idempotency_key,
+                    lambda: process_message(request)
+                )
+                if replayed:
+                    response.headers["Idempotent-Replayed"] = "true"
+                return result
+    except AdmissionRejected as e:
+        return shed_message(request, response, e)
+
+async def process_message_batch(request: BatchChatRequest) -> BatchChatResponse:
+    """
+    Sıralı mesaj listesini tek istekte işle.
+    Intent analizi tüm batch için birlikte yapılır, context okumaları paylaşılır,
+    yazmalar Firestore batch'leri ile yapılır.
+    """
+    try:
+        gemini_service = get_gemini_service()
+        user_id = request.user_id or request.messages[0].user_id or "default"
+        batch = ChatBatch(user_id)
+        
+        # Tüm mesajlar için intent analizi - her mesaj birden fazla aksiyon içerebilir
+        analyses = await asyncio.gather(
+            *(gemini_service.analyze_intents(item.message) for item in request.messages)
+        )
+        
+        # Context'ler mesaj ve intent sırasıyla - önceki etkinlikler sonraki sorgularda görünür
+        contexts = []
+        for intents in analyses:
+            message_contexts = []
+            for intent_data in intents:
+                message_contexts.append(await build_context(
+                    intent_data["text"],
+                    intent_data.get("intent", "chat"),
+                    intent_data.get("entities", {}),
+                    batch=batch
+                ))
+            contexts.append(message_contexts)
+        await batch.commit_actions()
+        
+        responses = []
+        for item, intents, message_contexts in zip(request.messages, analyses, contexts):
+            # Çoklu intent yanıtları mesajdaki sırayla birleştirilir
+            intent_responses = await asyncio.gather(
+                *(gemini_service.generate_smart_response(intent_data["text"], intent_data, context)
+                  for intent_data, context in zip(intents, message_contexts))
+            )
+            ai_response = "\n\n".join(intent_responses)
+            batch.queue_chat_turn(item.message, ai_response, intent_label(intents))
+            responses.append(ChatResponse(
+                response=ai_response,
+                message_id=str(uuid.uuid4()),
+                timestamp=datetime.now(),
+                audio_url=tts_audio_url(ai_response) if item.tts else None
+            ))
+        await batch.commit_chat_turns()
+        
+        logger.info(f"Chat batch of {len(responses)} messages processed for user: {user_id}")
+        return BatchChatResponse(responses=responses, count=len(responses))
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Chat batch error: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="Mesajlar işlenirken hata oluştu"
+        )
+
+@router.post("/messages/batch", response_model=BatchChatResponse)
+async def send_message_batch(request: BatchChatRequest, response: Response, idempotency_key: Optional[str] = Header(None)):
+    """
+    Çevrimdışı kuyruğa alınmış mesajları sırayla tek istekte işle
+    
+    Idempotency-Key header'ı ile tekrar edilen istekler saklanan yanıtı döndürür.
+    Yük altında /message ile aynı kabul kontrolüne tabidir; kabul edilmezse Retry-After ile 503.
+    """
+    if len(request.messages) > MAX_BATCH_MESSAGES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Bir batch en fazla {MAX_BATCH_MESSAGES} mesaj içerebilir"
+        )
+    
+    user_id = request.user_id or request.messages[0].user_id or "default"
+    scope = f"batch:{user_id}"
+    
+    if idempotency_key:
+        found, result = idempotency_store.get(scope, idempotency_key)
+        if found:
+            response.headers["Idempotent-Replayed"] = "true"
+            return result
+    
+    try:
+        async with chat_admission.admit():
+            async with user_locks.hold(user_id):
+                if not idempotency_key:
+                    return await process_message_batch(request)
+                
+                result, replayed = await idempotency_store.run(
+                    scope,
+                    idempotency_key,
+                    lambda: process_message_batch(request)
+                )
+                if replayed:
+                    response.headers["Idempotent-Replayed"] = "true"
+                return result
+    except AdmissionRejected as e:
+        # Batch için basit yanıt anlamlı değil - istemci kuyruğu sonra tekrar gönderir
+        logger.warning(f"Chat batch shed ({e.reason}) for user: {user_id}")
+        raise HTTPException(
+            status_code=503,
+            detail="Sunucu yoğun, lütfen daha sonra tekrar deneyin",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+
+@router.websocket("/ws")
+async def chat_websocket(websocket: WebSocket, user_id: str = "default"):
+    """
+    WebSocket chat kanalı - kullanıcı başına sıcak oturum, parça parça yanıt
+    
+    İstemci: {"message": "..."} veya {"type": "ping"}
+    Sunucu: {"type": "chunk"}, {"type": "done"}, {"type": "error"}, {"type": "pong"}
+    """
+    await websocket.accept()
+    session = await chat_session_manager.attach(user_id, websocket)
+    
+    try:
+        # Bağlantıda son konuşma turlarını gönder
+        await websocket.send_json({
+            "type": "session",
+            "user_id": user_id,
+            "recent_turns": session.recent_turns()
+        })
+        
+        while True:
+            payload = await websocket.receive_json()
+            session.touch()
+            
+            if payload.get("type") == "ping":
+                await websocket.send_json({"type": "pong"})
+                continue
+            
+            message = (payload.get("message") or "").strip()
+            message_id = payload.get("message_id") or str(uuid.uuid4())
+            if not message:
+                await websocket.send_json({
+                    "type": "error",
+                    "message_id": message_id,
+                    "detail": "Mesaj boş olamaz"
+                })
+                continue
+            
+            try:
+                # Aynı kullanıcının HTTP ve WebSocket mesajları sırayla işlenir
+                async with user_locks.hold(user_id):
+                    gemini_service = session.gemini_service
+                    
+                    # Akıllı intent analizi - mesaj birden fazla aksiyon içerebilir
+                    intents = await gemini_service.analyze_intents(message)
+                    intent = intent_label(intents)
+                    
+                    if len(intents) > 1:
+                        logger.info(f"WS Intents: {intent}, Message: {message}")
+                        
+                        # Aksiyonlar oturum önbelleğiyle eşzamanlı çalışır, birleşik yanıt tek parça gönderilir
+                        ai_response = await process_multi_intent(gemini_service, intents, session=session)
+                        await websocket.send_json({
+                            "type": "chunk",
+                            "message_id": message_id,
+                            "text": ai_response
+                        })
+                    else:
+                        intent_data = intents[0]
+                        entities = intent_data.get("entities", {})
+                        logger.info(f"WS Intent: {intent}, Entities: {entities}, Message: {message}")
+                        
+                        # Oturum önbelleğiyle context oluştur
+                        context = await build_context(message, intent, entities, session=session)
+                        
+                        # Yanıtı parça parça gönder
+                        chunks = []
+                        async for chunk in gemini_service.stream_smart_response(message, intent_data, context):
+                            chunks.append(chunk)
+                            await websocket.send_json({
+                                "type": "chunk",
+                                "message_id": message_id,
+                                "text": chunk
+                            })
+                        ai_response = "".join(chunks)
+                    
+                    session.add_turn(message, ai_response, intent)
+                    await save_chat_turn(message, ai_response, user_id, intent)
+                
+                await websocket.send_json({
+                    "type": "done",
+                    "message_id": message_id,
+                    "response": ai_response,
+                    "intent": intent,
+                    "timestamp": datetime.now().isoformat()
+                })
+            except WebSocketDisconnect:
+                raise
+            except Exception as e:
+                logger.error(f"WS chat error: {str(e)}")
+                await websocket.send_json({
+                    "type": "error",
+                    "message_id": message_id,
+                    "detail": "Mesaj işlenirken hata oluştu"
+                })
+    
+    except WebSocketDisconnect:
+        logger.info(f"Chat WebSocket disconnected for user: {user_id}")
+    except Exception as e:
+        logger.error(f"Chat WebSocket error: {str(e)}")
+    finally:
+        await chat_session_manager.detach(user_id, websocket)
+
+@router.websocket("/audio-stream")
+async def audio_stream_websocket(websocket: WebSocket, user_id: str = "default", sample_rate: int = 16000,
+                                 language: str = "tr-TR"):
+    """
+    Kayıt sürerken ses akışı - VAD ile segmentlere bölünür, kapanan segment hemen tanınır
+    
+    İstemci: binary 16-bit mono PCM parçaları (sample_rate), konuşma bitince {"type": "end"}
+    Sunucu: {"type": "segment"}, {"type": "transcript"}, {"type": "done"}, {"type": "error"}
+    """
+    if not 8000 <= sample_rate <= 48000:
+        await websocket.close(code=1008)
+        return
+    
+    await websocket.accept()
+    send_lock = asyncio.Lock()
+    
+    async def send(payload: Dict[str, Any]):
+        async with send_lock:
+            await websocket.send_json(payload)
+    
+    async def transcribe_segment(index: int, pcm: bytes) -> str:
+        text = await audio_service.speech_to_text(sr.AudioData(pcm, sample_rate, 2), language)
+        if text not in (UNRECOGNIZED_TEXT, SERVICE_ERROR_TEXT):
+            await send({"type": "segment", "index": index, "text": text})
+        return text
+    
+    vad = EnergyVAD(sample_rate=sample_rate)
+    segment_tasks: List[asyncio.Task] = []
+    
+    def start_segments(segments: List[bytes]):
+        for pcm in segments:
+            segment_tasks.append(asyncio.create_task(transcribe_segment(len(segment_tasks), pcm)))
+    
+    try:
+        while True:
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                break
+            
+            if frame.get("bytes"):
+                # Kapanan segmentler kayıt sürerken tanınmaya başlar
+                start_segments(vad.feed(frame["bytes"]))
+                continue
+            
+            payload = json.loads(frame.get("text") or "{}")
+            if payload.get("type") == "ping":
+                await send({"type": "pong"})
+                continue
+            if payload.get("type") != "end":
+                continue
+            
+            # Konuşma bitti - açık segmenti kapat, segment sonuçlarını sırayla birleştir
+            last_segment = vad.flush()
+            if last_segment:
+                start_segments([last_segment])
+            tasks, segment_tasks = segment_tasks, []
+            vad = EnergyVAD(sample_rate=sample_rate)
+            
+            try:
+                texts = await asyncio.gather(*tasks)
+            except (TranscriptionQueueFull, TranscriptionTimeout) as e:
+                await send({"type": "error", "detail": str(e)})
+                continue
+            except Exception as e:
+                logger.error(f"Audio stream transcription error: {str(e)}")
+                await send({"type": "error", "detail": "Ses tanıma hatası"})
+                continue
+            
+            text = " ".join(t for t in texts if t not in (UNRECOGNIZED_TEXT, SERVICE_ERROR_TEXT))
+            if not text:
+                detail = SERVICE_ERROR_TEXT if SERVICE_ERROR_TEXT in texts else UNRECOGNIZED_TEXT
+                await send({"type": "error", "detail": detail})
+                continue
+            await send({"type": "transcript", "text": text, "segments": len(texts)})
+            
+            # Metni normal mesaj gibi işle
+            try:
+                async with user_locks.hold(user_id):
+                    result = await process_message(ChatRequest(message=text, user_id=user_id))
+            except HTTPException as e:
+                await send({"type": "error", "detail": e.detail})
+                continue
+            await send({
+                "type": "done",
+                "message_id": result.message_id,
+                "response": result.response,
+                "original_audio_text": text,
+                "timestamp": result.timestamp.isoformat()
+            })
+    
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"Audio stream WebSocket error: {str(e)}")
+    finally:
+        for task in segment_tasks:
+            task.cancel()
+        logger.info(f"Audio stream WebSocket closed for user: {user_id}")
+
+def parse_history_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Virgülle ayrılmış alan listesini doğrula"""
+    if not fields:
+        return None
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in CHAT_HISTORY_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Geçersiz alan(lar): {', '.join(unknown)}"
+        )
+    return requested
+
+def validate_history_cursor(cursor: Optional[str]):
+    """Cursor'ı stream başlamadan önce doğrula"""
+    if cursor:
+        try:
+            async_firebase_service.decode_chat_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail="Geçersiz cursor"
+            )
+
 @router.get("/history/{user_id}")
-async def get_chat_history(user_id: str, limit: int = 50):
+async def get_chat_history(user_id: str, limit: int = Query(50, ge=1, le=MAX_HISTORY_PAGE_SIZE),
+                           cursor: Optional[str] = None, fields: Optional[str] = None):
     """
-    Kullanıcının chat geçmişini getir
+    Kullanıcının chat geçmişini getir (eskiden yeniye)
+    
+    next_cursor ile daha eski mesajların sayfası istenebilir.
     """
     try:
-        if firebase_service.is_available():
-            chat_history = firebase_service.get_chat_history(user_id=user_id, limit=limit)
+        if async_firebase_service.is_available():
+            field_list = parse_history_fields(fields)
+            validate_history_cursor(cursor)
+            page = [message async for message in async_firebase_service.iter_chat_history_page(
+                user_id=user_id, limit=limit, cursor=cursor, fields=field_list
+            )]
+            next_cursor = async_firebase_service.encode_chat_cursor(page[-1]) if len(page) == limit else None
+            chat_history = list(reversed(page))
             return {
                 "user_id": user_id,
                 "count": len(chat_history),
-                "messages": chat_history
+                "messages": chat_history,
+                "next_cursor": next_cursor
             }
         else:
             return {
                 "user_id": user_id,
                 "count": 0,
                 "messages": [],
+                "next_cursor": None,
                 "note": "Firebase kullanılamıyor, chat geçmişi kaydedilmiyor"
             }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Chat history error: {str(e)}")
         raise HTTPException(
@@ -333,26 +902,81 @@ async def get_chat_history(user_id: str, limit: int = 50):
             detail="Chat geçmişi getirilirken hata oluştu"
         )
 
+@router.get("/history/{user_id}/page")
+async def stream_chat_history_page(user_id: str, limit: int = Query(50, ge=1, le=MAX_HISTORY_PAGE_SIZE),
+                                   cursor: Optional[str] = None, fields: Optional[str] = None):
+    """
+    Chat geçmişinden bir sayfayı yeniden eskiye stream et
+    
+    Mesajlar Firestore'dan geldikçe yazılır; sayfa başına maliyet sabittir.
+    """
+    field_list = parse_history_fields(fields)
+    validate_history_cursor(cursor)
+    
+    async def generate():
+        yield '{"user_id": ' + json.dumps(user_id) + ', "messages": ['
+        count = 0
+        last = None
+        async for message in async_firebase_service.iter_chat_history_page(
+            user_id=user_id, limit=limit, cursor=cursor, fields=field_list
+        ):
+            yield ("," if count else "") + json.dumps(message, ensure_ascii=False, default=str)
+            count += 1
+            last = message
+        next_cursor = async_firebase_service.encode_chat_cursor(last) if count == limit else None
+        yield '], "count": ' + str(count) + ', "next_cursor": ' + json.dumps(next_cursor) + '}'
+    
+    return StreamingResponse(generate(), media_type="application/json")
+
+def run_chat_history_deletion(job: Job) -> Dict[str, Any]:
+    """Chat geçmişi silme işini çalıştır ve throughput'u raporla"""
+    def on_progress(deleted: int, pages: int):
+        elapsed = job.elapsed_seconds()
+        job.update(
+            deleted=deleted,
+            pages=pages,
+            docs_per_second=round(deleted / elapsed, 1) if elapsed > 0 else None
+        )
+    
+    job.update(deleted=0, pages=0, docs_per_second=None)
+    # BulkWriter yalnızca senkron client'ta var - iş BackgroundTasks threadpool'unda çalışır
+    deleted = firebase_service.delete_chat_history_paged(
+        user_id=job.params["user_id"],
+        page_size=job.params["page_size"],
+        progress=on_progress
+    )
+    elapsed = job.elapsed_seconds()
+    return {
+        "deleted": deleted,
+        "docs_per_second": round(deleted / elapsed, 1) if elapsed > 0 else None
+    }
+
 @router.delete("/history/{user_id}")
-async def delete_chat_history(user_id: str):
+async def delete_chat_history(user_id: str, background_tasks: BackgroundTasks,
+                              page_size: int = Query(DELETE_PAGE_SIZE, ge=1, le=500)):
     """
-    Kullanıcının chat geçmişini sil
+    Kullanıcının chat geçmişini arka planda sil
+    
+    İş ID'si döner; ilerleme /api/chat/jobs/{job_id} ile izlenir.
     """
     try:
-        if firebase_service.is_available():
-            success = firebase_service.delete_chat_history(user_id=user_id)
-            if success:
-                return {"message": "Chat geçmişi başarıyla silindi"}
-            else:
-                raise HTTPException(
-                    status_code=500,
-                    detail="Chat geçmişi silinemedi"
-                )
-        else:
+        if not firebase_service.is_available():
             return {"message": "Firebase kullanılamıyor, chat geçmişi zaten yok"}
         
-    except HTTPException:
-        raise
+        # Aynı kullanıcı için devam eden silme işi varsa onu döndür
+        job = job_registry.find_active("delete_chat_history", user_id=user_id)
+        if job is None:
+            job = job_registry.create("delete_chat_history", user_id=user_id, page_size=page_size)
+            background_tasks.add_task(job_registry.run, job, run_chat_history_deletion)
+            logger.info(f"Chat history deletion job started: {job.id} for user: {user_id}")
+        
+        return {
+            "message": "Chat geçmişi silme işlemi başlatıldı",
+            "job_id": job.id,
+            "status": job.status,
+            "status_url": f"/api/chat/jobs/{job.id}"
+        }
+        
     except Exception as e:
         logger.error(f"Chat history deletion error: {str(e)}")
         raise HTTPException(
@@ -360,6 +984,19 @@ async def delete_chat_history(user_id: str):
             detail="Chat geçmişi silinirken hata oluştu"
         )
 
+@router.get("/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    """
+    Arka plan işinin durumunu ve ilerlemesini getir
+    """
+    job = job_registry.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail="İş bulunamadı"
+        )
+    return job.to_dict()
+
 @router.post("/analyze-intent")
 async def analyze_message_intent(request: ChatRequest):
     """
@@ -398,6 +1035,15 @@ async def chat_health():
             "status": "healthy",
             "gemini_service": "available",
             "firebase_service": "available" if firebase_available else "unavailable",
+            "firestore_cache": collection_cache.stats(),
+            "snapshot_mirror": snapshot_mirror.stats(),
+            "chat_sessions": chat_session_manager.stats(),
+            "idempotency": idempotency_store.stats(),
+            "jobs": job_registry.stats(),
+            "admission": chat_admission.stats(),
+            "user_locks": user_locks.stats(),
+            "audio": audio_service.get_stats(),
+            "tts": tts_service.stats(),
             "timestamp": datetime.now().isoformat()
         }
         
@@ -409,30 +1055,245 @@ async def chat_health():
             "timestamp": datetime.now().isoformat()
         }
 
-@router.post("/audio-message", response_model=ChatResponse)
-async def send_audio_message(file: UploadFile = File(...), user_id: str = "default"):
+def ensure_transcript(text: str):
+    """Tanınamayan ses veya tanıma servisi hatası kullanıcı mesajı gibi chat'e gönderilmez"""
+    if text == UNRECOGNIZED_TEXT:
+        raise HTTPException(
+            status_code=400,
+            detail=UNRECOGNIZED_TEXT
+        )
+    if text == SERVICE_ERROR_TEXT:
+        raise HTTPException(
+            status_code=503,
+            detail=SERVICE_ERROR_TEXT,
+            headers={"Retry-After": "5"}
+        )
+
+async def run_audio_message_job(job: Job, audio_data: sr.AudioData, cache_key: str, user_id: str,
+                                tts: bool = False) -> Dict[str, Any]:
+    """Uzun sesli mesaj: parçaları paralel tanı, metni normal mesaj gibi işle"""
+    job.update(stage="transcribing")
+    text_message = await audio_service.transcribe_prepared(
+        audio_data,
+        cache_key,
+        on_progress=lambda done, total: job.update(segments_done=done, segments_total=total)
+    )
+    if text_message in (UNRECOGNIZED_TEXT, SERVICE_ERROR_TEXT):
+        # İş başarısız sayılır; metin chat'e gönderilmez
+        raise RuntimeError(text_message)
+    job.update(stage="responding")
+    async with user_locks.hold(user_id):
+        result = await process_message(ChatRequest(message=text_message, user_id=user_id, tts=tts))
+    return {"transcript": text_message, "response": result.model_dump(mode="json")}
+
+async def process_audio_message(file: UploadFile, user_id: str, background_tasks: BackgroundTasks, tts: bool = False):
     """
     Sesli mesajı işle ve AI yanıtı döndür
+    
+    Uzun kayıtlarda istek bloklanmaz; iş arka planda başlatılır ve AudioJobAccepted döner.
+    Idempotency deposunda saklanabilmesi için Response nesnesi değil düz veri döner.
     """
     try:
-        # Sesli mesajı text'e çevir
-        text_message = await audio_service.transcribe_audio(file)
+        # Sesli mesajı oku, önbellekte yoksa decode + ön işleme
+        text_message, audio_data, cache_key = await audio_service.load_upload(file)
         
-        if not text_message:
-            raise HTTPException(
-                status_code=400,
-                detail="Ses dosyası işlenemedi"
-            )
+        if text_message is None:
+            if audio_data is None:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Ses dosyası işlenemedi"
+                )
+            
+            duration = audio_service.duration(audio_data)
+            if duration > AUDIO_SYNC_MAX_SECONDS:
+                job = job_registry.create("audio_message", user_id=user_id, seconds=round(duration, 1))
+                background_tasks.add_task(
+                    job_registry.run_async, job,
+                    lambda job: run_audio_message_job(job, audio_data, cache_key, user_id, tts)
+                )
+                logger.info(f"Long audio message job started: {job.id} ({duration:.1f}s) for user: {user_id}")
+                return AudioJobAccepted(
+                    message="Uzun sesli mesaj arka planda işleniyor",
+                    job_id=job.id,
+                    status=job.status,
+                    status_url=f"/api/chat/jobs/{job.id}"
+                )
+            
+            text_message = await audio_service.transcribe_prepared(audio_data, cache_key)
+        ensure_transcript(text_message)
         
-        # Text mesajını normal mesaj gibi işle
-        request = ChatRequest(message=text_message, user_id=user_id)
-        return await send_message(request)
+        # Text mesajını normal mesaj gibi işle - kullanıcının diğer mesajlarıyla sıralı
+        request = ChatRequest(message=text_message, user_id=user_id, tts=tts)
+        async with user_locks.hold(user_id):
+            return await process_message(request)
         
     except HTTPException:
         raise
+    except TranscriptionQueueFull:
+        raise HTTPException(
+            status_code=503,
+            detail="Ses tanıma kuyruğu dolu, lütfen daha sonra tekrar deneyin",
+            headers={"Retry-After": "5"}
+        )
+    except TranscriptionTimeout:
+        raise HTTPException(
+            status_code=504,
+            detail="Ses tanıma zaman aşımına uğradı"
+        )
     except Exception as e:
         logger.error(f"Audio message error: {str(e)}")
         raise HTTPException(
             status_code=500,
             detail="Sesli mesaj işlenirken hata oluştu"
-        ) 
\ No newline at end of file
+        )
+
+@router.post("/audio-message", response_model=ChatResponse, responses={
+    202: {"model": AudioJobAccepted, "description": "Uzun kayıt arka planda işleniyor"}
+})
+async def send_audio_message(response: Response, background_tasks: BackgroundTasks, file: UploadFile = File(...),
+                             user_id: str = "default", tts: bool = False, idempotency_key: Optional[str] = Header(None)):
+    """
+    Sesli mesajı işle ve AI yanıtı döndür
+    
+    Idempotency-Key header'ı ile tekrar edilen yüklemeler yeniden transcribe edilmez.
+    AUDIO_SYNC_MAX_SECONDS'tan uzun kayıtlar için 202 + iş ID'si döner.
+    """
+    replayed = False
+    if not idempotency_key:
+        result = await process_audio_message(file, user_id, background_tasks, tts)
+    else:
+        # İş yalnızca ilk denemede planlanır; tekrarlar aynı job_id'yi alır
+        result, replayed = await idempotency_store.run(
+            f"audio:{user_id}",
+            idempotency_key,
+            lambda: process_audio_message(file, user_id, background_tasks, tts)
+        )
+    
+    headers = {"Idempotent-Replayed": "true"} if replayed else None
+    if isinstance(result, AudioJobAccepted):
+        # Her dönüşte yeni Response - saklanan nesneye arka plan görevi bağlanmaz
+        return JSONResponse(status_code=202, content=result.model_dump(), headers=headers)
+    if headers:
+        response.headers.update(headers)
+    return result
+
+async def run_transcription_job(job: Job, audio_data: sr.AudioData, cache_key: str, language: str) -> Dict[str, Any]:
+    """Sessizlikten bölünmüş parçaları paralel tanı, sırayla birleştir"""
+    segments = await audio_service.transcribe_segments(
+        audio_data,
+        language,
+        on_progress=lambda done, total: job.update(segments_done=done, segments_total=total)
+    )
+    text = audio_service.stitch_segments(segments)
+    audio_service.remember_transcript(cache_key, text)
+    return {"text": text, "segments": segments, "duration_seconds": round(audio_service.duration(audio_data), 2)}
+
+@router.post("/transcriptions", status_code=202)
+async def create_transcription(background_tasks: BackgroundTasks, file: UploadFile = File(...), language: str = "tr-TR"):
+    """
+    Uzun ses kaydını arka planda metne çevir
+    
+    Durum /api/chat/transcriptions/{job_id}, sonuç /api/chat/transcriptions/{job_id}/result ile alınır.
+    """
+    cached, audio_data, cache_key = await audio_service.load_upload(file, language)
+    if cached is None and audio_data is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Ses dosyası işlenemedi"
+        )
+    
+    if cached is not None:
+        job = job_registry.create("transcription", language=language, cached=True)
+        job_registry.run(job, lambda job: {"text": cached, "segments": [], "duration_seconds": None})
+    else:
+        job = job_registry.create("transcription", language=language, seconds=round(audio_service.duration(audio_data), 1))
+        background_tasks.add_task(
+            job_registry.run_async, job,
+            lambda job: run_transcription_job(job, audio_data, cache_key, language)
+        )
+        logger.info(f"Transcription job started: {job.id}")
+    
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/api/chat/transcriptions/{job.id}",
+        "result_url": f"/api/chat/transcriptions/{job.id}/result"
+    }
+
+def get_transcription_job(job_id: str) -> Job:
+    job = job_registry.get(job_id)
+    if job is None or job.kind != "transcription":
+        raise HTTPException(
+            status_code=404,
+            detail="Transcription işi bulunamadı"
+        )
+    return job
+
+@router.get("/transcriptions/{job_id}")
+async def get_transcription_status(job_id: str):
+    """
+    Transcription işinin durumu ve ilerlemesi (tanınan parça sayısı)
+    """
+    status = get_transcription_job(job_id).to_dict()
+    status.pop("result")
+    return status
+
+@router.get("/transcriptions/{job_id}/result")
+async def get_transcription_result(job_id: str):
+    """
+    Transcription sonucu - iş sürüyorsa 202 döner
+    """
+    job = get_transcription_job(job_id)
+    if job.is_active:
+        return JSONResponse(status_code=202, content={"job_id": job.id, "status": job.status, "progress": job.progress})
+    if job.status == "failed":
+        raise HTTPException(
+            status_code=500,
+            detail=f"Ses tanıma başarısız: {job.error}"
+        )
+    return job.result
+
+def tts_stream_response(key: str, speech_text: str, audio_format: str) -> StreamingResponse:
+    # Ses içerik adresli - istemci/CDN süresiz önbelleğe alabilir
+    return StreamingResponse(
+        tts_service.stream(key, speech_text, audio_format),
+        media_type=tts_service.media_type(audio_format),
+        headers={"Cache-Control": "public, max-age=31536000, immutable"}
+    )
+
+@router.get("/tts/{key}")
+async def get_tts_audio(key: str):
+    """
+    Yanıtın sesini akış olarak indir (ChatResponse.audio_url)
+    """
+    entry = tts_service.lookup(key)
+    if entry is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Ses bulunamadı"
+        )
+    return tts_stream_response(key, *entry)
+
+@router.post("/tts")
+async def synthesize_text(request: TTSRequest):
+    """
+    Metni sese çevir ve akış olarak döndür (Opus/Ogg veya AAC)
+    """
+    if not tts_service.available:
+        raise HTTPException(
+            status_code=503,
+            detail="Sesli yanıt (TTS) kullanılamıyor"
+        )
+    if request.format and request.format not in TTS_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Desteklenen formatlar: {', '.join(TTS_FORMATS)}"
+        )
+    
+    key = tts_service.register(request.text, request.format)
+    if key is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Okunacak metin yok"
+        )
+    return tts_stream_response(key, *tts_service.lookup(key))
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Request
 from models.schemas import NoteRequest, NoteResponse
+from services.async_firebase_service import async_firebase_service
 from services.firebase_service import firebase_service
-from typing import List
+from services.bulk_import_service import create_import_job, import_ndjson
+from typing import List, Optional
 import uuid
 from datetime import datetime
 import logging
@@ -20,8 +22,8 @@ async def get_all_notes():
     """
     try:
         # Firebase kullanılabilirse Firebase'den al
-        if firebase_service.is_available():
-            firebase_notes = firebase_service.get_notes()
+        if async_firebase_service.is_available():
+            firebase_notes = await async_firebase_service.get_notes()
             return {
                 "notes": firebase_notes,
                 "count": len(firebase_notes)
@@ -61,8 +63,8 @@ async def create_note_simple(title: str, content: str):
     """
     try:
         # Firebase kullanılabilirse Firebase'e kaydet
-        if firebase_service.is_available():
-            note_id = firebase_service.create_note(title, content)
+        if async_firebase_service.is_available():
+            note_id = await async_firebase_service.create_note(title, content)
             if note_id:
                 logger.info(f"Note created in Firebase: {note_id}")
                 return {
@@ -135,6 +137,38 @@ async def create_note(request: NoteRequest):
             detail="Not oluşturulurken hata oluştu"
         )
 
+@router.post("/import")
+async def import_notes(request: Request, user_id: str = None, job_id: Optional[str] = Header(None)):
+    """
+    NDJSON gövdesinden toplu not içe aktar (satır başına {"title", "content", "user_id"})
+    
+    Gövde akış olarak okunur ve BulkWriter ile yazılır; yanıtta yazılan, geçersiz ve
+    doküman/sn bilgisi döner. user_id verilirse user_id alanı olmayan satırlara uygulanır.
+    İstemcinin ürettiği UUID Job-Id header'ı ile gönderilirse ilerleme içe aktarma sürerken
+    /api/chat/jobs/{job_id} ile izlenebilir.
+    """
+    if not firebase_service.is_available():
+        raise HTTPException(
+            status_code=503,
+            detail="Firebase kullanılamıyor, içe aktarma yapılamaz"
+        )
+    
+    try:
+        job = create_import_job("notes", user_id, job_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        )
+    
+    await import_ndjson(request, job, firebase_service.create_notes_bulk)
+    if job.status == "failed":
+        raise HTTPException(
+            status_code=500,
+            detail="Notlar içe aktarılırken hata oluştu"
+        )
+    return job.to_dict()
+
 @router.get("/list/{user_id}", response_model=List[NoteResponse])
 async def get_user_notes(user_id: str):
     """
@@ -165,6 +199,22 @@ async def get_note(note_id: str):
     Belirli bir notu getir
     """
     try:
+        # Firebase kullanılabilirse doküman ID ile oku
+        if async_firebase_service.is_available():
+            note = await async_firebase_service.get_note(note_id)
+            if note:
+                created_at = datetime.fromisoformat(note["created_at"]) if note.get("created_at") else datetime.now()
+                return NoteResponse(
+                    id=note["id"],
+                    title=note.get("title", ""),
+                    content=note.get("content", ""),
+                    user_id=note.get("user_id", "default"),
+                    is_voice_note=note.get("is_voice_note", False),
+                    created_at=created_at,
+                    updated_at=datetime.fromisoformat(note["updated_at"]) if note.get("updated_at") else created_at
+                )
+        
+        # In-memory storage'dan al (/create ile oluşturulan notlar)
         if note_id not in notes_storage:
             raise HTTPException(
                 status_code=404,
@@ -191,8 +241,8 @@ async def delete_note(note_id: str):
         deleted = False
         
         # Önce Firebase'den silmeyi dene
-        if firebase_service.is_available():
-            firebase_deleted = firebase_service.delete_note(note_id)
+        if async_firebase_service.is_available():
+            firebase_deleted = await async_firebase_service.delete_note(note_id)
             if firebase_deleted:
                 deleted = True
                 logger.info(f"Note deleted from Firebase: {note_id}")
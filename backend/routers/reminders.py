@@ -1,7 +1,10 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Request
 from models.schemas import ReminderRequest, ReminderResponse
+from services.async_firebase_service import async_firebase_service
 from services.firebase_service import firebase_service
-from typing import List
+from services.bulk_import_service import create_import_job, import_ndjson
+from utils.timestamps import to_timestamp, utc_now
+from typing import List, Optional
 import uuid
 from datetime import datetime
 import logging
@@ -20,8 +23,8 @@ async def create_reminder(request: ReminderRequest):
     """
     try:
         # Firebase kullanılabilirse Firebase'e kaydet
-        if firebase_service.is_available():
-            reminder_id = firebase_service.create_reminder(
+        if async_firebase_service.is_available():
+            reminder_id = await async_firebase_service.create_reminder(
                 title=request.title,
                 description=request.description,
                 reminder_time=request.reminder_time.isoformat(),
@@ -65,21 +68,56 @@ async def create_reminder(request: ReminderRequest):
             detail="Hatırlatıcı oluşturulurken hata oluştu"
         )
 
+@router.post("/import")
+async def import_reminders(request: Request, user_id: str = None, job_id: Optional[str] = Header(None)):
+    """
+    NDJSON gövdesinden toplu hatırlatıcı içe aktar (satır başına {"title", "description", "reminder_time", "user_id"})
+    
+    Gövde akış olarak okunur ve BulkWriter ile yazılır; yanıtta yazılan, geçersiz ve
+    doküman/sn bilgisi döner. user_id verilirse user_id alanı olmayan satırlara uygulanır.
+    İstemcinin ürettiği UUID Job-Id header'ı ile gönderilirse ilerleme içe aktarma sürerken
+    /api/chat/jobs/{job_id} ile izlenebilir.
+    """
+    if not firebase_service.is_available():
+        raise HTTPException(
+            status_code=503,
+            detail="Firebase kullanılamıyor, içe aktarma yapılamaz"
+        )
+    
+    try:
+        job = create_import_job("reminders", user_id, job_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        )
+    
+    await import_ndjson(request, job, firebase_service.create_reminders_bulk)
+    if job.status == "failed":
+        raise HTTPException(
+            status_code=500,
+            detail="Hatırlatıcılar içe aktarılırken hata oluştu"
+        )
+    return job.to_dict()
+
 @router.get("/", response_model=List[ReminderResponse])
-async def get_reminders(user_id: str = None, include_completed: bool = False):
+async def get_reminders(user_id: str = None, include_completed: bool = False,
+                        start: datetime = None, end: datetime = None):
     """
-    Hatırlatıcıları listele
+    Hatırlatıcıları listele (start/end verilirse hatırlatma zamanı bu aralıkta olanlar)
     """
     try:
         # Firebase kullanılabilirse Firebase'den al
-        if firebase_service.is_available():
-            firebase_reminders = firebase_service.get_reminders(user_id=user_id, include_completed=include_completed)
+        if async_firebase_service.is_available():
+            firebase_reminders = await async_firebase_service.get_reminders(
+                user_id=user_id, include_completed=include_completed, start=start, end=end
+            )
             reminders = []
             
             for reminder in firebase_reminders:
                 try:
-                    # Firebase'den gelen reminder_time string'ini parse et
-                    reminder_time = datetime.fromisoformat(reminder["reminder_time"].replace('Z', '+00:00'))
+                    # Firebase'den gelen reminder_time servis tarafından datetime'a çevrilir
+                    reminder_time = reminder["reminder_time"]
                     reminders.append(ReminderResponse(
                         id=reminder["id"],
                         title=reminder["title"],
@@ -95,17 +133,22 @@ async def get_reminders(user_id: str = None, include_completed: bool = False):
             
             return reminders
         
-        # In-memory storage'dan al
+        # In-memory storage'dan al - sınırlar ve hatırlatma zamanları UTC karşılaştırılır
+        start = to_timestamp(start) if start else None
+        end = to_timestamp(end) if end else None
         user_reminders = []
         for reminder in reminders_storage.values():
             if user_id and reminder["user_id"] != user_id:
                 continue
             if not include_completed and reminder.get("is_completed", False):
                 continue
+            reminder_time = to_timestamp(reminder["reminder_time"])
+            if (start and reminder_time < start) or (end and reminder_time > end):
+                continue
             user_reminders.append(ReminderResponse(**reminder))
         
         # Hatırlatma zamanına göre sırala
-        user_reminders.sort(key=lambda x: x.reminder_time)
+        user_reminders.sort(key=lambda x: to_timestamp(x.reminder_time))
         
         return user_reminders
         
@@ -123,21 +166,20 @@ async def get_reminder(reminder_id: str):
     """
     try:
         # Firebase kullanılabilirse Firebase'den al
-        if firebase_service.is_available():
-            # Firebase'de tek reminder getirme fonksiyonu yok, tüm reminders'ı alıp filtrele
-            firebase_reminders = firebase_service.get_reminders(include_completed=True)
-            for reminder in firebase_reminders:
-                if reminder["id"] == reminder_id:
-                    reminder_time = datetime.fromisoformat(reminder["reminder_time"].replace('Z', '+00:00'))
-                    return ReminderResponse(
-                        id=reminder["id"],
-                        title=reminder["title"],
-                        description=reminder.get("description", ""),
-                        reminder_time=reminder_time,
-                        user_id=reminder.get("user_id", "default"),
-                        is_completed=reminder.get("is_completed", False),
-                        created_at=datetime.fromisoformat(reminder["created_at"]) if reminder.get("created_at") else datetime.now()
-                    )
+        if async_firebase_service.is_available():
+            # Doküman ID ile tek okuma
+            reminder = await async_firebase_service.get_reminder(reminder_id)
+            if reminder:
+                reminder_time = reminder["reminder_time"]
+                return ReminderResponse(
+                    id=reminder["id"],
+                    title=reminder["title"],
+                    description=reminder.get("description", ""),
+                    reminder_time=reminder_time,
+                    user_id=reminder.get("user_id", "default"),
+                    is_completed=reminder.get("is_completed", False),
+                    created_at=datetime.fromisoformat(reminder["created_at"]) if reminder.get("created_at") else datetime.now()
+                )
             
             raise HTTPException(
                 status_code=404,
@@ -169,8 +211,8 @@ async def update_reminder(reminder_id: str, request: ReminderRequest):
     """
     try:
         # Firebase kullanılabilirse Firebase'de güncelle
-        if firebase_service.is_available():
-            if firebase_service.update_reminder(
+        if async_firebase_service.is_available():
+            if await async_firebase_service.update_reminder(
                 reminder_id=reminder_id,
                 title=request.title,
                 description=request.description,
@@ -226,8 +268,8 @@ async def complete_reminder(reminder_id: str):
     """
     try:
         # Firebase kullanılabilirse Firebase'de güncelle
-        if firebase_service.is_available():
-            if firebase_service.update_reminder(reminder_id=reminder_id, is_completed=True):
+        if async_firebase_service.is_available():
+            if await async_firebase_service.update_reminder(reminder_id=reminder_id, is_completed=True):
                 logger.info(f"Reminder completed in Firebase: {reminder_id}")
                 return {
                     "message": "Hatırlatıcı tamamlandı olarak işaretlendi",
@@ -270,8 +312,8 @@ async def delete_reminder(reminder_id: str):
     """
     try:
         # Firebase kullanılabilirse Firebase'den sil
-        if firebase_service.is_available():
-            if firebase_service.delete_reminder(reminder_id):
+        if async_firebase_service.is_available():
+            if await async_firebase_service.delete_reminder(reminder_id):
                 logger.info(f"Reminder deleted from Firebase: {reminder_id}")
                 return {
                     "message": "Hatırlatıcı başarıyla silindi",
@@ -330,20 +372,20 @@ async def get_upcoming_reminders(user_id: str, hours: int = 24):
     try:
         from datetime import timedelta
         
-        now = datetime.now()
+        now = utc_now()
         future_limit = now + timedelta(hours=hours)
         
-        # Tüm aktif hatırlatıcıları al
-        all_reminders = await get_reminders(user_id=user_id, include_completed=False)
+        # Aralıktaki aktif hatırlatıcıları al
+        all_reminders = await get_reminders(user_id=user_id, include_completed=False, start=now, end=future_limit)
         
         # Yaklaşan olanları filtrele
         upcoming_reminders = [
             reminder for reminder in all_reminders
-            if now <= reminder.reminder_time <= future_limit
+            if now <= to_timestamp(reminder.reminder_time) <= future_limit
         ]
         
         # Hatırlatma zamanına göre sırala
-        upcoming_reminders.sort(key=lambda x: x.reminder_time)
+        upcoming_reminders.sort(key=lambda x: to_timestamp(x.reminder_time))
         
         return {
             "period_hours": hours,
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, HTTPException
 from models.schemas import WeatherRequest, WeatherResponse
+from utils.gazetteer import gazetteer
 import requests
+import asyncio
 import os
 from datetime import datetime
 import logging
@@ -25,16 +27,19 @@ async def get_weather_by_city(city: str = "Istanbul"):
         # OpenWeatherMap API URL'i
         base_url = "http://api.openweathermap.org/data/2.5/weather"
         
+        # Türkiye il/ilçe isimlerini normalize et ("İzmir'de" → "Izmir,TR")
+        place = gazetteer.lookup(city)
+        
         # Parametreler
         params = {
-            "q": city,
+            "q": place.weather_query if place else city,
             "appid": api_key,
             "units": "metric",  # Celsius için
             "lang": "tr"  # Türkçe açıklamalar
         }
         
         # API çağrısı
-        response = requests.get(base_url, params=params)
+        response = await asyncio.to_thread(requests.get, base_url, params=params)
         
         if response.status_code == 404:
             raise HTTPException(
@@ -90,16 +95,23 @@ async def get_current_weather(request: WeatherRequest):
         # OpenWeatherMap API URL'i
         base_url = "http://api.openweathermap.org/data/2.5/weather"
         
+        # Türkiye il/ilçe isimlerini normalize et
+        place = gazetteer.lookup(request.city) if request.country_code in (None, "TR") else None
+        if place:
+            query = place.weather_query
+        else:
+            query = f"{request.city},{request.country_code}" if request.country_code else request.city
+        
         # Parametreler
         params = {
-            "q": f"{request.city},{request.country_code}" if request.country_code else request.city,
+            "q": query,
             "appid": api_key,
             "units": "metric",  # Celsius için
             "lang": "tr"  # Türkçe açıklamalar
         }
         
         # API çağrısı
-        response = requests.get(base_url, params=params)
+        response = await asyncio.to_thread(requests.get, base_url, params=params)
         
         if response.status_code == 404:
             raise HTTPException(
@@ -160,7 +172,7 @@ async def search_cities(city_name: str):
             "appid": api_key
         }
         
-        response = requests.get(base_url, params=params)
+        response = await asyncio.to_thread(requests.get, base_url, params=params)
         
         if response.status_code != 200:
             raise HTTPException(
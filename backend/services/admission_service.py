@@ -0,0 +1,105 @@
+import os
+import math
+import time
+import asyncio
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
+
+logger = logging.getLogger(__name__)
+
+class AdmissionRejected(Exception):
+    """İstek kabul edilmedi (kuyruk dolu veya bekleme süresi aşıldı)"""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+class AdmissionController:
+    """Eşzamanlı istek sınırı + en fazla bekleme süreli sınırlı kuyruk"""
+
+    def __init__(self, max_in_flight: int = None, max_queue: int = None, max_wait: float = None):
+        self.max_in_flight = max_in_flight or int(os.getenv("CHAT_MAX_IN_FLIGHT", 32))
+        self.max_queue = max_queue if max_queue is not None else int(os.getenv("CHAT_MAX_QUEUE", 100))
+        self.max_wait = max_wait if max_wait is not None else float(os.getenv("CHAT_MAX_QUEUE_WAIT", 2.0))
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.shed_queue_full = 0
+        self.shed_timeout = 0
+        # Son kuyruk bekleme süreleri (saniye)
+        self._queue_times = deque(maxlen=1000)
+
+    @property
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.max_wait))
+
+    async def acquire(self) -> float:
+        """Slot al - kuyrukta geçen süreyi döndürür, alınamazsa AdmissionRejected"""
+        started = time.monotonic()
+        if not self._semaphore.locked():
+            # Boş slot var - beklemeden al
+            await self._semaphore.acquire()
+        else:
+            if self.queued >= self.max_queue:
+                self.shed_queue_full += 1
+                raise AdmissionRejected("queue_full", self.retry_after)
+
+            self.queued += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.max_wait)
+            except asyncio.TimeoutError:
+                self.shed_timeout += 1
+                raise AdmissionRejected("queue_timeout", self.retry_after)
+            finally:
+                self.queued -= 1
+
+        waited = time.monotonic() - started
+        self._queue_times.append(waited)
+        self.in_flight += 1
+        self.admitted += 1
+        return waited
+
+    def release(self):
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[float]:
+        """Slot alıp bırakan context manager"""
+        waited = await self.acquire()
+        try:
+            yield waited
+        finally:
+            self.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Kabul kontrolü istatistikleri"""
+        queue_times = sorted(self._queue_times)
+        if queue_times:
+            queue_time = {
+                "avg_ms": round(sum(queue_times) / len(queue_times) * 1000, 2),
+                "p95_ms": round(queue_times[min(len(queue_times) - 1, int(len(queue_times) * 0.95))] * 1000, 2),
+                "max_ms": round(queue_times[-1] * 1000, 2)
+            }
+        else:
+            queue_time = {"avg_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "shed": self.shed_queue_full + self.shed_timeout,
+            "shed_queue_full": self.shed_queue_full,
+            "shed_timeout": self.shed_timeout,
+            "queue_time": queue_time,
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "max_wait_seconds": self.max_wait
+        }
+
+# Global chat admission controller instance
+chat_admission = AdmissionController()
@@ -0,0 +1,398 @@
+import os
+import logging
+from typing import Optional, List, Dict, Any, AsyncIterator, Tuple, Union
+from google.cloud import firestore
+from google.oauth2 import service_account
+from datetime import datetime, timedelta
+
+from services.firebase_service import FirebaseService, BATCH_WRITE_LIMIT
+from utils.timestamps import TIME_FIELDS, to_timestamp, normalize_time_field, in_range
+
+logger = logging.getLogger(__name__)
+
+class AsyncFirebaseService:
+    """
+    firestore.AsyncClient üzerinde FirebaseService ile aynı metotlar.
+    Round trip'ler event loop'u bloklamaz; router'lar bu servisi await eder.
+    Thread'de çalışan işler (BulkWriter ile silme) ve script'ler senkron FirebaseService'i kullanır.
+    """
+
+    # Doküman verisi ve cursor yardımcıları senkron servisle ortak
+    note_document = staticmethod(FirebaseService.note_document)
+    event_document = staticmethod(FirebaseService.event_document)
+    reminder_document = staticmethod(FirebaseService.reminder_document)
+    chat_message_document = staticmethod(FirebaseService.chat_message_document)
+    encode_chat_cursor = staticmethod(FirebaseService.encode_chat_cursor)
+    decode_chat_cursor = staticmethod(FirebaseService.decode_chat_cursor)
+    # Sorgu önbelleği ve snapshot aynası da ortak
+    read_cached = staticmethod(FirebaseService.read_cached)
+    store_cached = staticmethod(FirebaseService.store_cached)
+    record_write = staticmethod(FirebaseService.record_write)
+
+    def __init__(self):
+        self.db = None
+        self.is_initialized = False
+        self._initialize()
+
+    def _initialize(self):
+        """Async Firestore client'ı oluştur (bağlantı ilk istekte açılır)"""
+        try:
+            key_path = os.getenv('FIREBASE_SERVICE_ACCOUNT_KEY_PATH')
+            if key_path and os.path.exists(key_path):
+                credentials = service_account.Credentials.from_service_account_file(key_path)
+                self.db = firestore.AsyncClient(credentials=credentials)
+                logger.info("Async Firestore client initialized with service account key")
+            else:
+                # Varsayılan credentials veya FIRESTORE_EMULATOR_HOST
+                self.db = firestore.AsyncClient()
+                logger.info("Async Firestore client initialized with default credentials")
+            self.is_initialized = True
+        except Exception as e:
+            logger.error(f"Async Firestore initialization failed: {e}")
+            self.is_initialized = False
+
+    def is_available(self) -> bool:
+        """Firebase kullanılabilir mi?"""
+        return self.is_initialized and self.db is not None
+
+    @staticmethod
+    def _snapshot_data(doc, *timestamp_fields: str) -> Dict[str, Any]:
+        """Doküman verisi + id; timestamp alanları ISO string'e çevrilir"""
+        data = doc.to_dict()
+        data['id'] = doc.id
+        for field in timestamp_fields:
+            if data.get(field):
+                data[field] = data[field].isoformat()
+        return data
+
+    async def _create(self, collection: str, data: Dict[str, Any], label: str) -> Optional[str]:
+        if not self.is_available():
+            return None
+
+        write_time = None
+        try:
+            doc_ref = self.db.collection(collection).document()
+            write_time = (await doc_ref.set(data)).update_time
+            logger.info(f"{label} created with ID: {doc_ref.id}")
+            return doc_ref.id
+        except Exception as e:
+            logger.error(f"Error creating {label.lower()}: {e}")
+            return None
+        finally:
+            self.record_write(collection, user_id=data.get('user_id'), write_time=write_time)
+
+    async def _get(self, collection: str, doc_id: str, label: str, *timestamp_fields: str) -> Optional[Dict[str, Any]]:
+        """Tek dokümanı ID ile oku (bulunamazsa None)"""
+        if not self.is_available():
+            return None
+
+        try:
+            doc = await self.db.collection(collection).document(doc_id).get()
+            if not doc.exists:
+                return None
+            data = self._snapshot_data(doc, *timestamp_fields)
+            if collection in TIME_FIELDS:
+                normalize_time_field(data, TIME_FIELDS[collection])
+            return data
+        except Exception as e:
+            logger.error(f"Error getting {label.lower()}: {e}")
+            return None
+
+    async def _update(self, collection: str, doc_id: str, update_data: Dict[str, Any], label: str) -> bool:
+        if not self.is_available() or not update_data:
+            return False
+
+        write_time = None
+        try:
+            write_time = (await self.db.collection(collection).document(doc_id).update(update_data)).update_time
+            logger.info(f"{label} updated: {doc_id}")
+            return True
+        except Exception as e:
+            logger.error(f"Error updating {label.lower()}: {e}")
+            return False
+        finally:
+            self.record_write(collection, doc_id=doc_id, write_time=write_time)
+
+    async def _delete(self, collection: str, doc_id: str, label: str) -> bool:
+        if not self.is_available():
+            return False
+
+        write_time = None
+        try:
+            write_time = await self.db.collection(collection).document(doc_id).delete()
+            logger.info(f"{label} deleted: {doc_id}")
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting {label.lower()}: {e}")
+            return False
+        finally:
+            self.record_write(collection, doc_id=doc_id, write_time=write_time)
+
+    async def _cached_query(self, collection: str, user_id: Optional[str], query, timestamp_fields: Tuple[str, ...],
+                            include_completed: bool = True, start: datetime = None, end: datetime = None) -> List[Dict[str, Any]]:
+        """
+        Sorgu sonucunu snapshot aynasından, kullanıcı önbelleğinden veya Firestore'dan getir.
+        start/end verilirse aralık önbellekteki listeye uygulanır, önbellek yoksa sorguya eklenir.
+        """
+        time_field = TIME_FIELDS.get(collection)
+        documents, token = self.read_cached(collection, user_id, include_completed)
+        if documents is not None:
+            return in_range(documents, time_field, start, end) if time_field else documents
+
+        ranged = start is not None or end is not None
+        if start is not None:
+            query = query.where(time_field, '>=', start)
+        if end is not None:
+            query = query.where(time_field, '<=', end)
+        documents = [self._snapshot_data(doc, *timestamp_fields) async for doc in query.stream()]
+        if time_field:
+            for document in documents:
+                normalize_time_field(document, time_field)
+        # Önbellek tam listeyi tutar - aralık sorguları önbelleğe yazılmaz
+        if not ranged:
+            self.store_cached(collection, user_id, documents, token, include_completed)
+        return documents
+
+    # BATCH OPERATIONS
+    async def commit_writes(self, writes: List[Tuple[str, Dict[str, Any]]]) -> Optional[List[str]]:
+        """
+        (koleksiyon, veri) çiftlerini WriteBatch'ler halinde yaz.
+        Sırayla oluşturulan doküman ID'lerini döndürür, hata durumunda None.
+        """
+        if not self.is_available():
+            return None
+        if not writes:
+            return []
+
+        write_time = None
+        try:
+            doc_ids = []
+            for start in range(0, len(writes), BATCH_WRITE_LIMIT):
+                batch = self.db.batch()
+                for collection, data in writes[start:start + BATCH_WRITE_LIMIT]:
+                    doc_ref = self.db.collection(collection).document()
+                    batch.set(doc_ref, data)
+                    doc_ids.append(doc_ref.id)
+                write_time = max(result.update_time for result in await batch.commit())
+            logger.info(f"Committed {len(writes)} documents in batches")
+            return doc_ids
+        except Exception as e:
+            logger.error(f"Error committing batch writes: {e}")
+            return None
+        finally:
+            for collection, user_id in {(c, d.get('user_id')) for c, d in writes}:
+                self.record_write(collection, user_id=user_id, write_time=write_time)
+
+    # NOTES OPERATIONS
+    async def create_note(self, title: str, content: str, user_id: str = "default") -> Optional[str]:
+        """Not oluştur"""
+        return await self._create('notes', self.note_document(title, content, user_id), "Note")
+
+    async def get_notes(self, user_id: str = None) -> List[Dict[str, Any]]:
+        """Notları getir"""
+        if not self.is_available():
+            return []
+
+        try:
+            notes_ref = self.db.collection('notes')
+            if user_id:
+                notes_ref = notes_ref.where('user_id', '==', user_id)
+            notes_ref = notes_ref.order_by('created_at', direction=firestore.Query.DESCENDING)
+            return await self._cached_query('notes', user_id, notes_ref, ('created_at', 'updated_at'))
+        except Exception as e:
+            logger.error(f"Error getting notes: {e}")
+            return []
+
+    async def get_note(self, note_id: str) -> Optional[Dict[str, Any]]:
+        """Tek not getir"""
+        return await self._get('notes', note_id, "Note", 'created_at', 'updated_at')
+
+    async def update_note(self, note_id: str, title: str = None, content: str = None) -> bool:
+        """Not güncelle"""
+        update_data = {'updated_at': firestore.SERVER_TIMESTAMP}
+        if title is not None:
+            update_data['title'] = title
+        if content is not None:
+            update_data['content'] = content
+        return await self._update('notes', note_id, update_data, "Note")
+
+    async def delete_note(self, note_id: str) -> bool:
+        """Not sil"""
+        return await self._delete('notes', note_id, "Note")
+
+    # CALENDAR EVENTS OPERATIONS
+    async def create_event(self, title: str, datetime_str: Union[str, datetime], description: str = "",
+                           user_id: str = "default") -> Optional[str]:
+        """Etkinlik oluştur"""
+        return await self._create('events', self.event_document(title, datetime_str, description, user_id), "Event")
+
+    async def get_events(self, user_id: str = None, start: datetime = None, end: datetime = None) -> List[Dict[str, Any]]:
+        """Etkinlikleri getir (start/end verilirse yalnızca bu aralıktakiler)"""
+        if not self.is_available():
+            return []
+        start = to_timestamp(start) if start else None
+        end = to_timestamp(end) if end else None
+
+        try:
+            events_ref = self.db.collection('events')
+            if user_id:
+                events_ref = events_ref.where('user_id', '==', user_id)
+            events_ref = events_ref.order_by('datetime')
+            return await self._cached_query('events', user_id, events_ref, ('created_at',), start=start, end=end)
+        except Exception as e:
+            logger.error(f"Error getting events: {e}")
+            return []
+
+    async def get_event(self, event_id: str) -> Optional[Dict[str, Any]]:
+        """Tek etkinlik getir"""
+        return await self._get('events', event_id, "Event", 'created_at')
+
+    async def update_event(self, event_id: str, title: str = None, datetime_str: Union[str, datetime] = None,
+                           description: str = None) -> bool:
+        """Etkinlik güncelle"""
+        update_data = {}
+        if title is not None:
+            update_data['title'] = title
+        if datetime_str is not None:
+            update_data['datetime'] = to_timestamp(datetime_str)
+        if description is not None:
+            update_data['description'] = description
+        return await self._update('events', event_id, update_data, "Event")
+
+    async def delete_event(self, event_id: str) -> bool:
+        """Etkinlik sil"""
+        return await self._delete('events', event_id, "Event")
+
+    # CHAT MESSAGES OPERATIONS
+    async def save_chat_message(self, message: str, response: str, user_id: str = "default", intent: str = "chat") -> Optional[str]:
+        """Chat mesajını kaydet"""
+        return await self._create('chat_messages', self.chat_message_document(message, response, user_id, intent), "Chat message")
+
+    async def get_chat_history(self, user_id: str = "default", limit: int = 50) -> List[Dict[str, Any]]:
+        """Chat geçmişini getir"""
+        messages = [message async for message in self.iter_chat_history_page(user_id=user_id, limit=limit)]
+        # Eski mesajları önce göstermek için ters çevir
+        return list(reversed(messages))
+
+    async def iter_chat_history_page(self, user_id: str = "default", limit: int = 50, cursor: str = None,
+                                     fields: List[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Chat geçmişinden bir sayfayı en yeniden eskiye stream et (cursor + alan projeksiyonu)"""
+        if not self.is_available():
+            return
+
+        # Geçersiz cursor çağırana ValueError olarak iletilir
+        start_after = self.decode_chat_cursor(cursor) if cursor else None
+
+        try:
+            messages_ref = self.db.collection('chat_messages')
+            if user_id:
+                messages_ref = messages_ref.where('user_id', '==', user_id)
+            messages_ref = messages_ref.order_by('timestamp', direction=firestore.Query.DESCENDING)
+            messages_ref = messages_ref.order_by('__name__', direction=firestore.Query.DESCENDING)
+            if fields:
+                # Cursor için timestamp her zaman gerekli
+                messages_ref = messages_ref.select(sorted(set(fields) | {'timestamp'}))
+            if start_after:
+                messages_ref = messages_ref.start_after(start_after)
+            messages_ref = messages_ref.limit(limit)
+
+            async for doc in messages_ref.stream():
+                yield self._snapshot_data(doc, 'timestamp')
+        except Exception as e:
+            logger.error(f"Error getting chat history page: {e}")
+
+    # REMINDERS OPERATIONS
+    async def create_reminder(self, title: str, description: str, reminder_time: Union[str, datetime],
+                              user_id: str = "default") -> Optional[str]:
+        """Hatırlatıcı oluştur"""
+        return await self._create('reminders', self.reminder_document(title, description, reminder_time, user_id), "Reminder")
+
+    async def get_reminders(self, user_id: str = None, include_completed: bool = False,
+                            start: datetime = None, end: datetime = None) -> List[Dict[str, Any]]:
+        """Hatırlatıcıları getir (start/end verilirse yalnızca bu aralıktakiler)"""
+        if not self.is_available():
+            return []
+        start = to_timestamp(start) if start else None
+        end = to_timestamp(end) if end else None
+
+        try:
+            reminders_ref = self.db.collection('reminders')
+            if user_id:
+                reminders_ref = reminders_ref.where('user_id', '==', user_id)
+            if not include_completed:
+                reminders_ref = reminders_ref.where('is_completed', '==', False)
+            reminders_ref = reminders_ref.order_by('reminder_time')
+            return await self._cached_query('reminders', user_id, reminders_ref, ('created_at',), include_completed,
+                                            start=start, end=end)
+        except Exception as e:
+            logger.error(f"Error getting reminders: {e}")
+            return []
+
+    async def get_reminder(self, reminder_id: str) -> Optional[Dict[str, Any]]:
+        """Tek hatırlatıcı getir"""
+        return await self._get('reminders', reminder_id, "Reminder", 'created_at')
+
+    async def update_reminder(self, reminder_id: str, title: str = None, description: str = None,
+                              reminder_time: Union[str, datetime] = None, is_completed: bool = None) -> bool:
+        """Hatırlatıcı güncelle"""
+        update_data = {}
+        if title is not None:
+            update_data['title'] = title
+        if description is not None:
+            update_data['description'] = description
+        if reminder_time is not None:
+            update_data['reminder_time'] = to_timestamp(reminder_time)
+        if is_completed is not None:
+            update_data['is_completed'] = is_completed
+        return await self._update('reminders', reminder_id, update_data, "Reminder")
+
+    async def delete_reminder(self, reminder_id: str) -> bool:
+        """Hatırlatıcı sil"""
+        return await self._delete('reminders', reminder_id, "Reminder")
+
+    # WEATHER CACHE OPERATIONS (Opsiyonel)
+    async def cache_weather_data(self, city: str, weather_data: Dict[str, Any], ttl_minutes: int = 30) -> bool:
+        """Hava durumu verilerini önbelleğe al"""
+        if not self.is_available():
+            return False
+
+        try:
+            await self.db.collection('weather_cache').document(city.lower()).set({
+                'city': city,
+                'data': weather_data,
+                'cached_at': firestore.SERVER_TIMESTAMP,
+                'expires_at': datetime.now() + timedelta(minutes=ttl_minutes)
+            })
+            logger.info(f"Weather data cached for city: {city}")
+            return True
+        except Exception as e:
+            logger.error(f"Error caching weather data: {e}")
+            return False
+
+    async def get_cached_weather_data(self, city: str) -> Optional[Dict[str, Any]]:
+        """Önbelleğe alınmış hava durumu verilerini getir"""
+        if not self.is_available():
+            return None
+
+        try:
+            doc_ref = self.db.collection('weather_cache').document(city.lower())
+            doc = await doc_ref.get()
+
+            if doc.exists:
+                data = doc.to_dict()
+                expire_time = data.get('expires_at')
+
+                # Önbellek süresi dolmuş mu kontrol et
+                if expire_time and datetime.now() < expire_time:
+                    return data.get('data')
+                # Süresi dolmuş önbelleği sil
+                await doc_ref.delete()
+                logger.info(f"Expired weather cache deleted for city: {city}")
+
+            return None
+        except Exception as e:
+            logger.error(f"Error getting cached weather data: {e}")
+            return None
+
+# Global async Firebase service instance
+async_firebase_service = AsyncFirebaseService()
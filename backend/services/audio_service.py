@@ -1,108 +1,377 @@
 import os
+import io
+import time
+import wave
+import audioop
+import asyncio
+import hashlib
 import tempfile
 import speech_recognition as sr
-from pydub import AudioSegment
 from pydub.utils import which
 import logging
+from collections import deque
+from typing import Optional, Dict, Any, List, Tuple, Callable
 from fastapi import UploadFile
 
+from services.transcription_pool import transcription_pool, TranscriptionQueueFull, TranscriptionTimeout
+from services.transcription_worker import recognize_pcm, UNRECOGNIZED_TEXT, SERVICE_ERROR_TEXT
+from services.transcript_cache import transcript_cache
+from services.decoder_pool import DecoderPool
+from utils.audio_preprocessing import preprocess_pcm, split_at_silence, TARGET_SAMPLE_RATE
+
 logger = logging.getLogger(__name__)
 
+# Upload'ı decoder'a aktarırken okunan parça boyutu
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# ffmpeg çıkışı: recognizer için 16 kHz mono 16-bit PCM
+DECODE_SAMPLE_RATE = 16000
+DECODE_SAMPLE_WIDTH = 2
+
+# Sonu pipe'tan okunamayan (moov atom'u sonda olabilen) formatlar - seekable girdi gerekir
+SEEKABLE_FORMATS = {"m4a", "mp4", "mov", "3gp", "aac"}
+
 class AudioService:
     def __init__(self):
-        self.recognizer = sr.Recognizer()
         # FFmpeg path'ini kontrol et
-        AudioSegment.converter = which("ffmpeg")
-        AudioSegment.ffmpeg = which("ffmpeg")
-        AudioSegment.ffprobe = which("ffprobe")
-    
+        self.ffmpeg = which("ffmpeg") or "ffmpeg"
+        # Uzun kayıtlar bu süreyi aşmayan parçalara bölünüp paralel tanınır
+        self.chunk_seconds = float(os.getenv("AUDIO_CHUNK_SECONDS", 25))
+        self.stats = {
+            "clips": 0,
+            "upload_bytes": 0,
+            "pcm_bytes": 0,
+            "disk_bytes_written": 0,
+            "decode_seconds": 0.0,
+            "preprocess_seconds": 0.0,
+            "payload_bytes_before": 0,
+            "payload_bytes_after": 0,
+            "recognize_seconds": 0.0,
+            "seekable_spawns": 0,
+            "probe_fallbacks": 0,
+            "chunked_clips": 0,
+            "chunks": 0
+        }
+        # Format başına son decode süreleri
+        self._decode_times: Dict[str, deque] = {}
+        # Stream formatları için önceden başlatılmış ffmpeg decoder'ları
+        self.decoder_pool = DecoderPool(self._ffmpeg_command("pipe:0"))
+
+    def start(self):
+        """Decoder havuzunu doldur - uygulama açılışında (lifespan) çağrılır"""
+        self.decoder_pool.start()
+
+    def shutdown(self):
+        """Bekleyen decoder process'lerini kapat"""
+        self.decoder_pool.shutdown()
+
     async def transcribe_audio(self, file: UploadFile, language: str = "tr-TR") -> str:
         """
-        UploadFile objesi ile ses dosyasını metne dönüştürür
+        UploadFile objesi ile ses dosyasını metne dönüştürür - geçici dosya kullanmadan.
+        Aynı ses içeriği (hash) daha önce tanındıysa decode/tanıma yapılmaz.
         """
-        temp_file_path = None
         try:
-            # Geçici dosya oluştur
-            with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file.filename.split('.')[-1] if '.' in file.filename else 'wav'}") as temp_file:
-                temp_file_path = temp_file.name
-                # Ses dosyasını geçici dosyaya yaz
-                file_content = await file.read()
-                temp_file.write(file_content)
-            
-            logger.info(f"Audio file saved to: {temp_file_path}")
-            
-            # Ses dosyasını metne dönüştür
-            text = self.speech_to_text(temp_file_path, language)
-            return text
-            
+            cached, audio_data, cache_key = await self.load_upload(file, language)
+            if cached is not None:
+                return cached
+            if audio_data is None:
+                return None
+            return await self.transcribe_prepared(audio_data, cache_key, language)
+
+        except (TranscriptionQueueFull, TranscriptionTimeout):
+            raise
         except Exception as e:
             logger.error(f"Error in transcribe_audio: {str(e)}")
             return None
-        finally:
-            # Geçici dosyayı temizle
-            if temp_file_path:
-                self.cleanup_temp_file(temp_file_path)
-        
-    def convert_audio_to_wav(self, audio_file_path: str) -> str:
+
+    async def load_upload(self, file: UploadFile, language: str = "tr-TR") -> Tuple[Optional[str], Optional[sr.AudioData], str]:
         """
-        Ses dosyasını WAV formatına dönüştürür
+        Upload'ı oku, önbellekte yoksa decode edip ön işle.
+        (önbellekteki transcript, hazır PCM, önbellek anahtarı) döner; decode hatasında PCM None olur.
         """
+        # Upload'ı parça parça oku ve hash'le
+        data, digest = await self.read_upload(file)
+        cache_key = transcript_cache.make_key(digest, language, transcription_pool.backend)
+        cached = transcript_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Transcript cache hit: {digest[:12]}")
+            return cached, None, cache_key
+
         try:
-            # Ses dosyasını yükle
-            audio = AudioSegment.from_file(audio_file_path)
-            
-            # WAV formatında geçici dosya oluştur
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_wav:
-                wav_path = temp_wav.name
-                
-            # WAV formatında kaydet
-            audio.export(wav_path, format="wav")
-            logger.info(f"Audio converted to WAV: {wav_path}")
-            return wav_path
-            
+            # Bellekte PCM'e çevir
+            audio_data = await self.decode_bytes(data, self.audio_format(file.filename))
+            # Sessizliği kırp, 16 kHz mono'ya indir - recognizer'a en küçük yük gider
+            audio_data = await self.preprocess(audio_data)
         except Exception as e:
-            logger.error(f"Error converting audio to WAV: {str(e)}")
-            raise Exception(f"Ses dosyası dönüştürme hatası: {str(e)}")
-    
-    def speech_to_text(self, audio_file_path: str, language: str = "tr-TR") -> str:
+            logger.error(f"Error decoding audio upload: {str(e)}")
+            return None, None, cache_key
+        return None, audio_data, cache_key
+
+    async def transcribe_prepared(self, audio_data: sr.AudioData, cache_key: str, language: str = "tr-TR",
+                                  on_progress: Callable[[int, int], None] = None) -> str:
+        """Ön işlenmiş PCM'i (gerekirse parçalayarak) metne çevir ve önbelleğe yaz"""
+        if not audio_data.frame_data:
+            logger.warning("No speech found in audio after silence trimming")
+            return UNRECOGNIZED_TEXT
+
+        text = self.stitch_segments(await self.transcribe_segments(audio_data, language, on_progress))
+        self.remember_transcript(cache_key, text)
+        return text
+
+    @staticmethod
+    def remember_transcript(cache_key: str, text: str):
+        """Yalnızca gerçek tanıma sonuçları saklanır"""
+        if text not in (UNRECOGNIZED_TEXT, SERVICE_ERROR_TEXT):
+            transcript_cache.put(cache_key, text)
+
+    async def transcribe_segments(self, audio_data: sr.AudioData, language: str = "tr-TR",
+                                  on_progress: Callable[[int, int], None] = None) -> List[Dict[str, Any]]:
         """
-        Ses dosyasını metne dönüştürür
+        Sesi sessizlik sınırlarından parçalara böl, parçaları worker havuzunda paralel tanı.
+        Sonuçlar kayıttaki sırayla döner. Kısa klipler tek parçadır.
         """
-        wav_path = None
-        try:
-            # Ses dosyasını WAV formatına dönüştür
-            wav_path = self.convert_audio_to_wav(audio_file_path)
-            
-            # Ses dosyasını aç
-            with sr.AudioFile(wav_path) as source:
-                # Gürültüyü azalt
-                self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
-                # Ses verisini oku
-                audio_data = self.recognizer.record(source)
-            
-            # Google Speech Recognition kullanarak metne dönüştür
+        frames, rate, width = audio_data.frame_data, audio_data.sample_rate, audio_data.sample_width
+        ranges = await asyncio.to_thread(split_at_silence, frames, rate, width, self.chunk_seconds)
+        if len(ranges) > 1:
+            self.stats["chunked_clips"] += 1
+            self.stats["chunks"] += len(ranges)
+            logger.info(f"Long audio split into {len(ranges)} segments ({self.duration(audio_data):.1f}s)")
+
+        # Tek kayıt havuz kuyruğunu doldurmasın - aynı anda en fazla worker sayısı kadar parça
+        limit = asyncio.Semaphore(transcription_pool.max_workers)
+        done = 0
+
+        async def recognize(index: int, start: int, end: int) -> Dict[str, Any]:
+            nonlocal done
+            async with limit:
+                text = await self.speech_to_text(sr.AudioData(frames[start * width:end * width], rate, width), language)
+            done += 1
+            if on_progress:
+                on_progress(done, len(ranges))
+            return {"index": index, "start": round(start / rate, 2), "end": round(end / rate, 2), "text": text}
+
+        return list(await asyncio.gather(*(recognize(i, start, end) for i, (start, end) in enumerate(ranges))))
+
+    @staticmethod
+    def stitch_segments(segments: List[Dict[str, Any]]) -> str:
+        """Parça metinlerini sırayla birleştir; tanınamayan parçalar atlanır"""
+        texts = [s["text"] for s in segments if s["text"] not in (UNRECOGNIZED_TEXT, SERVICE_ERROR_TEXT)]
+        if texts:
+            return " ".join(texts)
+        if any(s["text"] == SERVICE_ERROR_TEXT for s in segments):
+            return SERVICE_ERROR_TEXT
+        return UNRECOGNIZED_TEXT
+
+    @staticmethod
+    def duration(audio_data: sr.AudioData) -> float:
+        """PCM süresi (saniye)"""
+        return len(audio_data.frame_data) / (audio_data.sample_rate * audio_data.sample_width)
+
+    @staticmethod
+    def audio_format(filename: Optional[str]) -> str:
+        """Dosya adından ses formatını belirle"""
+        if filename and '.' in filename:
+            return filename.rsplit('.', 1)[-1].lower()
+        return "wav"
+
+    async def read_upload(self, file: UploadFile) -> Tuple[bytearray, str]:
+        """
+        Upload'ı parça parça tek bir tampona oku - içerik hash'ini okurken hesapla.
+        Tampon kopyalanmadan döner; tepe bellek klip boyutu kadardır.
+        """
+        buffer = bytearray()
+        digest = hashlib.sha256()
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            buffer.extend(chunk)
+            digest.update(chunk)
+        self.stats["upload_bytes"] += len(buffer)
+        return buffer, digest.hexdigest()
+
+    async def decode_upload(self, file: UploadFile) -> sr.AudioData:
+        """Upload'ı okuyup bellekte PCM'e çevirir"""
+        data, _ = await self.read_upload(file)
+        return await self.decode_bytes(data, self.audio_format(file.filename))
+
+    async def decode_bytes(self, data: bytes, audio_format: str) -> sr.AudioData:
+        """
+        Ses verisini bellekte PCM'e çevirir.
+        WAV process içinde okunur; diğer formatlar hazır bekleyen ffmpeg decoder'ına pipe ile verilir.
+        Uzantı içerikle uyuşmazsa (uzantısız dosya, float/extensible WAV) ffmpeg içeriği yoklayarak
+        yeniden dener.
+        """
+        started = time.perf_counter()
+
+        if audio_format == "wav":
+            decoders = [self._decode_wav_async, self._decode_stream, self._decode_seekable]
+        elif audio_format in SEEKABLE_FORMATS:
+            decoders = [self._decode_seekable]
+        else:
+            decoders = [self._decode_stream, self._decode_seekable]
+
+        for attempt, decoder in enumerate(decoders):
+            try:
+                audio_data = await decoder(data)
+                break
+            except Exception as e:
+                if attempt == len(decoders) - 1:
+                    raise
+                logger.warning(f"Audio decode as {audio_format} failed, probing content with ffmpeg: {e}")
+                self.stats["probe_fallbacks"] += 1
+
+        elapsed = time.perf_counter() - started
+        self.stats["clips"] += 1
+        self.stats["pcm_bytes"] += len(audio_data.frame_data)
+        self.stats["decode_seconds"] += elapsed
+        self._decode_times.setdefault(audio_format, deque(maxlen=500)).append(elapsed)
+        logger.info(f"Audio decoded in memory ({audio_format}): {len(audio_data.frame_data)} PCM bytes in {elapsed * 1000:.1f} ms")
+        return audio_data
+
+    async def preprocess(self, audio_data: sr.AudioData) -> sr.AudioData:
+        """NumPy ile sessizlik kırpma ve yeniden örnekleme (event loop dışında)"""
+        started = time.perf_counter()
+        pcm, info = await asyncio.to_thread(
+            preprocess_pcm,
+            audio_data.frame_data,
+            audio_data.sample_rate,
+            audio_data.sample_width
+        )
+        self.stats["preprocess_seconds"] += time.perf_counter() - started
+        self.stats["payload_bytes_before"] += info["input_bytes"]
+        self.stats["payload_bytes_after"] += info["output_bytes"]
+        logger.info(f"Audio preprocessed: {info['input_seconds']}s -> {info['output_seconds']}s, "
+                    f"{info['input_bytes']} -> {info['output_bytes']} bytes (noise floor {info['noise_floor']})")
+        return sr.AudioData(pcm, TARGET_SAMPLE_RATE, 2)
+
+    async def _decode_wav_async(self, data: bytes) -> sr.AudioData:
+        return self.decode_wav(data)
+
+    def decode_wav(self, data: bytes) -> sr.AudioData:
+        """WAV verisini process içinde mono PCM'e çevirir"""
+        with wave.open(io.BytesIO(data), "rb") as wav:
+            channels = wav.getnchannels()
+            sample_width = wav.getsampwidth()
+            sample_rate = wav.getframerate()
+            frames = wav.readframes(wav.getnframes())
+
+        if channels == 2:
+            frames = audioop.tomono(frames, sample_width, 0.5, 0.5)
+        elif channels > 2:
+            raise Exception(f"Desteklenmeyen kanal sayısı: {channels}")
+        return sr.AudioData(frames, sample_rate, sample_width)
+
+    def _ffmpeg_command(self, source: str):
+        # stdin girdi olarak kullanılmıyorsa ffmpeg'in stdin'i okuması kapatılır
+        stdin_flags = [] if source == "pipe:0" else ["-nostdin"]
+        return [
+            self.ffmpeg, *stdin_flags, "-loglevel", "error",
+            "-i", source,
+            "-f", "s16le", "-acodec", "pcm_s16le",
+            "-ac", "1", "-ar", str(DECODE_SAMPLE_RATE),
+            "pipe:1"
+        ]
+
+    async def _decode_stream(self, data: bytes) -> sr.AudioData:
+        """Veriyi hazır bekleyen bir ffmpeg decoder'ın stdin'ine yaz, PCM çıktısını topla"""
+        returncode, pcm, error = await asyncio.to_thread(self.decoder_pool.decode, data)
+        return self._pcm_result(returncode, pcm, error)
+
+    async def _decode_seekable(self, data: bytes) -> sr.AudioData:
+        """
+        Seekable girdi gerektiren formatları (m4a/mp4) decode eder.
+        Linux'ta veri memfd (bellek içi dosya) üzerinden verilir, diske yazılmaz.
+        """
+        # Girdi dosyası process başlarken verilmeli - bu formatlar için hazır decoder kullanılamaz
+        self.stats["seekable_spawns"] += 1
+        if hasattr(os, "memfd_create"):
+            fd = os.memfd_create("audio-upload")
             try:
-                text = self.recognizer.recognize_google(audio_data, language=language)
-                logger.info(f"Speech to text successful: {text}")
-                return text
-            except sr.UnknownValueError:
-                logger.warning("Speech recognition could not understand audio")
-                return "Ses anlaşılamadı. Lütfen daha net konuşun."
-            except sr.RequestError as e:
-                logger.error(f"Speech recognition service error: {str(e)}")
-                return "Ses tanıma servisi hatası. Lütfen tekrar deneyin."
-                
+                os.write(fd, data)
+                process = await asyncio.create_subprocess_exec(
+                    *self._ffmpeg_command(f"/dev/fd/{fd}"),
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    pass_fds=(fd,)
+                )
+                pcm, error = await process.communicate()
+            finally:
+                os.close(fd)
+            return self._pcm_result(process.returncode, pcm, error)
+
+        # memfd yoksa geçici dosyaya düş
+        temp_file_path = None
+        try:
+            with tempfile.NamedTemporaryFile(delete=False) as temp_file:
+                temp_file_path = temp_file.name
+                temp_file.write(data)
+            self.stats["disk_bytes_written"] += len(data)
+            process = await asyncio.create_subprocess_exec(
+                *self._ffmpeg_command(temp_file_path),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            pcm, error = await process.communicate()
+            return self._pcm_result(process.returncode, pcm, error)
+        finally:
+            if temp_file_path:
+                self.cleanup_temp_file(temp_file_path)
+
+    def _pcm_result(self, returncode: int, pcm: bytes, error: bytes) -> sr.AudioData:
+        if returncode != 0 or not pcm:
+            message = error.decode(errors="ignore").strip() or f"ffmpeg exit code {returncode}"
+            raise Exception(f"Ses dosyası dönüştürme hatası: {message}")
+        return sr.AudioData(pcm, DECODE_SAMPLE_RATE, DECODE_SAMPLE_WIDTH)
+
+    async def speech_to_text(self, audio_data: sr.AudioData, language: str = "tr-TR") -> str:
+        """
+        PCM ses verisini metne dönüştürür - bloklayan tanıma işlem havuzunda çalışır
+        """
+        started = time.perf_counter()
+        try:
+            return await transcription_pool.run(
+                recognize_pcm,
+                audio_data.frame_data,
+                audio_data.sample_rate,
+                audio_data.sample_width,
+                language
+            )
+        except (TranscriptionQueueFull, TranscriptionTimeout):
+            raise
         except Exception as e:
             logger.error(f"Error in speech to text: {str(e)}")
             raise Exception(f"Ses tanıma hatası: {str(e)}")
         finally:
-            # Geçici WAV dosyasını sil
-            if wav_path and os.path.exists(wav_path):
-                try:
-                    os.unlink(wav_path)
-                except:
-                    pass
-    
+            self.stats["recognize_seconds"] += time.perf_counter() - started
+
+    def _decode_latency(self) -> Dict[str, Dict[str, Any]]:
+        """Format başına decode gecikmesi (son 500 klip)"""
+        latency = {}
+        for audio_format, times in self._decode_times.items():
+            times = sorted(times)
+            latency[audio_format] = {
+                "count": len(times),
+                "avg_ms": round(sum(times) / len(times) * 1000, 2),
+                "p95_ms": round(times[min(len(times) - 1, int(len(times) * 0.95))] * 1000, 2)
+            }
+        return latency
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Ses işleme istatistikleri"""
+        clips = self.stats["clips"]
+        return {
+            **self.stats,
+            "avg_decode_ms": round(self.stats["decode_seconds"] / clips * 1000, 2) if clips else 0.0,
+            "decode_latency": self._decode_latency(),
+            "decoder_pool": self.decoder_pool.stats(),
+            "avg_preprocess_ms": round(self.stats["preprocess_seconds"] / clips * 1000, 2) if clips else 0.0,
+            "payload_reduction": round(1 - self.stats["payload_bytes_after"] / self.stats["payload_bytes_before"], 3)
+            if self.stats["payload_bytes_before"] else 0.0,
+            "transcription_pool": transcription_pool.stats(),
+            "transcript_cache": transcript_cache.stats()
+        }
+
     def cleanup_temp_file(self, file_path: str):
         """
         Geçici dosyayı temizler
@@ -115,4 +384,4 @@ class AudioService:
             logger.warning(f"Could not clean up temporary file {file_path}: {str(e)}")
 
 # Global audio service instance
-audio_service = AudioService() 
\ No newline at end of file
+audio_service = AudioService()
@@ -0,0 +1,152 @@
+import os
+import json
+import uuid
+import queue
+import asyncio
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from fastapi import Request
+
+from services.job_service import job_registry, Job
+
+logger = logging.getLogger(__name__)
+
+# Request gövdesinden BulkWriter thread'ine aktarılan en fazla bekleyen parça (bellek sınırı)
+IMPORT_QUEUE_CHUNKS = int(os.getenv("IMPORT_QUEUE_CHUNKS", 64))
+# Firestore doküman sınırı - daha uzun satırlar geçersiz sayılır
+IMPORT_MAX_LINE_BYTES = 1024 * 1024
+
+def iter_ndjson(chunks: Iterable[bytes], stats: Dict[str, int], user_id: str = None) -> Iterator[Dict[str, Any]]:
+    """
+    Byte parçalarından NDJSON kayıtlarını sırayla üret; bellekte en fazla bir satır tutulur.
+    Ayrıştırılamayan veya obje olmayan satırlar stats["invalid"]'e sayılır.
+    user_id verilirse user_id alanı olmayan kayıtlara eklenir.
+    """
+    buffer = b""
+    skipping = False
+    for chunk in chunks:
+        if skipping:
+            # Sınırı aşan satırın kalanını atla
+            newline = chunk.find(b"\n")
+            if newline < 0:
+                continue
+            chunk = chunk[newline + 1:]
+            skipping = False
+
+        buffer += chunk
+        lines = buffer.split(b"\n")
+        buffer = lines.pop()
+        for line in lines:
+            record = _parse_line(line, stats, user_id)
+            if record is not None:
+                yield record
+
+        if len(buffer) > IMPORT_MAX_LINE_BYTES:
+            stats["lines"] += 1
+            stats["invalid"] += 1
+            buffer = b""
+            skipping = True
+
+    record = _parse_line(buffer, stats, user_id)
+    if record is not None:
+        yield record
+
+def _parse_line(line: bytes, stats: Dict[str, int], user_id: Optional[str]) -> Optional[Dict[str, Any]]:
+    line = line.strip()
+    if not line:
+        return None
+    stats["lines"] += 1
+    if len(line) > IMPORT_MAX_LINE_BYTES:
+        # Tek parçada tamamı gelen uzun satır da geçersiz
+        stats["invalid"] += 1
+        return None
+    try:
+        record = json.loads(line)
+    except ValueError:
+        stats["invalid"] += 1
+        return None
+    if not isinstance(record, dict):
+        stats["invalid"] += 1
+        return None
+    if user_id and not record.get("user_id"):
+        record["user_id"] = user_id
+    return record
+
+def _drain(chunks: queue.Queue) -> Iterator[bytes]:
+    while True:
+        chunk = chunks.get()
+        if chunk is None:
+            return
+        yield chunk
+
+def _put(chunks: queue.Queue, chunk: Optional[bytes], finished: threading.Event) -> bool:
+    """Kuyruğa yaz; yazan thread bittiyse (hata) bırak"""
+    while not finished.is_set():
+        try:
+            chunks.put(chunk, timeout=0.5)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def create_import_job(collection: str, user_id: str = None, job_id: str = None) -> Job:
+    """
+    İçe aktarma iş kaydını oluştur.
+    İstemci job_id'yi (UUID) kendisi üretip Job-Id header'ı ile gönderirse, içe aktarma sürerken
+    ilerlemeyi /api/chat/jobs/{job_id} ile izleyebilir. Geçersiz veya kullanımdaki id ValueError verir.
+    """
+    if job_id is not None:
+        try:
+            job_id = str(uuid.UUID(job_id))
+        except ValueError:
+            raise ValueError("Job-Id geçerli bir UUID olmalı")
+    try:
+        return job_registry.create("bulk_import", job_id=job_id, collection=collection, user_id=user_id)
+    except ValueError:
+        raise ValueError("Job-Id zaten kullanılıyor")
+
+async def import_ndjson(request: Request, job: Job, bulk_create: Callable[..., Dict[str, int]]) -> Job:
+    """
+    NDJSON request gövdesini akış olarak okuyup bulk_create (FirebaseService.create_*_bulk) ile yaz.
+    Gövde sınırlı bir kuyrukla worker thread'ine aktarılır, dosya boyutundan bağımsız sabit bellek
+    kullanılır. Her flush'ta job ilerlemesi (yazılan, doküman/sn) güncellenir; bitmiş iş kaydı döner.
+    """
+    collection = job.params["collection"]
+    user_id = job.params["user_id"]
+    chunks = queue.Queue(maxsize=IMPORT_QUEUE_CHUNKS)
+    finished = threading.Event()
+    stats = {"lines": 0, "invalid": 0}
+
+    def report(counts: Dict[str, int]) -> Dict[str, Any]:
+        elapsed = job.elapsed_seconds()
+        return {
+            "lines": stats["lines"],
+            "written": counts["written"],
+            "failed": counts["failed"],
+            "invalid": counts["invalid"] + stats["invalid"],
+            "docs_per_second": round(counts["written"] / elapsed, 1) if elapsed > 0 else None
+        }
+
+    def run(job: Job) -> Dict[str, Any]:
+        try:
+            counts = bulk_create(iter_ndjson(_drain(chunks), stats, user_id),
+                                 progress=lambda counts: job.update(**report(counts)))
+        finally:
+            finished.set()
+        return report(counts)
+
+    job.update(lines=0, written=0, failed=0, invalid=0, docs_per_second=None)
+    # BulkWriter yalnızca senkron client'ta var - yazma worker thread'inde
+    worker = asyncio.get_running_loop().run_in_executor(None, job_registry.run, job, run)
+    try:
+        async for chunk in request.stream():
+            if chunk and not await asyncio.to_thread(_put, chunks, chunk, finished):
+                break
+    finally:
+        await asyncio.to_thread(_put, chunks, None, finished)
+        await worker
+
+    logger.info(f"Bulk import {job.status}: {collection} - {job.progress}")
+    return job
@@ -0,0 +1,167 @@
+import os
+import time
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Callable, Awaitable
+
+from fastapi import WebSocket
+
+from services.gemini_service import get_gemini_service
+
+logger = logging.getLogger(__name__)
+
+class ChatSession:
+    """Kullanıcı başına sıcak tutulan chat oturumu"""
+
+    def __init__(self, user_id: str, history_size: int = 20, context_ttl: float = 60.0):
+        self.user_id = user_id
+        self.context_ttl = context_ttl
+        # Hazırlanmış Gemini servisi - her turda yeniden oluşturulmaz
+        self.gemini_service = get_gemini_service()
+        self.turns = deque(maxlen=history_size)
+        self.websockets = set()
+        self.created_at = time.monotonic()
+        self.last_active = self.created_at
+
+        # Önbelleğe alınmış context verileri
+        self._calendar_data = None
+        self._calendar_loaded_at = 0.0
+        # Yükleme sürerken gelen invalidation, eski verinin önbelleğe yazılmasını engeller
+        self._calendar_generation = 0
+        self._weather_data = {}
+
+    def touch(self):
+        """Son aktivite zamanını güncelle"""
+        self.last_active = time.monotonic()
+
+    def add_turn(self, message: str, response: str, intent: str):
+        """Son konuşma turlarına ekle"""
+        self.turns.append({
+            "user_message": message,
+            "ai_response": response,
+            "intent": intent,
+            "timestamp": datetime.now().isoformat()
+        })
+
+    def recent_turns(self) -> List[Dict[str, Any]]:
+        """Son konuşma turlarını getir"""
+        return list(self.turns)
+
+    async def get_calendar_data(self, loader: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Takvim verisini önbellekten veya loader'dan al"""
+        now = time.monotonic()
+        if self._calendar_data is None or now - self._calendar_loaded_at > self.context_ttl:
+            generation = self._calendar_generation
+            data = await loader()
+            if generation != self._calendar_generation:
+                return data
+            self._calendar_data = data
+            self._calendar_loaded_at = now
+        return self._calendar_data
+
+    def invalidate_calendar(self):
+        """Takvim önbelleğini geçersiz kıl (etkinlik oluşturulduğunda, güncellendiğinde veya silindiğinde)"""
+        self._calendar_generation += 1
+        self._calendar_data = None
+
+    async def get_weather_data(self, city: str, loader: Callable[[str], Awaitable[Optional[Dict[str, Any]]]]) -> Optional[Dict[str, Any]]:
+        """Şehir için hava durumu verisini önbellekten veya loader'dan al"""
+        now = time.monotonic()
+        cached = self._weather_data.get(city)
+        if cached and now - cached[0] <= self.context_ttl:
+            return cached[1]
+
+        weather_data = await loader(city)
+        if weather_data:
+            self._weather_data[city] = (now, weather_data)
+        return weather_data
+
+    async def push(self, payload: Dict[str, Any]) -> int:
+        """Oturuma bağlı tüm WebSocket'lere mesaj gönder"""
+        sent = 0
+        for websocket in list(self.websockets):
+            try:
+                await websocket.send_json(payload)
+                sent += 1
+            except Exception as e:
+                logger.warning(f"Push failed for user {self.user_id}: {e}")
+                self.websockets.discard(websocket)
+        return sent
+
+class ChatSessionManager:
+    """Kullanıcı başına tek chat oturumunu yönet"""
+
+    def __init__(self, max_sessions: int = None, history_size: int = None, context_ttl: float = None):
+        self.max_sessions = max_sessions or int(os.getenv("CHAT_SESSION_MAX", 1000))
+        self.history_size = history_size or int(os.getenv("CHAT_SESSION_HISTORY", 20))
+        self.context_ttl = context_ttl or float(os.getenv("CHAT_SESSION_CONTEXT_TTL", 60))
+        self._sessions = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    async def attach(self, user_id: str, websocket: WebSocket) -> ChatSession:
+        """WebSocket'i kullanıcının oturumuna bağla (yoksa oluştur)"""
+        async with self._lock:
+            session = self._sessions.get(user_id)
+            if session is None:
+                session = ChatSession(user_id, self.history_size, self.context_ttl)
+                self._sessions[user_id] = session
+                logger.info(f"Chat session created for user: {user_id}")
+            self._sessions.move_to_end(user_id)
+            session.websockets.add(websocket)
+            session.touch()
+            self._evict()
+            return session
+
+    async def detach(self, user_id: str, websocket: WebSocket):
+        """WebSocket'i oturumdan ayır - oturum sıcak kalır"""
+        async with self._lock:
+            session = self._sessions.get(user_id)
+            if session:
+                session.websockets.discard(websocket)
+                session.touch()
+
+    def _evict(self):
+        """Limit aşılırsa bağlantısı olmayan en eski oturumları at"""
+        if len(self._sessions) <= self.max_sessions:
+            return
+        for user_id in list(self._sessions.keys()):
+            if len(self._sessions) <= self.max_sessions:
+                break
+            if not self._sessions[user_id].websockets:
+                del self._sessions[user_id]
+                logger.info(f"Chat session evicted for user: {user_id}")
+
+    def get(self, user_id: str) -> Optional[ChatSession]:
+        """Kullanıcının oturumunu getir"""
+        return self._sessions.get(user_id)
+
+    async def push(self, user_id: str, payload: Dict[str, Any]) -> int:
+        """Sunucu taraflı push - kullanıcının bağlı istemcilerine gönder"""
+        session = self._sessions.get(user_id)
+        if not session:
+            return 0
+        return await session.push(payload)
+
+    def note_write(self, collection: str, user_id: Optional[str] = None, doc_id: Optional[str] = None):
+        """
+        Firebase yazma dinleyicisi - etkinlik yazılınca oturumların takvim önbelleği düşer.
+        Takvim context'i tüm etkinliklerden kurulur; yazan kullanıcıdan bağımsız hepsi geçersiz kılınır.
+        Yazan thread'den çağrılabilir.
+        """
+        if collection != "events":
+            return
+        for session in list(self._sessions.values()):
+            session.invalidate_calendar()
+
+    def stats(self) -> Dict[str, Any]:
+        """Oturum istatistikleri"""
+        return {
+            "sessions": len(self._sessions),
+            "connections": sum(len(s.websockets) for s in self._sessions.values()),
+            "max_sessions": self.max_sessions
+        }
+
+# Global chat session manager instance
+chat_session_manager = ChatSessionManager()
@@ -0,0 +1,170 @@
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Önbelleğe alınan koleksiyonlar
+CACHED_COLLECTIONS = ('notes', 'events', 'reminders')
+# user_id verilmeden yapılan (tüm kullanıcılar) sorguların anahtarı
+ALL_USERS = "*"
+
+class CollectionCache:
+    """
+    notes / events / reminders sorgu sonuçları için kullanıcı başına read-through önbellek.
+    Kullanıcılar LRU ile sınırlı, girdiler TTL ile eskir. Yazmalar yalnızca etkilenen
+    kullanıcının (ve tüm kullanıcılar sorgusunun) o koleksiyondaki girdilerini düşürür;
+    sahibi bilinmeyen dokümana yazılırsa koleksiyonun tamamı düşürülür.
+    Senkron ve async Firestore servisleri aynı örneği paylaşır.
+    """
+
+    def __init__(self, max_users: int = None, ttl_seconds: float = None):
+        self.max_users = max_users or int(os.getenv("FIRESTORE_CACHE_MAX_USERS", 1000))
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.getenv("FIRESTORE_CACHE_TTL", 30))
+        # kullanıcı -> {(koleksiyon, varyant): (saklanma zamanı, dokümanlar)}
+        self._users = OrderedDict()
+        # (koleksiyon, doküman id) -> kullanıcı
+        self._owners = {}
+        # Okuma sürerken gelen yazma, eski sonucun önbelleğe yazılmasını engeller
+        self._clock = 0
+        self._invalidated = OrderedDict()
+        self._floor = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.collection_invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    @staticmethod
+    def _user_key(user_id: Optional[str]) -> str:
+        return user_id or ALL_USERS
+
+    def lookup(self, collection: str, user_id: Optional[str], variant: str = "") -> Tuple[Optional[List[Dict[str, Any]]], int]:
+        """
+        Önbellekteki dokümanların kopyası ve store() için sürüm döndür.
+        Sonuç None ise çağıran Firestore'dan okuyup store() ile yazar.
+        """
+        user_key = self._user_key(user_id)
+        with self._lock:
+            token = self._clock
+            if not self.enabled:
+                return None, token
+            entries = self._users.get(user_key)
+            cached = entries.get((collection, variant)) if entries else None
+            if cached and time.monotonic() - cached[0] <= self.ttl_seconds:
+                self._users.move_to_end(user_key)
+                self.hits += 1
+                return [dict(doc) for doc in cached[1]], token
+            self.misses += 1
+            return None, token
+
+    def store(self, collection: str, user_id: Optional[str], documents: List[Dict[str, Any]], token: int, variant: str = ""):
+        """lookup()'tan sonra okunan dokümanları yaz (arada yazma olduysa yazmaz)"""
+        if not self.enabled:
+            return
+        user_key = self._user_key(user_id)
+        with self._lock:
+            if token < self._floor or self._invalidated.get((collection, user_key), -1) > token \
+                    or self._invalidated.get((collection, None), -1) > token:
+                return
+
+            self._users.setdefault(user_key, {})[(collection, variant)] = (
+                time.monotonic(), [dict(doc) for doc in documents]
+            )
+            self._users.move_to_end(user_key)
+            if user_key != ALL_USERS:
+                for doc in documents:
+                    self._owners[(collection, doc['id'])] = user_key
+
+            while len(self._users) > self.max_users:
+                evicted_key, entries = self._users.popitem(last=False)
+                self._forget(evicted_key, entries)
+
+    def _forget(self, user_key: str, entries: Dict[Tuple[str, str], Any]):
+        """Düşürülen girdilerdeki dokümanların sahip kaydını sil"""
+        for (entry_collection, _), (_, documents) in entries.items():
+            for doc in documents:
+                if self._owners.get((entry_collection, doc['id'])) == user_key:
+                    del self._owners[(entry_collection, doc['id'])]
+
+    def _mark(self, collection: str, user_key: Optional[str]):
+        self._clock += 1
+        self._invalidated[(collection, user_key)] = self._clock
+        self._invalidated.move_to_end((collection, user_key))
+        while len(self._invalidated) > self.max_users * 4:
+            _, stamp = self._invalidated.popitem(last=False)
+            self._floor = max(self._floor, stamp)
+
+    def _drop_user(self, collection: str, user_key: str):
+        entries = self._users.get(user_key)
+        if not entries:
+            return
+        dropped = {key: value for key, value in entries.items() if key[0] == collection}
+        for key in dropped:
+            del entries[key]
+        self._forget(user_key, dropped)
+        if not entries:
+            del self._users[user_key]
+
+    def _drop_owner(self, collection: str, user_key: str):
+        for key in (user_key, ALL_USERS):
+            self._mark(collection, key)
+            self._drop_user(collection, key)
+
+    def invalidate_user(self, collection: str, user_id: Optional[str]):
+        """Kullanıcının koleksiyondaki girdilerini ve tüm kullanıcılar sorgusunu düşür"""
+        with self._lock:
+            self.invalidations += 1
+            self._drop_owner(collection, self._user_key(user_id))
+
+    def invalidate_document(self, collection: str, doc_id: str):
+        """Güncellenen/silinen dokümanın sahibinin girdilerini düşür"""
+        with self._lock:
+            user_key = self._owners.get((collection, doc_id))
+            if user_key is not None:
+                self.invalidations += 1
+                self._drop_owner(collection, user_key)
+                return
+        self.invalidate_collection(collection)
+
+    def invalidate_collection(self, collection: str):
+        """Koleksiyonun tüm kullanıcılardaki girdilerini düşür"""
+        with self._lock:
+            self.collection_invalidations += 1
+            self._mark(collection, None)
+            for user_key in list(self._users.keys()):
+                self._drop_user(collection, user_key)
+
+    def clear(self):
+        with self._lock:
+            self._clock += 1
+            self._floor = self._clock
+            self._users.clear()
+            self._owners.clear()
+            self._invalidated.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Önbellek istatistikleri"""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "users": len(self._users),
+            "entries": sum(len(entries) for entries in self._users.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "collection_invalidations": self.collection_invalidations,
+            "ttl_seconds": self.ttl_seconds,
+            "max_users": self.max_users
+        }
+
+# Global Firestore collection cache instance
+collection_cache = CollectionCache()
@@ -0,0 +1,122 @@
+import os
+import time
+import logging
+import threading
+import subprocess
+from collections import deque
+from typing import Any, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+class DecoderPool:
+    """
+    stdin'de bekleyen, önceden başlatılmış ffmpeg decoder process'leri.
+    ffmpeg her process'te tek girdi çözer; kullanılan process'in yerine yenisi
+    istek yolunun dışında (arka plan thread'inde) başlatılır. Böylece klip başına
+    process başlatma ve codec/format yükleme maliyeti isteğin gecikmesine eklenmez.
+    """
+
+    def __init__(self, command: List[str], size: int = None):
+        self.command = command
+        self.size = size if size is not None else int(os.getenv("AUDIO_DECODER_WARM", 2))
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._closed = True
+        self.spawned = 0
+        self.warm_hits = 0
+        self.cold_spawns = 0
+        self.stale = 0
+        self._spawn_seconds = 0.0
+
+    def start(self):
+        """Havuzu doldur (uygulama açılışında çağrılır)"""
+        self._closed = False
+        for _ in range(self.size):
+            self._replenish()
+        logger.info(f"Decoder pool started with {self.size} warm ffmpeg processes")
+
+    def _spawn(self) -> subprocess.Popen:
+        started = time.perf_counter()
+        process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        with self._lock:
+            self.spawned += 1
+            self._spawn_seconds += time.perf_counter() - started
+        return process
+
+    def _replenish(self):
+        try:
+            process = self._spawn()
+        except OSError as e:
+            logger.warning(f"Could not start warm decoder: {e}")
+            return
+        with self._lock:
+            if not self._closed and len(self._idle) < self.size:
+                self._idle.append(process)
+                return
+        self._terminate(process)
+
+    def _acquire(self) -> subprocess.Popen:
+        """Hazır bir process al; yoksa (veya havuz kapalıysa) yenisini başlat"""
+        with self._lock:
+            while self._idle:
+                process = self._idle.popleft()
+                if process.poll() is None:
+                    self.warm_hits += 1
+                    break
+                # Beklerken ölmüş process
+                self.stale += 1
+            else:
+                process = None
+            closed = self._closed
+
+        if not closed and self.size > 0:
+            threading.Thread(target=self._replenish, daemon=True).start()
+        if process is not None:
+            return process
+
+        with self._lock:
+            self.cold_spawns += 1
+        return self._spawn()
+
+    def decode(self, data: bytes) -> Tuple[int, bytes, bytes]:
+        """Veriyi bir decoder'ın stdin'ine yaz, (returncode, stdout, stderr) döndür (bloklar)"""
+        process = self._acquire()
+        try:
+            pcm, error = process.communicate(data)
+        except BaseException:
+            self._terminate(process)
+            raise
+        return process.returncode, pcm, error
+
+    @staticmethod
+    def _terminate(process: subprocess.Popen):
+        try:
+            process.kill()
+            process.communicate()
+        except Exception:
+            pass
+
+    def shutdown(self):
+        """Bekleyen decoder'ları kapat"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+        for process in idle:
+            self._terminate(process)
+
+    def stats(self) -> Dict[str, Any]:
+        """Havuz istatistikleri"""
+        return {
+            "warm_size": self.size,
+            "idle": len(self._idle),
+            "spawned": self.spawned,
+            "warm_hits": self.warm_hits,
+            "cold_spawns": self.cold_spawns,
+            "stale": self.stale,
+            "avg_spawn_ms": round(self._spawn_seconds / self.spawned * 1000, 2) if self.spawned else 0.0
+        }
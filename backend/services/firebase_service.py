@@ -1,12 +1,35 @@
 import os
+import json
+import base64
 import logging
-from typing import Optional, List, Dict, Any
+import threading
+from typing import Optional, List, Dict, Any, Iterator, Iterable, Callable, Tuple, Union
 from google.cloud import firestore
+from google.cloud.firestore_v1.bulk_writer import BulkWriterOptions, SendMode
 from google.oauth2 import service_account
 from datetime import datetime
 
+from services.collection_cache import collection_cache, CACHED_COLLECTIONS
+from services.snapshot_mirror import snapshot_mirror
+from utils.timestamps import to_timestamp, normalize_time_field, in_range
+
 logger = logging.getLogger(__name__)
 
+# Firestore WriteBatch başına en fazla işlem
+BATCH_WRITE_LIMIT = 500
+
+# Toplu yazma (BulkWriter): batch'ler paralel mi gönderilsin, saniyedeki başlangıç/en fazla yazma
+BULK_PARALLEL = os.getenv("FIRESTORE_BULK_PARALLEL", "true").lower() == "true"
+BULK_INITIAL_OPS_PER_SECOND = int(os.getenv("FIRESTORE_BULK_INITIAL_OPS_PER_SECOND", 500))
+BULK_MAX_OPS_PER_SECOND = int(os.getenv("FIRESTORE_BULK_MAX_OPS_PER_SECOND", 10000))
+# Bu kadar dokümanda bir flush - bekleyen yazmalar (bellek) sınırlı kalır
+BULK_FLUSH_DOCS = int(os.getenv("FIRESTORE_BULK_FLUSH_DOCS", 2000))
+# BulkWriter'ın varsayılanı gibi: başarısız yazma en fazla bu kadar denenir
+BULK_MAX_ATTEMPTS = 15
+
+# Servisten yapılan her yazmada çağrılır: callback(collection, user_id, doc_id)
+_write_listeners: List[Callable[[str, Optional[str], Optional[str]], None]] = []
+
 class FirebaseService:
     def __init__(self):
         self.db = None
@@ -48,33 +71,237 @@ class FirebaseService:
         """Firebase kullanılabilir mi?"""
         return self.is_initialized and self.db is not None
     
+    # CACHE / MIRROR
+    @staticmethod
+    def read_cached(collection: str, user_id: Optional[str], include_completed: bool = True) -> Tuple[Optional[List[Dict[str, Any]]], Optional[int]]:
+        """
+        Snapshot aynasından, yoksa sorgu önbelleğinden oku.
+        (dokümanlar, önbellek sürümü) döndürür; dokümanlar None ise sorgu sonucu store_cached ile yazılır.
+        """
+        documents = snapshot_mirror.read(collection, user_id, include_completed)
+        if documents is not None:
+            return documents, None
+        return collection_cache.lookup(collection, user_id, "" if include_completed else "active")
+    
+    @staticmethod
+    def store_cached(collection: str, user_id: Optional[str], documents: List[Dict[str, Any]], token: int,
+                     include_completed: bool = True):
+        collection_cache.store(collection, user_id, documents, token, "" if include_completed else "active")
+    
+    @staticmethod
+    def add_write_listener(callback: Callable[[str, Optional[str], Optional[str]], None]):
+        """Yazma dinleyicisi ekle - yazan thread'de çağrılır, hızlı ve thread-safe olmalı"""
+        _write_listeners.append(callback)
+    
+    @staticmethod
+    def record_write(collection: str, user_id: str = None, doc_id: str = None, write_time=None):
+        """Yazmayı önbelleğe, aynaya ve dinleyicilere bildir (hata durumunda da - yazma uygulanmış olabilir)"""
+        for callback in _write_listeners:
+            try:
+                callback(collection, user_id, doc_id)
+            except Exception as e:
+                logger.warning(f"Write listener failed: {e}")
+        if collection not in CACHED_COLLECTIONS:
+            return
+        if doc_id is not None:
+            collection_cache.invalidate_document(collection, doc_id)
+        else:
+            collection_cache.invalidate_user(collection, user_id)
+        snapshot_mirror.note_write(collection, user_id=user_id, doc_id=doc_id, write_time=write_time)
+    
+    # DOCUMENT BUILDERS
+    @staticmethod
+    def note_document(title: str, content: str, user_id: str = "default") -> Dict[str, Any]:
+        """Not dokümanı verisi"""
+        return {
+            'title': title,
+            'content': content,
+            'user_id': user_id,
+            'is_voice_note': False,
+            'created_at': firestore.SERVER_TIMESTAMP,
+            'updated_at': firestore.SERVER_TIMESTAMP
+        }
+    
+    @staticmethod
+    def event_document(title: str, datetime_str: Union[str, datetime], description: str = "", user_id: str = "default") -> Dict[str, Any]:
+        """Etkinlik dokümanı verisi (zaman Firestore Timestamp olarak saklanır)"""
+        return {
+            'title': title,
+            'datetime': to_timestamp(datetime_str),
+            'description': description,
+            'user_id': user_id,
+            'created_at': firestore.SERVER_TIMESTAMP
+        }
+    
+    @staticmethod
+    def reminder_document(title: str, description: str, reminder_time: Union[str, datetime], user_id: str = "default") -> Dict[str, Any]:
+        """Hatırlatıcı dokümanı verisi (zaman Firestore Timestamp olarak saklanır)"""
+        return {
+            'title': title,
+            'description': description,
+            'reminder_time': to_timestamp(reminder_time),
+            'user_id': user_id,
+            'is_completed': False,
+            'created_at': firestore.SERVER_TIMESTAMP
+        }
+    
+    @staticmethod
+    def chat_message_document(message: str, response: str, user_id: str = "default", intent: str = "chat") -> Dict[str, Any]:
+        """Chat mesajı dokümanı verisi"""
+        return {
+            'user_message': message,
+            'ai_response': response,
+            'user_id': user_id,
+            'intent': intent,
+            'timestamp': firestore.SERVER_TIMESTAMP
+        }
+    
+    # BATCH OPERATIONS
+    def commit_writes(self, writes: List[Tuple[str, Dict[str, Any]]]) -> Optional[List[str]]:
+        """
+        (koleksiyon, veri) çiftlerini WriteBatch'ler halinde yaz.
+        Sırayla oluşturulan doküman ID'lerini döndürür, hata durumunda None.
+        """
+        if not self.is_available():
+            return None
+        if not writes:
+            return []
+            
+        write_time = None
+        try:
+            doc_ids = []
+            for start in range(0, len(writes), BATCH_WRITE_LIMIT):
+                batch = self.db.batch()
+                for collection, data in writes[start:start + BATCH_WRITE_LIMIT]:
+                    doc_ref = self.db.collection(collection).document()
+                    batch.set(doc_ref, data)
+                    doc_ids.append(doc_ref.id)
+                write_time = max(result.update_time for result in batch.commit())
+            logger.info(f"Committed {len(writes)} documents in batches")
+            return doc_ids
+        except Exception as e:
+            logger.error(f"Error committing batch writes: {e}")
+            return None
+        finally:
+            for collection, user_id in {(c, d.get('user_id')) for c, d in writes}:
+                self.record_write(collection, user_id=user_id, write_time=write_time)
+    
+    def bulk_create(self, collection: str, records: Iterable[Dict[str, Any]],
+                    build: Callable[[Dict[str, Any]], Dict[str, Any]],
+                    progress: Callable[[Dict[str, int]], None] = None) -> Dict[str, int]:
+        """
+        Kayıtları build ile dokümana çevirip BulkWriter ile yaz.
+        Kayıtlar akış olarak tüketilir (üreteç verilebilir), her BULK_FLUSH_DOCS dokümanda flush
+        edilir ve progress(sayaçlar) çağrılır. build hata verirse kayıt "invalid" sayılıp atlanır.
+        {"written", "failed", "invalid"} sayaçlarını döndürür.
+        """
+        counts = {"written": 0, "failed": 0, "invalid": 0}
+        if not self.is_available():
+            return counts
+        
+        lock = threading.Lock()
+        state = {"write_time": None}
+        
+        def on_result(reference, result, writer):
+            with lock:
+                counts["written"] += 1
+                if state["write_time"] is None or result.update_time > state["write_time"]:
+                    state["write_time"] = result.update_time
+        
+        def on_error(error, writer) -> bool:
+            if error.attempts < BULK_MAX_ATTEMPTS:
+                return True
+            with lock:
+                counts["failed"] += 1
+            logger.warning(f"Bulk write failed in {collection}: {error.message}")
+            return False
+        
+        bulk_writer = self.db.bulk_writer(options=BulkWriterOptions(
+            initial_ops_per_second=BULK_INITIAL_OPS_PER_SECOND,
+            max_ops_per_second=BULK_MAX_OPS_PER_SECOND,
+            mode=SendMode.parallel if BULK_PARALLEL else SendMode.serial
+        ))
+        bulk_writer.on_write_result(on_result)
+        bulk_writer.on_write_error(on_error)
+        
+        user_ids = set()
+        pending = 0
+        try:
+            for record in records:
+                try:
+                    data = build(record)
+                except (KeyError, TypeError, ValueError, AttributeError):
+                    counts["invalid"] += 1
+                    continue
+                
+                bulk_writer.create(self.db.collection(collection).document(), data)
+                user_ids.add(data.get('user_id'))
+                pending += 1
+                if pending >= BULK_FLUSH_DOCS:
+                    bulk_writer.flush()
+                    pending = 0
+                    if progress:
+                        progress(dict(counts))
+        finally:
+            bulk_writer.close()
+            for user_id in user_ids:
+                self.record_write(collection, user_id=user_id, write_time=state["write_time"])
+        
+        if progress:
+            progress(dict(counts))
+        logger.info(f"Bulk created {counts['written']} {collection} documents "
+                    f"({counts['failed']} failed, {counts['invalid']} invalid)")
+        return counts
+    
+    def create_notes_bulk(self, notes: Iterable[Dict[str, Any]],
+                          progress: Callable[[Dict[str, int]], None] = None) -> Dict[str, int]:
+        """{"title", "content", "user_id"} kayıtlarından toplu not oluştur"""
+        return self.bulk_create('notes', notes, lambda note: self.note_document(
+            note["title"], note.get("content", ""), note.get("user_id") or "default"
+        ), progress)
+    
+    def create_events_bulk(self, events: Iterable[Dict[str, Any]],
+                           progress: Callable[[Dict[str, int]], None] = None) -> Dict[str, int]:
+        """{"title", "datetime", "description", "user_id"} kayıtlarından toplu etkinlik oluştur"""
+        return self.bulk_create('events', events, lambda event: self.event_document(
+            event["title"], event["datetime"], event.get("description", ""), event.get("user_id") or "default"
+        ), progress)
+    
+    def create_reminders_bulk(self, reminders: Iterable[Dict[str, Any]],
+                              progress: Callable[[Dict[str, int]], None] = None) -> Dict[str, int]:
+        """{"title", "description", "reminder_time", "user_id"} kayıtlarından toplu hatırlatıcı oluştur"""
+        return self.bulk_create('reminders', reminders, lambda reminder: self.reminder_document(
+            reminder["title"], reminder.get("description", ""), reminder["reminder_time"],
+            reminder.get("user_id") or "default"
+        ), progress)
+    
     # NOTES OPERATIONS
     def create_note(self, title: str, content: str, user_id: str = "default") -> Optional[str]:
         """Not oluştur"""
         if not self.is_available():
             return None
             
+        write_time = None
         try:
             doc_ref = self.db.collection('notes').document()
-            doc_ref.set({
-                'title': title,
-                'content': content,
-                'user_id': user_id,
-                'is_voice_note': False,
-                'created_at': firestore.SERVER_TIMESTAMP,
-                'updated_at': firestore.SERVER_TIMESTAMP
-            })
+            write_time = doc_ref.set(self.note_document(title, content, user_id)).update_time
             logger.info(f"Note created with ID: {doc_ref.id}")
             return doc_ref.id
         except Exception as e:
             logger.error(f"Error creating note: {e}")
             return None
+        finally:
+            self.record_write('notes', user_id=user_id, write_time=write_time)
     
     def get_notes(self, user_id: str = None) -> List[Dict[str, Any]]:
         """Notları getir"""
         if not self.is_available():
             return []
             
+        notes, token = self.read_cached('notes', user_id)
+        if notes is not None:
+            return notes
+            
         try:
             notes_ref = self.db.collection('notes')
             if user_id:
@@ -94,16 +321,40 @@ class FirebaseService:
                     note_data['updated_at'] = note_data['updated_at'].isoformat()
                 notes.append(note_data)
             
+            self.store_cached('notes', user_id, notes, token)
             return notes
         except Exception as e:
             logger.error(f"Error getting notes: {e}")
             return []
     
+    def get_note(self, note_id: str) -> Optional[Dict[str, Any]]:
+        """Tek not getir"""
+        if not self.is_available():
+            return None
+            
+        try:
+            doc = self.db.collection('notes').document(note_id).get()
+            if not doc.exists:
+                return None
+            
+            data = doc.to_dict()
+            data['id'] = doc.id
+            # Timestamp'i string'e çevir
+            if 'created_at' in data and data['created_at']:
+                data['created_at'] = data['created_at'].isoformat()
+            if 'updated_at' in data and data['updated_at']:
+                data['updated_at'] = data['updated_at'].isoformat()
+            return data
+        except Exception as e:
+            logger.error(f"Error getting note: {e}")
+            return None
+    
     def update_note(self, note_id: str, title: str = None, content: str = None) -> bool:
         """Not güncelle"""
         if not self.is_available():
             return False
             
+        write_time = None
         try:
             update_data = {'updated_at': firestore.SERVER_TIMESTAMP}
             if title is not None:
@@ -111,109 +362,151 @@ class FirebaseService:
             if content is not None:
                 update_data['content'] = content
                 
-            self.db.collection('notes').document(note_id).update(update_data)
+            write_time = self.db.collection('notes').document(note_id).update(update_data).update_time
             logger.info(f"Note updated: {note_id}")
             return True
         except Exception as e:
             logger.error(f"Error updating note: {e}")
             return False
+        finally:
+            self.record_write('notes', doc_id=note_id, write_time=write_time)
     
     def delete_note(self, note_id: str) -> bool:
         """Not sil"""
         if not self.is_available():
             return False
             
+        write_time = None
         try:
-            self.db.collection('notes').document(note_id).delete()
+            write_time = self.db.collection('notes').document(note_id).delete()
             logger.info(f"Note deleted: {note_id}")
             return True
         except Exception as e:
             logger.error(f"Error deleting note: {e}")
             return False
+        finally:
+            self.record_write('notes', doc_id=note_id, write_time=write_time)
     
     # CALENDAR EVENTS OPERATIONS
-    def create_event(self, title: str, datetime_str: str, description: str = "", user_id: str = "default") -> Optional[str]:
+    def create_event(self, title: str, datetime_str: Union[str, datetime], description: str = "", user_id: str = "default") -> Optional[str]:
         """Etkinlik oluştur"""
         if not self.is_available():
             return None
             
+        write_time = None
         try:
             doc_ref = self.db.collection('events').document()
-            doc_ref.set({
-                'title': title,
-                'datetime': datetime_str,
-                'description': description,
-                'user_id': user_id,
-                'created_at': firestore.SERVER_TIMESTAMP
-            })
+            write_time = doc_ref.set(self.event_document(title, datetime_str, description, user_id)).update_time
             logger.info(f"Event created with ID: {doc_ref.id}")
             return doc_ref.id
         except Exception as e:
             logger.error(f"Error creating event: {e}")
             return None
+        finally:
+            self.record_write('events', user_id=user_id, write_time=write_time)
     
-    def get_events(self, user_id: str = None) -> List[Dict[str, Any]]:
-        """Tüm etkinlikleri getir"""
+    def get_events(self, user_id: str = None, start: datetime = None, end: datetime = None) -> List[Dict[str, Any]]:
+        """Etkinlikleri getir (start/end verilirse yalnızca bu aralıktakiler)"""
         if not self.is_available():
             return []
+        start = to_timestamp(start) if start else None
+        end = to_timestamp(end) if end else None
+            
+        events, token = self.read_cached('events', user_id)
+        if events is not None:
+            return in_range(events, 'datetime', start, end)
             
         try:
             events_ref = self.db.collection('events')
             if user_id:
                 events_ref = events_ref.where('user_id', '==', user_id)
+            # Aralık sorgusu Firestore'da çalışır ((user_id, datetime) composite index)
+            if start:
+                events_ref = events_ref.where('datetime', '>=', start)
+            if end:
+                events_ref = events_ref.where('datetime', '<=', end)
             events_ref = events_ref.order_by('datetime')
             
             docs = events_ref.stream()
             
             events = []
             for doc in docs:
-                event_data = doc.to_dict()
+                event_data = normalize_time_field(doc.to_dict(), 'datetime')
                 event_data['id'] = doc.id
                 # Timestamp'i string'e çevir
                 if 'created_at' in event_data and event_data['created_at']:
                     event_data['created_at'] = event_data['created_at'].isoformat()
                 events.append(event_data)
             
+            # Önbellek tam listeyi tutar - aralık sorguları önbelleğe yazılmaz
+            if start is None and end is None:
+                self.store_cached('events', user_id, events, token)
             return events
         except Exception as e:
             logger.error(f"Error getting events: {e}")
             return []
     
-    def update_event(self, event_id: str, title: str = None, datetime_str: str = None, description: str = None) -> bool:
+    def get_event(self, event_id: str) -> Optional[Dict[str, Any]]:
+        """Tek etkinlik getir"""
+        if not self.is_available():
+            return None
+            
+        try:
+            doc = self.db.collection('events').document(event_id).get()
+            if not doc.exists:
+                return None
+            
+            data = normalize_time_field(doc.to_dict(), 'datetime')
+            data['id'] = doc.id
+            # Timestamp'i string'e çevir
+            if 'created_at' in data and data['created_at']:
+                data['created_at'] = data['created_at'].isoformat()
+            return data
+        except Exception as e:
+            logger.error(f"Error getting event: {e}")
+            return None
+    
+    def update_event(self, event_id: str, title: str = None, datetime_str: Union[str, datetime] = None, description: str = None) -> bool:
         """Etkinlik güncelle"""
         if not self.is_available():
             return False
             
+        write_time = None
         try:
             update_data = {}
             if title is not None:
                 update_data['title'] = title
             if datetime_str is not None:
-                update_data['datetime'] = datetime_str
+                update_data['datetime'] = to_timestamp(datetime_str)
             if description is not None:
                 update_data['description'] = description
                 
             if update_data:
-                self.db.collection('events').document(event_id).update(update_data)
+                write_time = self.db.collection('events').document(event_id).update(update_data).update_time
                 logger.info(f"Event updated: {event_id}")
                 return True
             return False
         except Exception as e:
             logger.error(f"Error updating event: {e}")
             return False
+        finally:
+            self.record_write('events', doc_id=event_id, write_time=write_time)
     
     def delete_event(self, event_id: str) -> bool:
         """Etkinlik sil"""
         if not self.is_available():
             return False
             
+        write_time = None
         try:
-            self.db.collection('events').document(event_id).delete()
+            write_time = self.db.collection('events').document(event_id).delete()
             logger.info(f"Event deleted: {event_id}")
             return True
         except Exception as e:
             logger.error(f"Error deleting event: {e}")
             return False
+        finally:
+            self.record_write('events', doc_id=event_id, write_time=write_time)
     
     # CHAT MESSAGES OPERATIONS
     def save_chat_message(self, message: str, response: str, user_id: str = "default", intent: str = "chat") -> Optional[str]:
@@ -223,13 +516,7 @@ class FirebaseService:
             
         try:
             doc_ref = self.db.collection('chat_messages').document()
-            doc_ref.set({
-                'user_message': message,
-                'ai_response': response,
-                'user_id': user_id,
-                'intent': intent,
-                'timestamp': firestore.SERVER_TIMESTAMP
-            })
+            doc_ref.set(self.chat_message_document(message, response, user_id, intent))
             logger.info(f"Chat message saved with ID: {doc_ref.id}")
             return doc_ref.id
         except Exception as e:
@@ -238,31 +525,61 @@ class FirebaseService:
     
     def get_chat_history(self, user_id: str = "default", limit: int = 50) -> List[Dict[str, Any]]:
         """Chat geçmişini getir"""
+        messages = list(self.iter_chat_history_page(user_id=user_id, limit=limit))
+        # Eski mesajları önce göstermek için ters çevir
+        return list(reversed(messages))
+    
+    def iter_chat_history_page(self, user_id: str = "default", limit: int = 50, cursor: str = None,
+                               fields: List[str] = None) -> Iterator[Dict[str, Any]]:
+        """Chat geçmişinden bir sayfayı en yeniden eskiye stream et (cursor + alan projeksiyonu)"""
         if not self.is_available():
-            return []
-            
+            return
+        
+        # Geçersiz cursor çağırana ValueError olarak iletilir
+        start_after = self.decode_chat_cursor(cursor) if cursor else None
+        
         try:
             messages_ref = self.db.collection('chat_messages')
             if user_id:
                 messages_ref = messages_ref.where('user_id', '==', user_id)
-            messages_ref = messages_ref.order_by('timestamp', direction=firestore.Query.DESCENDING).limit(limit)
-            
-            docs = messages_ref.stream()
-            
-            messages = []
-            for doc in docs:
+            messages_ref = messages_ref.order_by('timestamp', direction=firestore.Query.DESCENDING)
+            messages_ref = messages_ref.order_by('__name__', direction=firestore.Query.DESCENDING)
+            if fields:
+                # Cursor için timestamp her zaman gerekli
+                messages_ref = messages_ref.select(sorted(set(fields) | {'timestamp'}))
+            if start_after:
+                messages_ref = messages_ref.start_after(start_after)
+            messages_ref = messages_ref.limit(limit)
+            
+            for doc in messages_ref.stream():
                 message_data = doc.to_dict()
                 message_data['id'] = doc.id
                 # Timestamp'i string'e çevir
                 if 'timestamp' in message_data and message_data['timestamp']:
                     message_data['timestamp'] = message_data['timestamp'].isoformat()
-                messages.append(message_data)
-            
-            # Eski mesajları önce göstermek için ters çevir
-            return list(reversed(messages))
+                yield message_data
         except Exception as e:
-            logger.error(f"Error getting chat history: {e}")
-            return []
+            logger.error(f"Error getting chat history page: {e}")
+    
+    @staticmethod
+    def encode_chat_cursor(message: Dict[str, Any]) -> Optional[str]:
+        """Sayfanın son mesajından opak cursor üret"""
+        if not message or not message.get('timestamp'):
+            return None
+        payload = json.dumps({'t': message['timestamp'], 'id': message['id']})
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+    
+    @staticmethod
+    def decode_chat_cursor(cursor: str) -> Dict[str, Any]:
+        """Cursor'ı Firestore start_after değerlerine çevir"""
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+            return {
+                'timestamp': datetime.fromisoformat(payload['t']),
+                '__name__': payload['id']
+            }
+        except Exception:
+            raise ValueError("Geçersiz cursor")
     
     def delete_chat_history(self, user_id: str = "default") -> bool:
         """Chat geçmişini sil"""
@@ -270,46 +587,81 @@ class FirebaseService:
             return False
             
         try:
-            messages_ref = self.db.collection('chat_messages')
-            if user_id:
-                messages_ref = messages_ref.where('user_id', '==', user_id)
-            
-            docs = messages_ref.stream()
-            for doc in docs:
-                doc.reference.delete()
-            
-            logger.info(f"Chat history deleted for user: {user_id}")
+            self.delete_chat_history_paged(user_id=user_id)
             return True
         except Exception as e:
             logger.error(f"Error deleting chat history: {e}")
             return False
     
+    def delete_chat_history_paged(self, user_id: str = "default", page_size: int = 500,
+                                  progress: Callable[[int, int], None] = None) -> int:
+        """
+        Chat geçmişini sayfa sayfa BulkWriter ile sil.
+        Her sayfadan sonra progress(silinen, sayfa) çağrılır; toplam silinen sayısını döndürür.
+        """
+        if not self.is_available():
+            return 0
+        
+        deleted = 0
+        pages = 0
+        bulk_writer = self.db.bulk_writer()
+        try:
+            while True:
+                messages_ref = self.db.collection('chat_messages')
+                if user_id:
+                    messages_ref = messages_ref.where('user_id', '==', user_id)
+                # Sadece referanslar gerekli - alan okumadan getir
+                docs = list(messages_ref.select([]).limit(page_size).stream())
+                if not docs:
+                    break
+                
+                for doc in docs:
+                    bulk_writer.delete(doc.reference)
+                # Sonraki sorgu silinmiş dokümanları görmesin diye sayfayı bitir
+                bulk_writer.flush()
+                
+                deleted += len(docs)
+                pages += 1
+                if progress:
+                    progress(deleted, pages)
+                
+                if len(docs) < page_size:
+                    break
+        finally:
+            bulk_writer.close()
+        
+        logger.info(f"Chat history deleted for user: {user_id} ({deleted} messages, {pages} pages)")
+        return deleted
+    
     # REMINDERS OPERATIONS
-    def create_reminder(self, title: str, description: str, reminder_time: str, user_id: str = "default") -> Optional[str]:
+    def create_reminder(self, title: str, description: str, reminder_time: Union[str, datetime], user_id: str = "default") -> Optional[str]:
         """Hatırlatıcı oluştur"""
         if not self.is_available():
             return None
             
+        write_time = None
         try:
             doc_ref = self.db.collection('reminders').document()
-            doc_ref.set({
-                'title': title,
-                'description': description,
-                'reminder_time': reminder_time,
-                'user_id': user_id,
-                'is_completed': False,
-                'created_at': firestore.SERVER_TIMESTAMP
-            })
+            write_time = doc_ref.set(self.reminder_document(title, description, reminder_time, user_id)).update_time
             logger.info(f"Reminder created with ID: {doc_ref.id}")
             return doc_ref.id
         except Exception as e:
             logger.error(f"Error creating reminder: {e}")
             return None
+        finally:
+            self.record_write('reminders', user_id=user_id, write_time=write_time)
     
-    def get_reminders(self, user_id: str = None, include_completed: bool = False) -> List[Dict[str, Any]]:
-        """Hatırlatıcıları getir"""
+    def get_reminders(self, user_id: str = None, include_completed: bool = False,
+                      start: datetime = None, end: datetime = None) -> List[Dict[str, Any]]:
+        """Hatırlatıcıları getir (start/end verilirse yalnızca bu aralıktakiler)"""
         if not self.is_available():
             return []
+        start = to_timestamp(start) if start else None
+        end = to_timestamp(end) if end else None
+            
+        reminders, token = self.read_cached('reminders', user_id, include_completed)
+        if reminders is not None:
+            return in_range(reminders, 'reminder_time', start, end)
             
         try:
             reminders_ref = self.db.collection('reminders')
@@ -317,30 +669,59 @@ class FirebaseService:
                 reminders_ref = reminders_ref.where('user_id', '==', user_id)
             if not include_completed:
                 reminders_ref = reminders_ref.where('is_completed', '==', False)
+            # Aralık sorgusu Firestore'da çalışır ((user_id, is_completed, reminder_time) composite index)
+            if start:
+                reminders_ref = reminders_ref.where('reminder_time', '>=', start)
+            if end:
+                reminders_ref = reminders_ref.where('reminder_time', '<=', end)
             reminders_ref = reminders_ref.order_by('reminder_time')
             
             docs = reminders_ref.stream()
             
             reminders = []
             for doc in docs:
-                reminder_data = doc.to_dict()
+                reminder_data = normalize_time_field(doc.to_dict(), 'reminder_time')
                 reminder_data['id'] = doc.id
                 # Timestamp'i string'e çevir
                 if 'created_at' in reminder_data and reminder_data['created_at']:
                     reminder_data['created_at'] = reminder_data['created_at'].isoformat()
                 reminders.append(reminder_data)
             
+            # Önbellek tam listeyi tutar - aralık sorguları önbelleğe yazılmaz
+            if start is None and end is None:
+                self.store_cached('reminders', user_id, reminders, token, include_completed)
             return reminders
         except Exception as e:
             logger.error(f"Error getting reminders: {e}")
             return []
     
+    def get_reminder(self, reminder_id: str) -> Optional[Dict[str, Any]]:
+        """Tek hatırlatıcı getir"""
+        if not self.is_available():
+            return None
+            
+        try:
+            doc = self.db.collection('reminders').document(reminder_id).get()
+            if not doc.exists:
+                return None
+            
+            data = normalize_time_field(doc.to_dict(), 'reminder_time')
+            data['id'] = doc.id
+            # Timestamp'i string'e çevir
+            if 'created_at' in data and data['created_at']:
+                data['created_at'] = data['created_at'].isoformat()
+            return data
+        except Exception as e:
+            logger.error(f"Error getting reminder: {e}")
+            return None
+    
     def update_reminder(self, reminder_id: str, title: str = None, description: str = None, 
-                       reminder_time: str = None, is_completed: bool = None) -> bool:
+                       reminder_time: Union[str, datetime] = None, is_completed: bool = None) -> bool:
         """Hatırlatıcı güncelle"""
         if not self.is_available():
             return False
             
+        write_time = None
         try:
             update_data = {}
             if title is not None:
@@ -348,31 +729,36 @@ class FirebaseService:
             if description is not None:
                 update_data['description'] = description
             if reminder_time is not None:
-                update_data['reminder_time'] = reminder_time
+                update_data['reminder_time'] = to_timestamp(reminder_time)
             if is_completed is not None:
                 update_data['is_completed'] = is_completed
                 
             if update_data:
-                self.db.collection('reminders').document(reminder_id).update(update_data)
+                write_time = self.db.collection('reminders').document(reminder_id).update(update_data).update_time
                 logger.info(f"Reminder updated: {reminder_id}")
                 return True
             return False
         except Exception as e:
             logger.error(f"Error updating reminder: {e}")
             return False
+        finally:
+            self.record_write('reminders', doc_id=reminder_id, write_time=write_time)
     
     def delete_reminder(self, reminder_id: str) -> bool:
         """Hatırlatıcı sil"""
         if not self.is_available():
             return False
             
+        write_time = None
         try:
-            self.db.collection('reminders').document(reminder_id).delete()
+            write_time = self.db.collection('reminders').document(reminder_id).delete()
             logger.info(f"Reminder deleted: {reminder_id}")
             return True
         except Exception as e:
             logger.error(f"Error deleting reminder: {e}")
             return False
+        finally:
+            self.record_write('reminders', doc_id=reminder_id, write_time=write_time)
     
     # WEATHER CACHE OPERATIONS (Opsiyonel)
     def cache_weather_data(self, city: str, weather_data: Dict[str, Any], ttl_minutes: int = 30) -> bool:
@@ -1,6 +1,7 @@
 import google.generativeai as genai
+import asyncio
 import os
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator, List, Tuple
 import logging
 from datetime import datetime, timedelta
 import json
@@ -8,6 +9,29 @@ import re
 
 logger = logging.getLogger(__name__)
 
+# Çoklu intent için yalnızca açık bağlaçlar ("... oluştur ve hava nasıl"). Virgül ve noktalı virgül
+# bölmez - "not al: süt, ekmek, yumurta" tek nottur
+CLAUSE_SEPARATOR = re.compile(r"\s*[,;]?\s+(?:ve|sonra|ayrıca|ardından)\s+", re.IGNORECASE)
+
+# Bağımsız çalıştırılabilen aksiyon intent'leri
+ACTION_INTENTS = ("note", "calendar", "weather")
+
+# Sabit şablon yanıtlar - TTS açıksa sesleri açılışta hazırlanır
+CANNED_REPLIES = (
+    "✅ Notunuz başarıyla kaydedildi!",
+    "📅 Takvim etkinliğiniz oluşturuldu!",
+    "🌤️ Hava durumu bilgisi alınıyor...",
+    "🌤️ Hava durumu bilgisi alınamadı. Lütfen tekrar deneyin.",
+    "⏰ Hatırlatıcınız ayarlandı!",
+    "Rica ederim! Size yardımcı olabildiğim için mutluyum.",
+    "Merhaba! Size nasıl yardımcı olabilirim?",
+    "Takvim bilgilerinizi kontrol ediyorum...",
+    "Anladım. Size nasıl yardımcı olabilirim?",
+    "📅 Bugün herhangi bir etkinliğiniz bulunmuyor.",
+    "📅 Yarın herhangi bir etkinliğiniz bulunmuyor.",
+    "📅 Belirtilen tarihte herhangi bir etkinliğiniz bulunmuyor."
+)
+
 class GeminiService:
     def __init__(self):
         """Gemini AI servisini başlat"""
@@ -657,6 +681,64 @@ class GeminiService:
             "entities": entities
         }
 
+    def _split_clauses(self, user_message: str) -> List[Tuple[int, int]]:
+        """Mesajı bağlaçlardan cümleciklere böl - (başlangıç, bitiş) aralıkları"""
+        spans = []
+        start = 0
+        for match in CLAUSE_SEPARATOR.finditer(user_message):
+            if match.start() > start:
+                spans.append((start, match.start()))
+            start = match.end()
+        if start < len(user_message):
+            spans.append((start, len(user_message)))
+        return spans
+
+    def _multi_intent_analysis(self, user_message: str) -> List[Dict[str, Any]]:
+        """
+        Kural-tabanlı çoklu intent analizi.
+        Mesaj yalnızca bağlaçtan sonraki cümlecik tanınan bir aksiyon başlatıyorsa bölünür;
+        aksiyonsuz cümlecikler önceki aksiyona eklenir. Tek aksiyon varsa boş liste döner.
+        """
+        segments = []
+        for start, end in self._split_clauses(user_message):
+            intent = self._simple_intent_analysis(user_message[start:end])["intent"]
+            if intent in ACTION_INTENTS or not segments:
+                segments.append([start, end, intent])
+            else:
+                # Aksiyonsuz cümlecik önceki aksiyona ait (ör. not içeriğinin devamı)
+                segments[-1][1] = end
+        
+        if len(segments) < 2 or not all(intent in ACTION_INTENTS for _, _, intent in segments):
+            return []
+        
+        intents = []
+        for start, end, intent in segments:
+            text = user_message[start:end]
+            intents.append({
+                "intent": intent,
+                "confidence": 0.9,
+                "entities": self._smart_entity_extraction(text, intent),
+                "span": [start, end],
+                "text": text
+            })
+        return intents
+
+    async def analyze_intents(self, user_message: str) -> List[Dict[str, Any]]:
+        """
+        Çoklu intent analizi - her intent mesajdaki aralığıyla (span) döner.
+        Tek intent'li mesajlarda analyze_intent sonucu tek elemanlı liste olarak döner.
+        """
+        try:
+            intents = self._multi_intent_analysis(user_message)
+            if intents:
+                logger.info(f"Multi-intent message: {[item['intent'] for item in intents]}")
+                return intents
+        except Exception as e:
+            logger.error(f"Multi-intent analysis error: {e}")
+        
+        intent_data = await self.analyze_intent(user_message)
+        return [{**intent_data, "span": [0, len(user_message)], "text": user_message}]
+
     async def analyze_intent(self, user_message: str) -> Dict[str, Any]:
         """Intent analizi - hızlı kural-tabanlı + AI fallback"""
         try:
@@ -776,93 +858,101 @@ class GeminiService:
         else:
             return "Anladım. Size nasıl yardımcı olabilirim?"
     
-    async def generate_smart_response(self, user_message: str, intent_data: Dict[str, Any], context: Optional[Dict[str, Any]] = None) -> str:
-        """Akıllı yanıt oluşturma"""
-        try:
-            intent = intent_data.get("intent", "chat")
-            
-            # Intent'e göre özel yanıtlar
-            if intent == "note":
-                return "✅ Notunuz başarıyla kaydedildi!"
-            elif intent == "calendar":
-                return "📅 Takvim etkinliğiniz oluşturuldu!"
-            elif intent == "weather":
-                # Context'teki weather data'yı kontrol et
-                if context and "weather" in context:
-                    weather_data = context["weather"]
-                    city = weather_data.get('city', 'İstanbul')
-                    temp = weather_data.get('temperature', 'N/A')
-                    condition = weather_data.get('condition', 'Bilinmiyor')
-                    humidity = weather_data.get('humidity', 'N/A')
-                    feels_like = weather_data.get('feels_like', 'N/A')
-                    wind_speed = weather_data.get('wind_speed', 'N/A')
-                    
-                    return f"🌤️ **{city} Hava Durumu:**\n🌡️ Sıcaklık: {temp}°C (Hissedilen: {feels_like}°C)\n☁️ Durum: {condition}\n💧 Nem: %{humidity}\n🌬️ Rüzgar: {wind_speed} m/s"
-                else:
-                    return "🌤️ Hava durumu bilgisi alınamadı. Lütfen tekrar deneyin."
-            elif intent == "reminder":
-                return "⏰ Hatırlatıcınız ayarlandı!"
-            elif intent == "chat":
-                # Chat intent'i için context'e göre özel yanıtlar
-                if context and "calendar" in context:
-                    calendar_data = context["calendar"]
-                    events = calendar_data.get("events", [])
-                    
-                    if events:
-                        event_list = []
-                        for event in events:
-                            title = event.get("title", "Başlıksız etkinlik")
-                            datetime_str = event.get("datetime", "")
-                            
-                            if datetime_str:
-                                try:
-                                    # ISO format'ını parse et
-                                    dt = datetime.fromisoformat(datetime_str.replace('Z', '+00:00'))
-                                    time_str = dt.strftime('%H:%M')
-                                    date_str = dt.strftime('%d.%m.%Y')
-                                except:
-                                    time_str = "Saat belirsiz"
-                                    date_str = "Tarih belirsiz"
-                            else:
+    def _template_response(self, user_message: str, intent_data: Dict[str, Any], context: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Intent ve context'e göre hazır yanıt oluştur (model gerekmiyorsa)"""
+        intent = intent_data.get("intent", "chat")
+        
+        # Intent'e göre özel yanıtlar
+        if intent == "note":
+            return "✅ Notunuz başarıyla kaydedildi!"
+        elif intent == "calendar":
+            return "📅 Takvim etkinliğiniz oluşturuldu!"
+        elif intent == "weather":
+            # Context'teki weather data'yı kontrol et
+            if context and "weather" in context:
+                weather_data = context["weather"]
+                city = weather_data.get('city', 'İstanbul')
+                temp = weather_data.get('temperature', 'N/A')
+                condition = weather_data.get('condition', 'Bilinmiyor')
+                humidity = weather_data.get('humidity', 'N/A')
+                feels_like = weather_data.get('feels_like', 'N/A')
+                wind_speed = weather_data.get('wind_speed', 'N/A')
+                
+                return f"🌤️ **{city} Hava Durumu:**\n🌡️ Sıcaklık: {temp}°C (Hissedilen: {feels_like}°C)\n☁️ Durum: {condition}\n💧 Nem: %{humidity}\n🌬️ Rüzgar: {wind_speed} m/s"
+            else:
+                return "🌤️ Hava durumu bilgisi alınamadı. Lütfen tekrar deneyin."
+        elif intent == "reminder":
+            return "⏰ Hatırlatıcınız ayarlandı!"
+        elif intent == "chat":
+            # Chat intent'i için context'e göre özel yanıtlar
+            if context and "calendar" in context:
+                calendar_data = context["calendar"]
+                events = calendar_data.get("events", [])
+                
+                if events:
+                    event_list = []
+                    for event in events:
+                        title = event.get("title", "Başlıksız etkinlik")
+                        datetime_str = event.get("datetime", "")
+                        
+                        if datetime_str:
+                            try:
+                                # ISO format'ını parse et
+                                dt = datetime.fromisoformat(datetime_str.replace('Z', '+00:00'))
+                                time_str = dt.strftime('%H:%M')
+                                date_str = dt.strftime('%d.%m.%Y')
+                            except:
                                 time_str = "Saat belirsiz"
                                 date_str = "Tarih belirsiz"
-                            
-                            event_list.append(f"• {title} - {time_str}")
-                        
-                        events_text = "\n".join(event_list)
-                        
-                        # Tarih bilgisini de ekle
-                        if "13 temmuz" in user_message.lower():
-                            date_info = "13 Temmuz'da"
-                        elif "bugün" in user_message.lower():
-                            date_info = "Bugün"
-                        elif "yarın" in user_message.lower():
-                            date_info = "Yarın"
                         else:
-                            date_info = "Belirtilen tarihte"
+                            time_str = "Saat belirsiz"
+                            date_str = "Tarih belirsiz"
                         
-                        return f"📅 {date_info} {len(events)} etkinliğiniz var:\n\n{events_text}"
+                        event_list.append(f"• {title} - {time_str}")
+                    
+                    events_text = "\n".join(event_list)
+                    
+                    # Tarih bilgisini de ekle
+                    if "13 temmuz" in user_message.lower():
+                        date_info = "13 Temmuz'da"
+                    elif "bugün" in user_message.lower():
+                        date_info = "Bugün"
+                    elif "yarın" in user_message.lower():
+                        date_info = "Yarın"
                     else:
-                        # Tarih bilgisini kontrol et
-                        if "13 temmuz" in user_message.lower():
-                            return "📅 13 Temmuz'da herhangi bir etkinliğiniz bulunmuyor."
-                        elif "bugün" in user_message.lower():
-                            return "📅 Bugün herhangi bir etkinliğiniz bulunmuyor."
-                        elif "yarın" in user_message.lower():
-                            return "📅 Yarın herhangi bir etkinliğiniz bulunmuyor."
-                        else:
-                            return "📅 Belirtilen tarihte herhangi bir etkinliğiniz bulunmuyor."
-                
-                elif context and "weather" in context:
-                    weather_data = context["weather"]
-                    city = weather_data.get('city', 'İstanbul')
-                    temp = weather_data.get('temperature', 'N/A')
-                    condition = weather_data.get('condition', 'Bilinmiyor')
-                    humidity = weather_data.get('humidity', 'N/A')
-                    feels_like = weather_data.get('feels_like', 'N/A')
-                    wind_speed = weather_data.get('wind_speed', 'N/A')
+                        date_info = "Belirtilen tarihte"
                     
-                    return f"🌤️ **{city} Hava Durumu:**\n🌡️ Sıcaklık: {temp}°C (Hissedilen: {feels_like}°C)\n☁️ Durum: {condition}\n💧 Nem: %{humidity}\n🌬️ Rüzgar: {wind_speed} m/s"
+                    return f"📅 {date_info} {len(events)} etkinliğiniz var:\n\n{events_text}"
+                else:
+                    # Tarih bilgisini kontrol et
+                    if "13 temmuz" in user_message.lower():
+                        return "📅 13 Temmuz'da herhangi bir etkinliğiniz bulunmuyor."
+                    elif "bugün" in user_message.lower():
+                        return "📅 Bugün herhangi bir etkinliğiniz bulunmuyor."
+                    elif "yarın" in user_message.lower():
+                        return "📅 Yarın herhangi bir etkinliğiniz bulunmuyor."
+                    else:
+                        return "📅 Belirtilen tarihte herhangi bir etkinliğiniz bulunmuyor."
+            
+            elif context and "weather" in context:
+                weather_data = context["weather"]
+                city = weather_data.get('city', 'İstanbul')
+                temp = weather_data.get('temperature', 'N/A')
+                condition = weather_data.get('condition', 'Bilinmiyor')
+                humidity = weather_data.get('humidity', 'N/A')
+                feels_like = weather_data.get('feels_like', 'N/A')
+                wind_speed = weather_data.get('wind_speed', 'N/A')
+                
+                return f"🌤️ **{city} Hava Durumu:**\n🌡️ Sıcaklık: {temp}°C (Hissedilen: {feels_like}°C)\n☁️ Durum: {condition}\n💧 Nem: %{humidity}\n🌬️ Rüzgar: {wind_speed} m/s"
+        
+        return None
+    
+    async def generate_smart_response(self, user_message: str, intent_data: Dict[str, Any], context: Optional[Dict[str, Any]] = None) -> str:
+        """Akıllı yanıt oluşturma"""
+        try:
+            template = self._template_response(user_message, intent_data, context)
+            if template is not None:
+                return template
             
             # Genel sohbet için AI yanıt
             try:
@@ -876,6 +966,34 @@ class GeminiService:
             logger.error(f"Smart response generation error: {e}")
             return self._generate_fallback_response(user_message, context)
 
+    async def stream_smart_response(self, user_message: str, intent_data: Dict[str, Any], context: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
+        """Akıllı yanıtı parça parça üret (WebSocket için)"""
+        template = self._template_response(user_message, intent_data, context)
+        if template is not None:
+            yield template
+            return
+        
+        # Genel sohbet için AI yanıtını stream et
+        yielded = False
+        try:
+            stream = await asyncio.to_thread(
+                self.model.generate_content,
+                f"Bu mesaja kısa ve yardımcı bir yanıt ver: {user_message}",
+                stream=True
+            )
+            chunks = iter(stream)
+            while True:
+                chunk = await asyncio.to_thread(next, chunks, None)
+                if chunk is None:
+                    break
+                if chunk.text:
+                    yielded = True
+                    yield chunk.text
+        except Exception as e:
+            logger.error(f"Smart response streaming error: {e}")
+            if not yielded:
+                yield self._generate_fallback_response(user_message, context)
+
 def get_gemini_service():
     """Gemini servisini al"""
     return GeminiService() 
\ No newline at end of file
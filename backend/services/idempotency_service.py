@@ -0,0 +1,117 @@
+import os
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+class IdempotencyStore:
+    """Idempotency-Key başına sonuç saklayan sınırlı, TTL'li depo"""
+
+    def __init__(self, max_entries: int = None, ttl_seconds: float = None):
+        self.max_entries = max_entries or int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", 10000))
+        self.ttl_seconds = ttl_seconds or float(os.getenv("IDEMPOTENCY_TTL_SECONDS", 3600))
+        # key -> (saklanma zamanı, sonuç)
+        self._results = OrderedDict()
+        # key -> devam eden ilk denemenin future'ı
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.joined = 0
+
+    def _key(self, scope: str, key: str) -> str:
+        return f"{scope}:{key}"
+
+    def _get_stored(self, full_key: str) -> Tuple[bool, Any]:
+        entry = self._results.get(full_key)
+        if entry is None:
+            return False, None
+        stored_at, result = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._results[full_key]
+            return False, None
+        self._results.move_to_end(full_key)
+        return True, result
+
+    def _store(self, full_key: str, result: Any):
+        self._results[full_key] = (time.monotonic(), result)
+        self._results.move_to_end(full_key)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+    def get(self, scope: str, key: str) -> Tuple[bool, Any]:
+        """
+        Saklanan sonucu döndür (bulundu_mu, sonuç) - kabul kontrolü ve kilitlerden önce
+        çağrılır, tamamlanmış isteğin tekrarı slot beklemez.
+        """
+        full_key = self._key(scope, key)
+        found, result = self._get_stored(full_key)
+        if found:
+            self.hits += 1
+            logger.info(f"Idempotent replay for key: {full_key}")
+        return found, result
+
+    async def run(self, scope: str, key: str, compute: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Aynı key için sonucu bir kez hesapla.
+        (sonuç, tekrar_mı) döndürür - devam eden ilk deneme varsa onun sonucunu bekler.
+        Hata durumunda sonuç saklanmaz, sonraki deneme yeniden hesaplar.
+        """
+        full_key = self._key(scope, key)
+
+        while True:
+            found, result = self._get_stored(full_key)
+            if found:
+                self.hits += 1
+                logger.info(f"Idempotent replay for key: {full_key}")
+                return result, True
+
+            pending = self._in_flight.get(full_key)
+            if pending is None:
+                break
+
+            self.joined += 1
+            logger.info(f"Waiting for in-flight request with key: {full_key}")
+            try:
+                return await asyncio.shield(pending), True
+            except asyncio.CancelledError:
+                # İlk deneme iptal edildiyse bu istek hesaplamayı devralır
+                if not pending.cancelled():
+                    raise
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[full_key] = future
+        try:
+            result = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Bekleyen yoksa "exception never retrieved" uyarısını engelle
+            future.exception()
+            raise
+        else:
+            self._store(full_key, result)
+            future.set_result(result)
+            return result, False
+        finally:
+            self._in_flight.pop(full_key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Depo istatistikleri"""
+        return {
+            "entries": len(self._results),
+            "in_flight": len(self._in_flight),
+            "hits": self.hits,
+            "joined": self.joined,
+            "misses": self.misses,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds
+        }
+
+# Global idempotency store instance
+idempotency_store = IdempotencyStore()
@@ -0,0 +1,142 @@
+import os
+import time
+import uuid
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Dict, Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+class Job:
+    """Arka planda çalışan uzun işlem (durum + ilerleme)"""
+
+    def __init__(self, kind: str, params: Dict[str, Any] = None, job_id: str = None):
+        self.id = job_id or str(uuid.uuid4())
+        self.kind = kind
+        self.params = params or {}
+        self.status = "pending"
+        self.progress: Dict[str, Any] = {}
+        self.result = None
+        self.error = None
+        self.created_at = datetime.now()
+        self.started_at = None
+        self.finished_at = None
+        self._started_monotonic = None
+        self._finished_monotonic = None
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in ("pending", "running")
+
+    def elapsed_seconds(self) -> float:
+        """Başlangıçtan bu yana geçen süre"""
+        if self._started_monotonic is None:
+            return 0.0
+        end = self._finished_monotonic if self._finished_monotonic is not None else time.monotonic()
+        return end - self._started_monotonic
+
+    def update(self, **progress):
+        """İlerleme bilgisini güncelle"""
+        self.progress.update(progress)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "params": self.params,
+            "progress": dict(self.progress),
+            "result": self.result,
+            "error": self.error,
+            "elapsed_seconds": round(self.elapsed_seconds(), 3),
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None
+        }
+
+class JobRegistry:
+    """Son işleri bellekte tutan sınırlı kayıt"""
+
+    def __init__(self, max_jobs: int = None):
+        self.max_jobs = max_jobs or int(os.getenv("JOB_REGISTRY_MAX", 1000))
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, kind: str, job_id: str = None, **params) -> Job:
+        """Yeni iş kaydı oluştur - job_id verilirse (istemci tarafından üretilmiş) kullanılır"""
+        job = Job(kind, params, job_id)
+        with self._lock:
+            if job.id in self._jobs:
+                raise ValueError(f"Job id already in use: {job.id}")
+            self._jobs[job.id] = job
+            # Limit aşılırsa biten en eski işleri at
+            if len(self._jobs) > self.max_jobs:
+                for job_id in list(self._jobs.keys()):
+                    if len(self._jobs) <= self.max_jobs:
+                        break
+                    if not self._jobs[job_id].is_active:
+                        del self._jobs[job_id]
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def find_active(self, kind: str, **params) -> Optional[Job]:
+        """Aynı parametrelerle devam eden işi bul"""
+        with self._lock:
+            for job in reversed(self._jobs.values()):
+                if job.kind == kind and job.is_active and all(job.params.get(k) == v for k, v in params.items()):
+                    return job
+        return None
+
+    def run(self, job: Job, func: Callable[[Job], Any]):
+        """İşi senkron çalıştır (BackgroundTasks veya worker thread içinde)"""
+        self._start(job)
+        try:
+            result = func(job)
+        except Exception as e:
+            self._finish(job, error=e)
+        else:
+            self._finish(job, result=result)
+
+    async def run_async(self, job: Job, func: Callable[[Job], Awaitable[Any]]):
+        """Async işi event loop'ta çalıştır (BackgroundTasks içinde)"""
+        self._start(job)
+        try:
+            result = await func(job)
+        except Exception as e:
+            self._finish(job, error=e)
+        else:
+            self._finish(job, result=result)
+
+    @staticmethod
+    def _start(job: Job):
+        job.started_at = datetime.now()
+        job._started_monotonic = time.monotonic()
+        job.status = "running"
+
+    @staticmethod
+    def _finish(job: Job, result: Any = None, error: Exception = None):
+        if error is not None:
+            job.error = str(error)
+            status = "failed"
+            logger.error(f"Job {job.kind} failed: {job.id} - {error}")
+        else:
+            job.result = result
+            status = "completed"
+            logger.info(f"Job {job.kind} completed: {job.id}")
+        job._finished_monotonic = time.monotonic()
+        job.finished_at = datetime.now()
+        job.status = status
+
+    def stats(self) -> Dict[str, Any]:
+        """İş istatistikleri"""
+        statuses: Dict[str, int] = {}
+        for job in list(self._jobs.values()):
+            statuses[job.status] = statuses.get(job.status, 0) + 1
+        return {"jobs": len(self._jobs), "by_status": statuses, "max_jobs": self.max_jobs}
+
+# Global job registry instance
+job_registry = JobRegistry()
@@ -0,0 +1,80 @@
+import time
+import asyncio
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List
+
+logger = logging.getLogger(__name__)
+
+class KeyedLock:
+    """
+    Anahtar başına asyncio kilidi - aynı anahtar sırayla, farklı anahtarlar
+    eşzamanlı çalışır. Bekleyeni kalmayan kilitler silinir.
+    """
+
+    def __init__(self, name: str = "keyed"):
+        self.name = name
+        # key -> [kilit, kullanan/bekleyen sayısı]
+        self._locks: Dict[str, List[Any]] = {}
+        self.acquired = 0
+        self.contended = 0
+        # Son kilit bekleme süreleri (saniye)
+        self._wait_times = deque(maxlen=1000)
+
+    @asynccontextmanager
+    async def hold(self, key: str) -> AsyncIterator[float]:
+        """Anahtarın kilidini al - beklenen süreyi döndürür"""
+        entry = self._locks.get(key)
+        if entry is None:
+            entry = [asyncio.Lock(), 0]
+            self._locks[key] = entry
+        entry[1] += 1
+
+        started = time.monotonic()
+        try:
+            if entry[0].locked():
+                self.contended += 1
+            await entry[0].acquire()
+        except BaseException:
+            self._release_entry(key, entry)
+            raise
+
+        waited = time.monotonic() - started
+        self._wait_times.append(waited)
+        self.acquired += 1
+        if waited > 1.0:
+            logger.info(f"{self.name} lock for {key} waited {waited:.2f}s")
+        try:
+            yield waited
+        finally:
+            entry[0].release()
+            self._release_entry(key, entry)
+
+    def _release_entry(self, key: str, entry: List[Any]):
+        entry[1] -= 1
+        if entry[1] == 0 and self._locks.get(key) is entry:
+            del self._locks[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Kilit istatistikleri"""
+        wait_times = sorted(self._wait_times)
+        if wait_times:
+            wait_time = {
+                "avg_ms": round(sum(wait_times) / len(wait_times) * 1000, 2),
+                "p95_ms": round(wait_times[min(len(wait_times) - 1, int(len(wait_times) * 0.95))] * 1000, 2),
+                "max_ms": round(wait_times[-1] * 1000, 2)
+            }
+        else:
+            wait_time = {"avg_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+
+        return {
+            "active_keys": len(self._locks),
+            "waiting": sum(entry[1] for entry in self._locks.values()) - sum(1 for entry in self._locks.values() if entry[0].locked()),
+            "acquired": self.acquired,
+            "contended": self.contended,
+            "wait_time": wait_time
+        }
+
+# Global per-user chat pipeline lock
+user_locks = KeyedLock("user")
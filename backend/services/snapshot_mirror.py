@@ -0,0 +1,312 @@
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from utils.timestamps import TIME_FIELDS, normalize_time_field
+
+logger = logging.getLogger(__name__)
+
+# Aynalanan koleksiyonlar: sıralama alanı, azalan mı, ISO string'e çevrilen timestamp alanları
+MIRRORED_COLLECTIONS = {
+    'notes': {'order_by': 'created_at', 'descending': True, 'timestamps': ('created_at', 'updated_at')},
+    'events': {'order_by': 'datetime', 'descending': False, 'timestamps': ('created_at',)},
+    'reminders': {'order_by': 'reminder_time', 'descending': False, 'timestamps': ('created_at',)}
+}
+
+# Sağlık çıktısında bellek kullanımı gösterilen kullanıcı sayısı
+STATS_TOP_USERS = 20
+
+def value_size(value: Any) -> int:
+    """Firestore depolama boyutu kurallarına göre alan değerinin yaklaşık boyutu"""
+    if value is None or isinstance(value, bool):
+        return 1
+    if isinstance(value, (int, float, datetime)):
+        return 8
+    if isinstance(value, str):
+        return len(value.encode('utf-8')) + 1
+    if isinstance(value, bytes):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(len(key.encode('utf-8')) + 1 + value_size(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(value_size(item) for item in value)
+    return 16
+
+class CollectionMirror:
+    """Tek kullanıcının tek koleksiyonu: id -> doküman ve sıralı görünüm"""
+
+    def __init__(self, collection: str):
+        self.collection = collection
+        self.documents: Dict[str, Dict[str, Any]] = {}
+        self.ordered: List[Dict[str, Any]] = []
+        self.size = 0
+        self.ready = False
+        self.read_time = None
+        # Bu zamandan önceki snapshot'lar servisten yapılan yazmayı içermez
+        self.stale_until = None
+        self.watch = None
+
+    def apply(self, snapshots, read_time):
+        """Sorgunun güncel sonuç kümesinden aynayı yeniden kur (listener thread'i)"""
+        config = MIRRORED_COLLECTIONS[self.collection]
+        order_by = config['order_by']
+        documents, size, sortable = {}, 0, []
+        for snapshot in snapshots:
+            data = snapshot.to_dict() or {}
+            size += len(snapshot.id) + 1 + value_size(data) + 32
+            if self.collection in TIME_FIELDS:
+                # Eski string ve Timestamp değerleri aynı türde sıralansın
+                normalize_time_field(data, TIME_FIELDS[self.collection])
+            sort_value = data.get(order_by)
+            for field in config['timestamps']:
+                if data.get(field):
+                    data[field] = data[field].isoformat()
+            data['id'] = snapshot.id
+            documents[snapshot.id] = data
+            # Firestore order_by alanı olmayan dokümanları döndürmez
+            if sort_value is not None:
+                sortable.append((sort_value, data))
+
+        sortable.sort(key=lambda item: item[0], reverse=config['descending'])
+        self.documents = documents
+        self.ordered = [data for _, data in sortable]
+        self.size = size
+        self.read_time = read_time
+        if self.stale_until is not None and (read_time is None or read_time >= self.stale_until):
+            self.stale_until = None
+        self.ready = True
+
+class UserMirror:
+    """Kullanıcının aynalanan koleksiyonları ve dinleyicileri"""
+
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        self.collections = {name: CollectionMirror(name) for name in MIRRORED_COLLECTIONS}
+        self.subscribed_at = time.monotonic()
+        self.last_read = self.subscribed_at
+        self.reads = 0
+
+    @property
+    def size(self) -> int:
+        return sum(mirror.size for mirror in self.collections.values())
+
+    def unsubscribe(self):
+        for mirror in self.collections.values():
+            if mirror.watch is not None:
+                try:
+                    mirror.watch.unsubscribe()
+                except Exception as e:
+                    logger.warning(f"Snapshot listener unsubscribe failed: {e}")
+                mirror.watch = None
+
+class SnapshotMirror:
+    """
+    Aktif kullanıcıların notes / events / reminders koleksiyonlarını on_snapshot ile
+    dinleyip bellekte tutar; okumalar Firestore'a gitmeden aynadan yapılır.
+    Kullanıcılar ilk okumada abone edilir, FIRESTORE_MIRROR_IDLE_SECONDS boyunca okunmayan
+    veya kullanıcı/bayt limitleri aşıldığında en uzun süredir okunmayan kullanıcı bırakılır.
+    Dinleyiciler senkron Firestore client'ı ile açılır (AsyncClient on_snapshot desteklemez).
+    """
+
+    def __init__(self):
+        self.enabled = os.getenv("FIRESTORE_MIRROR_ENABLED", "false").lower() == "true"
+        self.max_users = int(os.getenv("FIRESTORE_MIRROR_MAX_USERS", 200))
+        self.idle_seconds = float(os.getenv("FIRESTORE_MIRROR_IDLE_SECONDS", 600))
+        self.max_bytes = int(os.getenv("FIRESTORE_MIRROR_MAX_BYTES", 64 * 1024 * 1024))
+        self.user_max_bytes = int(os.getenv("FIRESTORE_MIRROR_USER_MAX_BYTES", 1024 * 1024))
+        self.db = None
+        self._users = OrderedDict()
+        # Tek kullanıcı limiti aşan kullanıcılar aynalanmaz, sorgu ile okunur
+        self._oversized = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.subscriptions = 0
+        self.evictions = 0
+
+    @property
+    def active(self) -> bool:
+        return self.enabled and self.db is not None
+
+    def start(self, db):
+        """Senkron Firestore client'ı ile dinlemeye hazırla (lifespan)"""
+        if not self.enabled:
+            return
+        if db is None:
+            logger.warning("Snapshot mirror enabled but Firestore is not available")
+            return
+        self.db = db
+        logger.info(f"Snapshot mirror started (max {self.max_users} users)")
+
+    def read(self, collection: str, user_id: Optional[str], include_completed: bool = True) -> Optional[List[Dict[str, Any]]]:
+        """
+        Aynadaki dokümanların kopyası; kullanıcı aynalanmıyorsa, ilk snapshot gelmediyse veya
+        servisten yapılan yazma henüz snapshot'a yansımadıysa None (çağıran sorguya düşer).
+        İlk okuma kullanıcıyı arka planda abone eder.
+        """
+        if not self.active or not user_id:
+            return None
+
+        documents = None
+        subscribe = False
+        with self._lock:
+            user = self._users.get(user_id)
+            if user is not None:
+                user.last_read = time.monotonic()
+                self._users.move_to_end(user_id)
+                mirror = user.collections[collection]
+                if mirror.ready and mirror.stale_until is None:
+                    documents = mirror.ordered
+                    if collection == 'reminders' and not include_completed:
+                        documents = [doc for doc in documents if doc.get('is_completed') is False]
+                    documents = [dict(doc) for doc in documents]
+                    user.reads += 1
+                    self.hits += 1
+            elif user_id not in self._oversized:
+                self._users[user_id] = UserMirror(user_id)
+                subscribe = True
+            if documents is None:
+                self.misses += 1
+
+        if subscribe:
+            threading.Thread(target=self._subscribe, args=(user_id,), daemon=True).start()
+        else:
+            self._evict()
+        return documents
+
+    def _subscribe(self, user_id: str):
+        with self._lock:
+            user = self._users.get(user_id)
+        if user is None:
+            return
+
+        try:
+            for name, mirror in user.collections.items():
+                query = self.db.collection(name).where('user_id', '==', user_id)
+                mirror.watch = query.on_snapshot(self._callback(user, mirror))
+            with self._lock:
+                # Dinleyiciler açılırken kullanıcı bırakılmış olabilir (_evict, shutdown)
+                registered = self._users.get(user_id) is user
+                if registered:
+                    self.subscriptions += 1
+            if not registered:
+                user.unsubscribe()
+                logger.info(f"Snapshot mirror user released while subscribing: {user_id}")
+                return
+            logger.info(f"Snapshot mirror subscribed for user: {user_id}")
+        except Exception as e:
+            logger.warning(f"Snapshot mirror subscribe failed for user {user_id}: {e}")
+            with self._lock:
+                if self._users.get(user_id) is user:
+                    del self._users[user_id]
+            user.unsubscribe()
+            return
+        self._evict()
+
+    def _callback(self, user: UserMirror, mirror: CollectionMirror):
+        def on_snapshot(snapshots, changes, read_time):
+            with self._lock:
+                mirror.apply(snapshots, read_time)
+                oversized = user.size > self.user_max_bytes
+                if oversized and self._users.get(user.user_id) is user:
+                    del self._users[user.user_id]
+                    self._oversized[user.user_id] = True
+                    while len(self._oversized) > self.max_users:
+                        self._oversized.popitem(last=False)
+            if oversized:
+                logger.info(f"Snapshot mirror dropped oversized user: {user.user_id} ({user.size} bytes)")
+                # Listener kendi thread'inden kapatılamaz
+                threading.Thread(target=user.unsubscribe, daemon=True).start()
+            else:
+                self._evict()
+        return on_snapshot
+
+    def note_write(self, collection: str, user_id: Optional[str] = None, doc_id: str = None, write_time=None):
+        """
+        Servisten yapılan yazma: yazmayı içeren snapshot gelene kadar o koleksiyon aynadan okunmaz.
+        Sahibi bilinmeyen doküman aynalanan bir kullanıcıya ait değildir (veya ayna henüz hazır değildir).
+        """
+        if not self.active or collection not in MIRRORED_COLLECTIONS:
+            return
+        with self._lock:
+            if user_id is None and doc_id is not None:
+                user_id = next((key for key, user in self._users.items()
+                                if doc_id in user.collections[collection].documents), None)
+            user = self._users.get(user_id) if user_id else None
+            if user is None:
+                return
+            mirror = user.collections[collection]
+            if write_time is None:
+                # Yazma zamanı bilinmiyor - sonraki snapshot yeterli
+                mirror.ready = False
+            elif mirror.read_time is not None and mirror.read_time >= write_time:
+                # Yazma zaten aynada
+                return
+            elif mirror.stale_until is None or write_time > mirror.stale_until:
+                mirror.stale_until = write_time
+
+    def _evict(self):
+        """Boşta kalan ve limit aşan kullanıcıların dinleyicilerini kapat"""
+        now = time.monotonic()
+        evicted = []
+        with self._lock:
+            total = sum(user.size for user in self._users.values())
+            for user_id in list(self._users.keys()):
+                user = self._users[user_id]
+                idle = now - user.last_read > self.idle_seconds
+                if not idle and len(self._users) <= self.max_users and total <= self.max_bytes:
+                    break
+                del self._users[user_id]
+                total -= user.size
+                evicted.append(user)
+            self.evictions += len(evicted)
+        for user in evicted:
+            user.unsubscribe()
+            logger.info(f"Snapshot mirror released user: {user.user_id}")
+
+    def shutdown(self):
+        """Tüm dinleyicileri kapat"""
+        with self._lock:
+            users, self._users = list(self._users.values()), OrderedDict()
+        for user in users:
+            user.unsubscribe()
+
+    def stats(self) -> Dict[str, Any]:
+        """Ayna istatistikleri ve kullanıcı başına bellek"""
+        now = time.monotonic()
+        with self._lock:
+            users = sorted(self._users.values(), key=lambda user: user.size, reverse=True)
+            total_bytes = sum(user.size for user in users)
+            largest = {
+                user.user_id: {
+                    "bytes": user.size,
+                    "documents": {name: len(mirror.documents) for name, mirror in user.collections.items()},
+                    "reads": user.reads,
+                    "idle_seconds": round(now - user.last_read, 1)
+                }
+                for user in users[:STATS_TOP_USERS]
+            }
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "active": self.active,
+            "users": len(users),
+            "bytes": total_bytes,
+            "max_bytes": self.max_bytes,
+            "user_max_bytes": self.user_max_bytes,
+            "max_users": self.max_users,
+            "oversized_users": len(self._oversized),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "subscriptions": self.subscriptions,
+            "evictions": self.evictions,
+            "largest_users": largest
+        }
+
+# Global snapshot mirror instance
+snapshot_mirror = SnapshotMirror()
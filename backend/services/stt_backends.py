@@ -0,0 +1,121 @@
+"""
+Ses tanıma backend'leri.
+Her backend worker process başına bir kez oluşturulur; yerel modeller yalnızca
+ilk oluşturmada yüklenir. Tanınamayan ses için sr.UnknownValueError, servis/model
+hatası için sr.RequestError fırlatılır.
+"""
+import os
+import json
+import logging
+from typing import Dict, Type
+
+import speech_recognition as sr
+
+logger = logging.getLogger(__name__)
+
+class RecognizerBackend:
+    """Ses tanıma backend arayüzü"""
+
+    name = "base"
+    # Yerel backend'ler ağ çağrısı yapmaz
+    offline = False
+
+    def recognize(self, audio_data: sr.AudioData, language: str = "tr-TR") -> str:
+        raise NotImplementedError
+
+class GoogleBackend(RecognizerBackend):
+    """Google Web Speech API (ağ gerekir)"""
+
+    name = "google"
+
+    def __init__(self):
+        self.recognizer = sr.Recognizer()
+
+    def recognize(self, audio_data: sr.AudioData, language: str = "tr-TR") -> str:
+        return self.recognizer.recognize_google(audio_data, language=language)
+
+class VoskBackend(RecognizerBackend):
+    """Vosk/Kaldi yerel CPU modeli (STT_VOSK_MODEL_PATH)"""
+
+    name = "vosk"
+    offline = True
+    sample_rate = 16000
+
+    def __init__(self, model_path: str = None):
+        try:
+            from vosk import Model, SetLogLevel
+        except ImportError:
+            raise RuntimeError("Vosk backend için 'pip install vosk' gerekli")
+
+        model_path = model_path or os.getenv("STT_VOSK_MODEL_PATH", "models/vosk-model-small-tr-0.3")
+        if not os.path.isdir(model_path):
+            raise RuntimeError(f"Vosk modeli bulunamadı: {model_path}")
+        SetLogLevel(-1)
+        self.model = Model(model_path)
+        logger.info(f"Vosk model loaded: {model_path}")
+
+    def recognize(self, audio_data: sr.AudioData, language: str = "tr-TR") -> str:
+        from vosk import KaldiRecognizer
+
+        recognizer = KaldiRecognizer(self.model, self.sample_rate)
+        recognizer.AcceptWaveform(audio_data.get_raw_data(convert_rate=self.sample_rate, convert_width=2))
+        text = json.loads(recognizer.FinalResult()).get("text", "").strip()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+class WhisperBackend(RecognizerBackend):
+    """faster-whisper (CTranslate2) yerel CPU modeli (STT_WHISPER_MODEL)"""
+
+    name = "whisper"
+    offline = True
+    sample_rate = 16000
+
+    def __init__(self, model: str = None):
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError:
+            raise RuntimeError("Whisper backend için 'pip install faster-whisper' gerekli")
+
+        model = model or os.getenv("STT_WHISPER_MODEL", "small")
+        self.model = WhisperModel(
+            model,
+            device="cpu",
+            compute_type=os.getenv("STT_WHISPER_COMPUTE_TYPE", "int8"),
+            cpu_threads=int(os.getenv("STT_WHISPER_THREADS", 2))
+        )
+        logger.info(f"Whisper model loaded: {model}")
+
+    def recognize(self, audio_data: sr.AudioData, language: str = "tr-TR") -> str:
+        import numpy as np
+
+        pcm = audio_data.get_raw_data(convert_rate=self.sample_rate, convert_width=2)
+        samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+        segments, _ = self.model.transcribe(samples, language=language.split("-")[0], beam_size=1)
+        text = " ".join(segment.text.strip() for segment in segments).strip()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+STT_BACKENDS: Dict[str, Type[RecognizerBackend]] = {
+    GoogleBackend.name: GoogleBackend,
+    VoskBackend.name: VoskBackend,
+    WhisperBackend.name: WhisperBackend
+}
+
+def create_backend(name: str = None) -> RecognizerBackend:
+    """
+    Backend oluştur (STT_BACKEND).
+    Bilinmeyen veya yüklenemeyen backend hata verir - sessizce Google'a düşülmez, aksi halde
+    önbellek anahtarı ve istatistikler yanlış backend'i gösterirdi.
+    """
+    name = (name or os.getenv("STT_BACKEND", "google")).lower()
+    backend_class = STT_BACKENDS.get(name)
+    if backend_class is None:
+        raise ValueError(f"Unknown STT backend '{name}' (choices: {', '.join(STT_BACKENDS)})")
+
+    try:
+        return backend_class()
+    except Exception as e:
+        logger.error(f"STT backend '{name}' could not be loaded: {e}")
+        raise
@@ -0,0 +1,115 @@
+import os
+import re
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class TranscriptCache:
+    """
+    Ses içeriği hash'ine göre transcript önbelleği.
+    Bellek katmanı LRU; TRANSCRIPT_CACHE_DIR verilirse disk katmanı da kullanılır.
+    """
+
+    def __init__(self, max_entries: int = None, cache_dir: str = None, max_disk_entries: int = None):
+        self.max_entries = max_entries or int(os.getenv("TRANSCRIPT_CACHE_MAX", 1000))
+        self.cache_dir = cache_dir or os.getenv("TRANSCRIPT_CACHE_DIR") or None
+        self.max_disk_entries = max_disk_entries or int(os.getenv("TRANSCRIPT_CACHE_DISK_MAX", 10000))
+        self._entries = OrderedDict()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._disk_entries = 0
+
+        if self.cache_dir:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                self._disk_entries = sum(1 for name in os.listdir(self.cache_dir) if name.endswith(".txt"))
+            except OSError as e:
+                logger.warning(f"Transcript disk cache disabled: {e}")
+                self.cache_dir = None
+
+    @staticmethod
+    def make_key(digest: str, language: str, backend: str) -> str:
+        """Aynı ses farklı dil/backend ile farklı sonuç verebilir"""
+        return re.sub(r"[^\w.-]", "_", f"{digest}.{language}.{backend}")
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.txt")
+
+    def get(self, key: str) -> Optional[str]:
+        """Transcript'i bellekten, yoksa diskten getir"""
+        text = self._entries.get(key)
+        if text is not None:
+            self._entries.move_to_end(key)
+            self.memory_hits += 1
+            return text
+
+        if self.cache_dir:
+            try:
+                with open(self._path(key), encoding="utf-8") as f:
+                    text = f.read()
+                self._remember(key, text)
+                self.disk_hits += 1
+                return text
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Transcript disk cache read failed: {e}")
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, text: str):
+        """Transcript'i önbelleğe yaz"""
+        self._remember(key, text)
+        if not self.cache_dir:
+            return
+
+        try:
+            path = self._path(key)
+            exists = os.path.exists(path)
+            temp_path = f"{path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(temp_path, path)
+            if not exists:
+                self._disk_entries += 1
+                if self._disk_entries > self.max_disk_entries:
+                    self._evict_disk()
+        except OSError as e:
+            logger.warning(f"Transcript disk cache write failed: {e}")
+
+    def _remember(self, key: str, text: str):
+        self._entries[key] = text
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _evict_disk(self):
+        """Disk limiti aşılınca en eski %10'u sil"""
+        paths = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir) if name.endswith(".txt")]
+        paths.sort(key=os.path.getmtime)
+        for path in paths[:max(1, len(paths) // 10)]:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        self._disk_entries = sum(1 for name in os.listdir(self.cache_dir) if name.endswith(".txt"))
+
+    def stats(self) -> Dict[str, Any]:
+        """Önbellek istatistikleri"""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "disk_entries": self._disk_entries if self.cache_dir else None,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+            "max_entries": self.max_entries
+        }
+
+# Global transcript cache instance
+transcript_cache = TranscriptCache()
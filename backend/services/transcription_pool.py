@@ -0,0 +1,143 @@
+import os
+import time
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from services.transcription_worker import init_worker, backend_name
+
+logger = logging.getLogger(__name__)
+
+class TranscriptionQueueFull(Exception):
+    """Transcription kuyruğu dolu"""
+
+class TranscriptionTimeout(Exception):
+    """Transcription işi zaman aşımına uğradı"""
+
+class TranscriptionPool:
+    """
+    Bloklayan ses tanıma işleri için process havuzu + sınırlı kuyruk.
+    Event loop işi yalnızca bekler; decode sonrası CPU/ağ işi worker'larda çalışır.
+    """
+
+    def __init__(self, max_workers: int = None, max_queue: int = None, job_timeout: float = None,
+                 backend: str = None):
+        self.max_workers = max_workers or int(os.getenv("AUDIO_WORKERS", 2))
+        self.max_queue = max_queue if max_queue is not None else int(os.getenv("AUDIO_QUEUE_MAX", 16))
+        self.job_timeout = job_timeout or float(os.getenv("AUDIO_JOB_TIMEOUT", 30))
+        self.backend = (backend or os.getenv("STT_BACKEND", "google")).lower()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Worker'da çalışan veya sırada bekleyen iş - zaman aşımına uğrayıp terk edilenler dahil
+        self.pending = 0
+        self.abandoned = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.max_depth = 0
+        self._run_seconds = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: uvicorn thread'leriyle fork güvensiz
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_worker,
+                initargs=(self.backend,)
+            )
+            logger.info(f"Transcription pool started with {self.max_workers} {self.backend} workers")
+        return self._executor
+
+    def start(self):
+        """
+        Worker'ları başlat ve backend'in yüklendiğini doğrula - uygulama açılışında (lifespan) çağrılır.
+        Yapılandırılan backend yüklenemezse uygulama açılmaz.
+        """
+        try:
+            loaded = self._get_executor().submit(backend_name).result()
+        except Exception as e:
+            self.shutdown()
+            raise RuntimeError(f"STT backend '{self.backend}' could not be loaded: {e}") from e
+        logger.info(f"Transcription workers ready with {loaded} backend")
+
+    @property
+    def queue_depth(self) -> int:
+        """Worker bekleyen iş sayısı"""
+        return max(0, self.pending - self.max_workers)
+
+    def _track(self, loop: asyncio.AbstractEventLoop, future: Future):
+        """Slot iş worker'da gerçekten bittiğinde (veya sıradan iptal edildiğinde) boşalır"""
+        def release():
+            self.pending -= 1
+            if getattr(future, "abandoned", False):
+                self.abandoned -= 1
+
+        def on_done(_):
+            try:
+                loop.call_soon_threadsafe(release)
+            except RuntimeError:
+                # Kapanış sırasında event loop kapalı olabilir
+                pass
+
+        future.add_done_callback(on_done)
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        """İşi havuzda çalıştır ve sonucunu bekle"""
+        if self.queue_depth >= self.max_queue:
+            self.rejected += 1
+            raise TranscriptionQueueFull("Ses tanıma kuyruğu dolu")
+
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        self.pending += 1
+        self.max_depth = max(self.max_depth, self.queue_depth)
+        future = self._get_executor().submit(func, *args)
+        self._track(loop, future)
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.job_timeout)
+            self.completed += 1
+            return result
+        except asyncio.TimeoutError:
+            # Sıradaki iş iptal edilir; worker'da çalışan iş durdurulamaz, bitene kadar slotu tutar
+            self.timeouts += 1
+            if not future.cancel() and not future.done():
+                future.abandoned = True
+                self.abandoned += 1
+            raise TranscriptionTimeout("Ses tanıma zaman aşımına uğradı")
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self._run_seconds += time.monotonic() - started
+
+    def shutdown(self):
+        """Worker process'lerini kapat"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Havuz istatistikleri"""
+        finished = self.completed + self.failed + self.timeouts
+        return {
+            "backend": self.backend,
+            "workers": self.max_workers,
+            "started": self._executor is not None,
+            "pending": self.pending,
+            "abandoned": self.abandoned,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_depth,
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "avg_job_ms": round(self._run_seconds / finished * 1000, 2) if finished else 0.0,
+            "job_timeout_seconds": self.job_timeout
+        }
+
+# Global transcription pool instance
+transcription_pool = TranscriptionPool()
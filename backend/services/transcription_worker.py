@@ -0,0 +1,45 @@
+"""
+Transcription worker process'lerinde çalışan fonksiyonlar.
+Spawn ile başlatılan worker'lar bu modülü import eder - ağır bağımlılık eklemeyin.
+"""
+import logging
+import speech_recognition as sr
+
+from services.stt_backends import create_backend
+
+logger = logging.getLogger(__name__)
+
+# Tanıma sonucu yerine döndürülen mesajlar
+UNRECOGNIZED_TEXT = "Ses anlaşılamadı. Lütfen daha net konuşun."
+SERVICE_ERROR_TEXT = "Ses tanıma servisi hatası. Lütfen tekrar deneyin."
+
+# Worker başına tek backend (yerel modeller bir kez yüklenir)
+_backend = None
+
+def init_worker(backend_name: str = None):
+    """Worker process başlangıcı"""
+    global _backend
+    _backend = create_backend(backend_name)
+
+def backend_name() -> str:
+    """Worker'da yüklü backend'in adı (açılış kontrolü için)"""
+    if _backend is None:
+        init_worker()
+    return _backend.name
+
+def recognize_pcm(frame_data: bytes, sample_rate: int, sample_width: int, language: str = "tr-TR") -> str:
+    """PCM ses verisini metne dönüştürür (bloklayan çağrı)"""
+    if _backend is None:
+        init_worker()
+
+    audio_data = sr.AudioData(frame_data, sample_rate, sample_width)
+    try:
+        text = _backend.recognize(audio_data, language=language)
+        logger.info(f"Speech to text successful ({_backend.name}): {text}")
+        return text
+    except sr.UnknownValueError:
+        logger.warning("Speech recognition could not understand audio")
+        return UNRECOGNIZED_TEXT
+    except sr.RequestError as e:
+        logger.error(f"Speech recognition service error: {str(e)}")
+        return SERVICE_ERROR_TEXT
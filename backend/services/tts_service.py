@@ -0,0 +1,293 @@
+"""
+Asistan yanıtları için sunucu tarafı metin okuma (TTS).
+Yerel motorla (espeak-ng veya piper) üretilen WAV, ffmpeg ile kompakt bir codec'e
+(Opus/Ogg veya AAC/ADTS) çevrilip istemciye akıtılır. Ses, konuşma için normalize
+edilmiş metnin hash'i ile önbelleğe alınır; sabit yanıtlar açılışta hazırlanır.
+"""
+import os
+import re
+import time
+import asyncio
+import hashlib
+import logging
+import subprocess
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Tuple, Type
+
+from pydub.utils import which
+
+logger = logging.getLogger(__name__)
+
+# İstemciye akıtılan codec'ler - ikisi de başlık beklemeden parça parça çalınabilir
+TTS_FORMATS = {
+    "opus": {"args": ["-c:a", "libopus", "-b:a", "24k", "-application", "voip", "-f", "ogg"], "media_type": "audio/ogg"},
+    "aac": {"args": ["-c:a", "aac", "-b:a", "32k", "-f", "adts"], "media_type": "audio/aac"}
+}
+TTS_SAMPLE_RATE = 24000
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# Okunuşu değişen kısaltmalar (hava durumu özetleri)
+SPEECH_REPLACEMENTS = [
+    (re.compile(r"°C"), " derece"),
+    (re.compile(r"%\s*(\d+)"), r"yüzde \1"),
+    (re.compile(r"\bm/s\b"), " metre bölü saniye")
+]
+# Emoji ve markdown işaretleri okunmaz
+UNSPOKEN_CHARACTERS = re.compile(r"[^\w\s.,!?;:'\"()/-]")
+
+def normalize_for_speech(text: str) -> str:
+    """Metni okunacak hale getir: emoji/markdown temizliği, kısaltmalar, boşluklar"""
+    for pattern, replacement in SPEECH_REPLACEMENTS:
+        text = pattern.sub(replacement, text)
+    text = UNSPOKEN_CHARACTERS.sub(" ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+class TTSEngine:
+    """Yerel TTS motoru arayüzü - metinden WAV üretir (bloklar)"""
+
+    name = "base"
+
+    def available(self) -> bool:
+        raise NotImplementedError
+
+    def synthesize(self, text: str) -> bytes:
+        raise NotImplementedError
+
+    @staticmethod
+    def _run(command, text_input: Optional[str] = None) -> bytes:
+        result = subprocess.run(
+            command,
+            input=text_input.encode() if text_input is not None else None,
+            capture_output=True,
+            timeout=30
+        )
+        if result.returncode != 0 or not result.stdout:
+            raise RuntimeError(result.stderr.decode(errors="ignore").strip() or f"TTS exit code {result.returncode}")
+        return result.stdout
+
+class EspeakEngine(TTSEngine):
+    """espeak-ng (formant sentez, çok hızlı, model gerekmez)"""
+
+    name = "espeak"
+
+    def __init__(self):
+        self.binary = which("espeak-ng") or which("espeak")
+        self.voice = os.getenv("TTS_VOICE", "tr")
+        self.rate = os.getenv("TTS_RATE", "165")
+
+    def available(self) -> bool:
+        return self.binary is not None
+
+    def synthesize(self, text: str) -> bytes:
+        return self._run([self.binary, "-v", self.voice, "-s", self.rate, "--stdout", text])
+
+class PiperEngine(TTSEngine):
+    """piper (yerel nöral TTS, TTS_PIPER_MODEL ile .onnx ses modeli)"""
+
+    name = "piper"
+
+    def __init__(self):
+        self.binary = which("piper")
+        self.model = os.getenv("TTS_PIPER_MODEL", "models/tr_TR-dfki-medium.onnx")
+
+    def available(self) -> bool:
+        return self.binary is not None and os.path.exists(self.model)
+
+    def synthesize(self, text: str) -> bytes:
+        return self._run([self.binary, "--model", self.model, "--output_file", "-"], text_input=text)
+
+TTS_ENGINES: Dict[str, Type[TTSEngine]] = {
+    "espeak": EspeakEngine,
+    "piper": PiperEngine
+}
+
+class TTSService:
+    """
+    Önbellekli TTS. Render edilen ses normalize metin + motor + codec hash'i ile
+    bayt sınırlı LRU'da tutulur; açılışta hazırlanan sabit yanıtlar atılmaz.
+    """
+
+    def __init__(self):
+        self.enabled = os.getenv("TTS_ENABLED", "false").lower() == "true"
+        self.engine_name = os.getenv("TTS_ENGINE", "espeak").lower()
+        self.default_format = os.getenv("TTS_FORMAT", "opus")
+        self.max_bytes = int(os.getenv("TTS_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+        self.max_texts = int(os.getenv("TTS_MAX_TEXTS", 10000))
+        self.ffmpeg = which("ffmpeg") or "ffmpeg"
+        self._engine: Optional[TTSEngine] = None
+        self._audio = OrderedDict()
+        self._audio_bytes = 0
+        self._pinned = set()
+        # audio_url ile istenecek metinler: anahtar -> (konuşma metni, codec)
+        self._texts = OrderedDict()
+        self._prerender_task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0
+        self._render_seconds = 0.0
+
+    @property
+    def engine(self) -> TTSEngine:
+        if self._engine is None:
+            engine_class = TTS_ENGINES.get(self.engine_name)
+            if engine_class is None:
+                logger.warning(f"Unknown TTS engine '{self.engine_name}', using espeak")
+                engine_class = EspeakEngine
+            self._engine = engine_class()
+        return self._engine
+
+    @property
+    def available(self) -> bool:
+        return self.enabled and self.engine.available()
+
+    def make_key(self, speech_text: str, audio_format: str) -> str:
+        digest = hashlib.sha256(f"{self.engine.name}\n{audio_format}\n{speech_text}".encode()).hexdigest()
+        return digest[:32]
+
+    def register(self, text: str, audio_format: str = None) -> Optional[str]:
+        """Yanıt metnini kaydet, ses anahtarını döndür (TTS kapalıysa veya okunacak metin yoksa None)"""
+        audio_format = audio_format or self.default_format
+        if not self.available or audio_format not in TTS_FORMATS:
+            return None
+        speech_text = normalize_for_speech(text)
+        if not speech_text:
+            return None
+
+        key = self.make_key(speech_text, audio_format)
+        self._texts[key] = (speech_text, audio_format)
+        self._texts.move_to_end(key)
+        while len(self._texts) > self.max_texts:
+            self._texts.popitem(last=False)
+        return key
+
+    def lookup(self, key: str) -> Optional[Tuple[str, str]]:
+        return self._texts.get(key)
+
+    @staticmethod
+    def media_type(audio_format: str) -> str:
+        return TTS_FORMATS[audio_format]["media_type"]
+
+    async def stream(self, key: str, speech_text: str, audio_format: str) -> AsyncIterator[bytes]:
+        """Önbellekteki sesi veya render edilirken üretilen parçaları akıt"""
+        audio = self._audio.get(key)
+        if audio is not None:
+            self._audio.move_to_end(key)
+            self.hits += 1
+            for start in range(0, len(audio), STREAM_CHUNK_SIZE):
+                yield audio[start:start + STREAM_CHUNK_SIZE]
+            return
+
+        self.misses += 1
+        chunks = []
+        async for chunk in self._render(speech_text, audio_format):
+            chunks.append(chunk)
+            yield chunk
+        self._remember(key, b"".join(chunks))
+
+    async def _render(self, speech_text: str, audio_format: str) -> AsyncIterator[bytes]:
+        """Motor ile WAV üret, ffmpeg ile encode ederken çıktıyı akıt"""
+        started = time.perf_counter()
+        try:
+            wav = await asyncio.to_thread(self.engine.synthesize, speech_text)
+        except Exception:
+            self.failures += 1
+            raise
+
+        process = await asyncio.create_subprocess_exec(
+            self.ffmpeg, "-loglevel", "error", "-i", "pipe:0",
+            "-ac", "1", "-ar", str(TTS_SAMPLE_RATE), *TTS_FORMATS[audio_format]["args"], "pipe:1",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+
+        async def feed():
+            try:
+                process.stdin.write(wav)
+                await process.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            finally:
+                process.stdin.close()
+
+        feeder = asyncio.create_task(feed())
+        try:
+            while True:
+                chunk = await process.stdout.read(STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+            await feeder
+            error = await process.stderr.read()
+            if await process.wait() != 0:
+                self.failures += 1
+                raise RuntimeError(f"TTS encode hatası: {error.decode(errors='ignore').strip()}")
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            self._render_seconds += time.perf_counter() - started
+
+    def _remember(self, key: str, audio: bytes, pinned: bool = False):
+        if key in self._audio:
+            self._audio_bytes -= len(self._audio[key])
+        self._audio[key] = audio
+        self._audio_bytes += len(audio)
+        if pinned:
+            self._pinned.add(key)
+
+        for old_key in list(self._audio.keys()):
+            if self._audio_bytes <= self.max_bytes:
+                break
+            if old_key not in self._pinned and old_key != key:
+                self._audio_bytes -= len(self._audio.pop(old_key))
+
+    async def prerender(self, texts: Iterable[str]):
+        """Sabit yanıtları önceden render et (önbellekten atılmaz)"""
+        rendered = 0
+        for text in texts:
+            key = self.register(text)
+            if key is None or key in self._audio:
+                continue
+            try:
+                speech_text, audio_format = self._texts[key]
+                audio = b"".join([chunk async for chunk in self._render(speech_text, audio_format)])
+                self._remember(key, audio, pinned=True)
+                rendered += 1
+            except Exception as e:
+                logger.warning(f"TTS prerender failed for '{text[:30]}': {e}")
+        logger.info(f"TTS prerendered {rendered} canned replies")
+
+    def start(self, canned_replies: Iterable[str]):
+        """Açılışta sabit yanıtları arka planda hazırla (lifespan)"""
+        if not self.enabled:
+            return
+        if not self.engine.available():
+            logger.warning(f"TTS enabled but engine '{self.engine.name}' is not available")
+            return
+        self._prerender_task = asyncio.create_task(self.prerender(list(canned_replies)))
+
+    def shutdown(self):
+        if self._prerender_task is not None and not self._prerender_task.done():
+            self._prerender_task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """TTS istatistikleri"""
+        renders = self.misses + len(self._pinned)
+        return {
+            "enabled": self.enabled,
+            "available": self.available,
+            "engine": self.engine_name,
+            "format": self.default_format,
+            "cached": len(self._audio),
+            "pinned": len(self._pinned),
+            "cache_bytes": self._audio_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "failures": self.failures,
+            "avg_render_ms": round(self._render_seconds / renders * 1000, 2) if renders else 0.0
+        }
+
+# Global TTS service instance
+tts_service = TTSService()
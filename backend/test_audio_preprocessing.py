@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Ses ön işleme testleri - sessizlik kırpma
+"""
+
+import numpy as np
+
+from utils.audio_preprocessing import float_to_pcm16, preprocess_pcm, trim_silence
+
+SAMPLE_RATE = 16000
+
+def tone(seconds: float, amplitude: float = 0.5, frequency: float = 440.0) -> np.ndarray:
+    t = np.arange(int(seconds * SAMPLE_RATE), dtype=np.float32) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+def test_all_silent():
+    """Tamamen sessiz klip boş diziye kırpılmalı"""
+    for samples in (np.zeros(SAMPLE_RATE, dtype=np.float32),
+                    np.full(SAMPLE_RATE, 0.001, dtype=np.float32)):
+        trimmed, noise_floor = trim_silence(samples, SAMPLE_RATE)
+        assert len(trimmed) == 0
+        assert noise_floor < 0.01
+
+    pcm, stats = preprocess_pcm(float_to_pcm16(np.zeros(SAMPLE_RATE, dtype=np.float32)), SAMPLE_RATE, 2)
+    assert pcm == b""
+    assert stats["output_seconds"] == 0.0
+    assert stats["input_seconds"] == 1.0
+
+def test_empty_and_short():
+    """Boş veya tek çerçeveden kısa klip hata vermemeli"""
+    trimmed, noise_floor = trim_silence(np.zeros(0, dtype=np.float32), SAMPLE_RATE)
+    assert len(trimmed) == 0 and noise_floor == 0.0
+    short = tone(0.005)
+    trimmed, _ = trim_silence(short, SAMPLE_RATE)
+    assert len(trimmed) == len(short)
+
+def test_trims_leading_and_trailing():
+    """Baştaki ve sondaki sessizlik kırpılmalı, konuşma ve dolgu korunmalı"""
+    silence = np.zeros(SAMPLE_RATE, dtype=np.float32)
+    speech = tone(0.5)
+    trimmed, _ = trim_silence(np.concatenate([silence, speech, silence]), SAMPLE_RATE)
+    assert len(speech) <= len(trimmed) <= len(speech) + 2 * (SAMPLE_RATE * 150 // 1000) + 2 * 320
+
+def test_no_silence():
+    """Sessizliği olmayan klip kırpılmamalı"""
+    speech = tone(1.0)
+    trimmed, _ = trim_silence(speech, SAMPLE_RATE)
+    assert len(trimmed) == len(speech)
+
+def main():
+    """Ana test fonksiyonu"""
+    for test in (test_all_silent, test_empty_and_short, test_trims_leading_and_trailing, test_no_silence):
+        test()
+        print(f"✅ {test.__doc__}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+NDJSON toplu içe aktarma ayrıştırma testleri
+"""
+
+import json
+
+from services.bulk_import_service import IMPORT_MAX_LINE_BYTES, iter_ndjson
+
+def parse(chunks, user_id=None):
+    stats = {"lines": 0, "invalid": 0}
+    return list(iter_ndjson(chunks, stats, user_id)), stats
+
+def test_split_chunks():
+    """Parça sınırında bölünen satırlar birleştirilmeli, boş satırlar sayılmamalı"""
+    data = b'{"title": "a"}\n\n{"title": "b", "user_id": "ayse"}\n{"title": "c"}'
+    for size in (1, 3, 7, len(data)):
+        chunks = [data[i:i + size] for i in range(0, len(data), size)]
+        records, stats = parse(chunks, user_id="ali")
+        assert [record["title"] for record in records] == ["a", "b", "c"], size
+        assert [record["user_id"] for record in records] == ["ali", "ayse", "ali"]
+        assert stats == {"lines": 3, "invalid": 0}
+
+def test_invalid_lines():
+    """Ayrıştırılamayan ve obje olmayan satırlar atlanıp sayılmalı"""
+    records, stats = parse([b'{"title": "a"}\n{bozuk\n[1, 2]\n"metin"\n{"title": "b"}\n'])
+    assert [record["title"] for record in records] == ["a", "b"]
+    assert stats == {"lines": 5, "invalid": 3}
+
+def test_oversized_line():
+    """Sınırı aşan satır, nasıl parçalandığından bağımsız geçersiz sayılmalı; sonraki satırlar okunmalı"""
+    oversized = json.dumps({"title": "x" * (IMPORT_MAX_LINE_BYTES + 10)}).encode()
+    data = b'{"title": "a"}\n' + oversized + b'\n{"title": "b"}\n'
+    for size in (64 * 1024, 300 * 1024, len(data)):
+        chunks = [data[i:i + size] for i in range(0, len(data), size)]
+        records, stats = parse(chunks)
+        assert [record["title"] for record in records] == ["a", "b"], size
+        assert stats == {"lines": 3, "invalid": 1}, size
+
+    # Sonu satır sonu olmadan biten uzun satır
+    records, stats = parse([b'{"title": "a"}\n', oversized[:IMPORT_MAX_LINE_BYTES], oversized[IMPORT_MAX_LINE_BYTES:]])
+    assert [record["title"] for record in records] == ["a"]
+    assert stats == {"lines": 2, "invalid": 1}
+
+def main():
+    """Ana test fonksiyonu"""
+    for test in (test_split_chunks, test_invalid_lines, test_oversized_line):
+        test()
+        print(f"✅ {test.__doc__}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Koleksiyon önbelleği invalidation testleri
+"""
+
+from services.collection_cache import CollectionCache
+
+def make_cache() -> CollectionCache:
+    return CollectionCache(max_users=10, ttl_seconds=60)
+
+def fill(cache: CollectionCache, collection: str, user_id, documents):
+    documents_cached, token = cache.lookup(collection, user_id)
+    assert documents_cached is None
+    cache.store(collection, user_id, documents, token)
+
+def test_hit_returns_copy():
+    """Önbellekten okunan dokümanlar kopya olmalı"""
+    cache = make_cache()
+    fill(cache, "notes", "ali", [{"id": "n1", "title": "süt"}])
+    documents, _ = cache.lookup("notes", "ali")
+    documents[0]["title"] = "değişti"
+    assert cache.lookup("notes", "ali")[0] == [{"id": "n1", "title": "süt"}]
+    assert cache.hits == 2
+
+def test_invalidate_user():
+    """Yazma yalnızca o kullanıcının o koleksiyonunu ve tüm kullanıcılar sorgusunu düşürmeli"""
+    cache = make_cache()
+    fill(cache, "notes", "ali", [{"id": "n1"}])
+    fill(cache, "events", "ali", [{"id": "e1"}])
+    fill(cache, "notes", "ayşe", [{"id": "n2"}])
+    fill(cache, "notes", None, [{"id": "n1"}, {"id": "n2"}])
+    cache.invalidate_user("notes", "ali")
+    assert cache.lookup("notes", "ali")[0] is None
+    assert cache.lookup("notes", None)[0] is None
+    assert cache.lookup("events", "ali")[0] == [{"id": "e1"}]
+    assert cache.lookup("notes", "ayşe")[0] == [{"id": "n2"}]
+
+def test_invalidate_document():
+    """Sahibi bilinen doküman sahibini, bilinmeyen doküman tüm koleksiyonu düşürmeli"""
+    cache = make_cache()
+    fill(cache, "notes", "ali", [{"id": "n1"}])
+    fill(cache, "notes", "ayşe", [{"id": "n2"}])
+    cache.invalidate_document("notes", "n1")
+    assert cache.lookup("notes", "ali")[0] is None
+    assert cache.lookup("notes", "ayşe")[0] == [{"id": "n2"}]
+    assert cache.collection_invalidations == 0
+
+    cache.invalidate_document("notes", "bilinmeyen")
+    assert cache.lookup("notes", "ayşe")[0] is None
+    assert cache.collection_invalidations == 1
+
+def test_write_during_read():
+    """Okuma sürerken gelen yazma, eski sonucun önbelleğe yazılmasını engellemeli"""
+    cache = make_cache()
+    documents, token = cache.lookup("notes", "ali")
+    assert documents is None
+    cache.invalidate_user("notes", "ali")
+    cache.store("notes", "ali", [{"id": "eski"}], token)
+    assert cache.lookup("notes", "ali")[0] is None
+
+    documents, token = cache.lookup("notes", "ayşe")
+    cache.invalidate_document("notes", "bilinmeyen")
+    cache.store("notes", "ayşe", [{"id": "eski"}], token)
+    assert cache.lookup("notes", "ayşe")[0] is None
+
+def main():
+    """Ana test fonksiyonu"""
+    for test in (test_hit_returns_copy, test_invalidate_user, test_invalidate_document, test_write_during_read):
+        test()
+        print(f"✅ {test.__doc__}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Gazetteer yer adı çıkarma regresyon testleri
+"""
+
+from utils.gazetteer import gazetteer
+from utils.helpers import extract_entities_from_text
+
+# Yer adı içermeyen, ama ilçe adıyla çakışan kelimeler geçen mesajlar
+NO_PLACE_MESSAGES = [
+    "perşembe günü toplantı ekle",
+    "olur, yarın ara",
+    "Araç muayenesi için hatırlat",
+    "menemen tarifi",
+    "bodrum katı temizle",
+    "Fatih ile yemek",
+    "kas ağrısı",
+    "köşedeki kafede buluşalım",
+    "perşembe hava nasıl",
+]
+
+# Mesaj → (il, ilçe)
+PLACE_MESSAGES = {
+    "Perşembe İzmir'de hava nasıl olacak?": ("İzmir", None),
+    "Çarşamba Samsun'da yağmur var mı": ("Samsun", None),
+    "Kadıköy İstanbul hava durumu": ("İstanbul", "Kadıköy"),
+    "Bornova'da yarın hava": ("İzmir", "Bornova"),
+    "ankaranın havası nasıl": ("Ankara", None),
+    "Istanbul'da hava nasıl": ("İstanbul", None),
+    "mugla hava nasil": ("Muğla", None),
+    "kadikoy hava": ("İstanbul", "Kadıköy"),
+    "antep hava": ("Gaziantep", None),
+}
+
+def test_no_false_positives():
+    """Gün adı, cins isim ve kişi adı olan ilçeler eşleşmemeli"""
+    for message in NO_PLACE_MESSAGES:
+        entities = extract_entities_from_text(message)
+        assert "city" not in entities, f"{message!r} → {entities.get('city')}/{entities.get('district')}"
+        assert gazetteer.find(message) is None, message
+
+def test_places():
+    """İl ve ilçe doğru çözülmeli - il adı tek başına geçen ilçeden öncelikli"""
+    for message, (city, district) in PLACE_MESSAGES.items():
+        entities = extract_entities_from_text(message)
+        assert entities.get("city") == city, f"{message!r} → {entities.get('city')}"
+        assert entities.get("district") == district, f"{message!r} → {entities.get('district')}"
+
+def test_weather_query():
+    """Hava durumu sorgusu mesajda geçen ile gitmeli"""
+    place = gazetteer.find("Perşembe İzmir'de hava nasıl olacak?")
+    assert place.weather_query == "Izmir,TR"
+
+def main():
+    """Ana test fonksiyonu"""
+    for test in (test_no_false_positives, test_places, test_weather_query):
+        test()
+        print(f"✅ {test.__doc__}")
+
+if __name__ == "__main__":
+    main()
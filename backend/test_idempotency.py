@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Idempotency deposu testleri - tekrar ve devam eden isteğe katılma
+"""
+
+import asyncio
+
+from services.idempotency_service import IdempotencyStore
+
+def make_store() -> IdempotencyStore:
+    return IdempotencyStore(max_entries=2, ttl_seconds=60)
+
+def test_replay():
+    """Tamamlanan isteğin tekrarı yeniden hesaplanmadan saklanan sonucu döndürmeli"""
+    store = make_store()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return {"response": "tamam"}
+
+    async def scenario():
+        assert store.get("chat", "k1") == (False, None)
+        assert await store.run("chat", "k1", compute) == ({"response": "tamam"}, False)
+        assert await store.run("chat", "k1", compute) == ({"response": "tamam"}, True)
+        assert store.get("chat", "k1") == (True, {"response": "tamam"})
+        # Key kapsam başınadır
+        assert await store.run("audio", "k1", compute) == ({"response": "tamam"}, False)
+
+    asyncio.run(scenario())
+    assert len(calls) == 2
+    assert (store.hits, store.misses) == (2, 2)
+
+def test_join_in_flight():
+    """Aynı key ile eşzamanlı istekler ilk denemenin sonucunu beklemeli"""
+    store = make_store()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    async def scenario():
+        return await asyncio.gather(*(store.run("chat", "k1", compute) for _ in range(3)))
+
+    results = asyncio.run(scenario())
+    assert sorted(results) == [(1, False), (1, True), (1, True)]
+    assert len(calls) == 1
+    assert store.joined == 2
+    assert store.stats()["in_flight"] == 0
+
+def test_failure_not_stored():
+    """Hata saklanmamalı - bekleyenler hatayı almalı, sonraki deneme yeniden hesaplamalı"""
+    store = make_store()
+    attempts = []
+
+    async def compute():
+        attempts.append(1)
+        await asyncio.sleep(0.01)
+        if len(attempts) == 1:
+            raise RuntimeError("geçici hata")
+        return "tamam"
+
+    async def scenario():
+        first, joined = await asyncio.gather(store.run("chat", "k1", compute), store.run("chat", "k1", compute),
+                                             return_exceptions=True)
+        assert isinstance(first, RuntimeError) and isinstance(joined, RuntimeError)
+        assert store.get("chat", "k1") == (False, None)
+        assert await store.run("chat", "k1", compute) == ("tamam", False)
+
+    asyncio.run(scenario())
+    assert len(attempts) == 2
+
+def test_cancelled_first_attempt():
+    """İlk deneme iptal edilirse bekleyen istek hesaplamayı devralmalı"""
+    store = make_store()
+
+    async def compute():
+        await asyncio.sleep(0.05)
+        return "tamam"
+
+    async def scenario():
+        first = asyncio.create_task(store.run("chat", "k1", compute))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(store.run("chat", "k1", compute))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert await second == ("tamam", False)
+        assert first.cancelled()
+
+    asyncio.run(scenario())
+
+def test_bounded():
+    """Depo max_entries ile sınırlı olmalı - en eski sonuç düşer"""
+    store = make_store()
+
+    async def scenario():
+        for key in ("k1", "k2", "k3"):
+            await store.run("chat", key, lambda: asyncio.sleep(0, key))
+
+    asyncio.run(scenario())
+    assert store.get("chat", "k1") == (False, None)
+    assert store.get("chat", "k3") == (True, "k3")
+    assert store.stats()["entries"] == 2
+
+def main():
+    """Ana test fonksiyonu"""
+    for test in (test_replay, test_join_in_flight, test_failure_not_stored, test_cancelled_first_attempt, test_bounded):
+        test()
+        print(f"✅ {test.__doc__}")
+
+if __name__ == "__main__":
+    main()
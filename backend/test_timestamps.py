@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Timestamp dönüşüm testleri - saat dilimli ve dilimsiz girdi
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from utils.timestamps import from_timestamp, in_range, normalize_time_field, to_timestamp, utc_now
+
+ISTANBUL = timezone(timedelta(hours=3))
+
+def test_naive_is_utc():
+    """Saat dilimsiz girdi UTC kabul edilmeli"""
+    value = to_timestamp(datetime(2026, 5, 1, 10, 0))
+    assert value == datetime(2026, 5, 1, 10, 0, tzinfo=timezone.utc)
+    assert value.tzinfo is timezone.utc
+    assert to_timestamp("2026-05-01T10:00:00") == value
+
+def test_aware_converted_to_utc():
+    """Saat dilimli girdi aynı anı gösteren UTC'ye çevrilmeli"""
+    value = to_timestamp(datetime(2026, 5, 1, 13, 0, tzinfo=ISTANBUL))
+    assert value == datetime(2026, 5, 1, 10, 0, tzinfo=timezone.utc)
+    assert value.utcoffset() == timedelta(0)
+    assert to_timestamp("2026-05-01T13:00:00+03:00") == value
+    assert to_timestamp("2026-05-01T10:00:00Z") == value
+
+def test_round_trip():
+    """to_timestamp → from_timestamp aynı anı saat dilimli UTC olarak döndürmeli"""
+    for value in (datetime(2026, 5, 1, 10, 0, 30, 123456),
+                  datetime(2026, 5, 1, 13, 0, 30, 123456, tzinfo=ISTANBUL),
+                  "2026-05-01T10:00:30.123456"):
+        result = from_timestamp(to_timestamp(value))
+        assert result == datetime(2026, 5, 1, 10, 0, 30, 123456, tzinfo=timezone.utc), value
+        assert type(result) is datetime and result.tzinfo is timezone.utc
+    assert from_timestamp(None) is None
+    assert from_timestamp("") is None
+
+def test_comparable():
+    """Okunan değerler utc_now() ve sorgu sınırlarıyla TypeError olmadan karşılaştırılabilmeli"""
+    docs = [
+        normalize_time_field({"id": "old", "datetime": "2000-01-01T00:00:00"}, "datetime"),
+        normalize_time_field({"id": "local", "datetime": datetime(2026, 5, 1, 13, 0, tzinfo=ISTANBUL)}, "datetime"),
+        normalize_time_field({"id": "broken", "datetime": "yarın"}, "datetime"),
+    ]
+    assert docs[0]["datetime"] < utc_now()
+    assert docs[2]["datetime"] is None
+    start = to_timestamp(datetime(2026, 5, 1, 9, 0))
+    end = to_timestamp(datetime(2026, 5, 1, 11, 0))
+    assert [doc["id"] for doc in in_range(docs, "datetime", start, end)] == ["local"]
+
+def main():
+    """Ana test fonksiyonu"""
+    for test in (test_naive_is_utc, test_aware_converted_to_utc, test_round_trip, test_comparable):
+        test()
+        print(f"✅ {test.__doc__}")
+
+if __name__ == "__main__":
+    main()
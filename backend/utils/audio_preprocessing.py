@@ -0,0 +1,126 @@
+import audioop
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+# Recognizer'a gönderilen hedef format: 16 kHz mono 16-bit
+TARGET_SAMPLE_RATE = 16000
+
+def pcm_to_float(frames: bytes, sample_width: int) -> np.ndarray:
+    """PCM baytlarını [-1, 1] aralığında float32 diziye çevir"""
+    if sample_width == 3:
+        frames = audioop.lin2lin(frames, 3, 4)
+        sample_width = 4
+    if sample_width == 1:
+        # 8-bit WAV işaretsizdir
+        return (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    if sample_width == 2:
+        return np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
+    if sample_width == 4:
+        return np.frombuffer(frames, dtype=np.int32).astype(np.float32) / 2147483648.0
+    raise ValueError(f"Desteklenmeyen örnek genişliği: {sample_width}")
+
+def float_to_pcm16(samples: np.ndarray) -> bytes:
+    """float32 diziyi 16-bit PCM baytlarına çevir"""
+    return (np.clip(samples, -1.0, 1.0) * 32767.0).astype("<i2").tobytes()
+
+def lowpass(samples: np.ndarray, cutoff: float, taps: int = 63) -> np.ndarray:
+    """Pencereli sinc FIR alçak geçiren filtre (cutoff: Nyquist'e oranla 0-1)"""
+    n = np.arange(taps) - (taps - 1) / 2
+    kernel = cutoff * np.sinc(cutoff * n) * np.hamming(taps)
+    kernel /= kernel.sum()
+    return np.convolve(samples, kernel.astype(np.float32), mode="same")
+
+def resample(samples: np.ndarray, source_rate: int, target_rate: int = TARGET_SAMPLE_RATE) -> np.ndarray:
+    """Doğrusal interpolasyonla yeniden örnekle (küçültürken önce aliasing filtresi)"""
+    if source_rate == target_rate or len(samples) == 0:
+        return samples
+    if target_rate < source_rate:
+        samples = lowpass(samples, 0.9 * target_rate / source_rate)
+    length = int(round(len(samples) * target_rate / source_rate))
+    positions = np.arange(length, dtype=np.float64) * (source_rate / target_rate)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+def frame_rms(samples: np.ndarray, frame_length: int) -> np.ndarray:
+    """Çerçeve başına RMS enerji (son eksik çerçeve atılır)"""
+    frame_count = len(samples) // frame_length
+    if frame_count == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = samples[:frame_count * frame_length].reshape(frame_count, frame_length)
+    return np.sqrt(np.mean(frames * frames, axis=1))
+
+def estimate_noise_floor(rms: np.ndarray, percentile: float = 10.0) -> float:
+    """En sessiz çerçevelerden gürültü tabanı tahmini"""
+    if len(rms) == 0:
+        return 0.0
+    return float(np.percentile(rms, percentile))
+
+def trim_silence(samples: np.ndarray, sample_rate: int, frame_ms: int = 20, threshold_ratio: float = 3.0,
+                 min_threshold: float = 0.01, pad_ms: int = 150) -> Tuple[np.ndarray, float]:
+    """
+    Baştaki ve sondaki sessizliği kırp.
+    Eşik gürültü tabanı * threshold_ratio (tepe enerjinin %10'u ile sınırlı);
+    (kırpılmış ses, gürültü tabanı) döner.
+    Konuşma bulunamazsa boş dizi döner.
+    """
+    frame_length = max(1, sample_rate * frame_ms // 1000)
+    rms = frame_rms(samples, frame_length)
+    noise_floor = estimate_noise_floor(rms)
+    if len(rms) == 0:
+        return samples, noise_floor
+    # Sessizliği olmayan kliplerde taban yüksek çıkar - eşik tepe enerjiye göre sınırlanır
+    threshold = max(min_threshold, min(noise_floor * threshold_ratio, 0.1 * float(rms.max())))
+    voiced = np.flatnonzero(rms > threshold)
+    if len(voiced) == 0:
+        return samples[:0], noise_floor
+
+    pad = sample_rate * pad_ms // 1000
+    start = max(0, voiced[0] * frame_length - pad)
+    end = min(len(samples), (voiced[-1] + 1) * frame_length + pad)
+    return samples[start:end], noise_floor
+
+def preprocess_pcm(frames: bytes, sample_rate: int, sample_width: int,
+                   target_rate: int = TARGET_SAMPLE_RATE) -> Tuple[bytes, Dict[str, Any]]:
+    """
+    Mono PCM'i tanıma için hazırla: sessizlik kırpma + 16 kHz'e yeniden örnekleme.
+    (16-bit PCM, istatistikler) döndürür.
+    """
+    samples = pcm_to_float(frames, sample_width)
+    trimmed, noise_floor = trim_silence(samples, sample_rate)
+    resampled = resample(trimmed, sample_rate, target_rate)
+    pcm = float_to_pcm16(resampled)
+    return pcm, {
+        "input_bytes": len(frames),
+        "output_bytes": len(pcm),
+        "input_seconds": round(len(samples) / sample_rate, 3) if sample_rate else 0.0,
+        "output_seconds": round(len(resampled) / target_rate, 3),
+        "noise_floor": round(noise_floor, 5)
+    }
+
+def split_at_silence(frames: bytes, sample_rate: int, sample_width: int, max_seconds: float,
+                     min_seconds: float = 5.0, frame_ms: int = 20) -> List[Tuple[int, int]]:
+    """
+    Uzun sesi en fazla max_seconds uzunluğunda parçalara böl.
+    Her kesim [min_seconds, max_seconds] aralığındaki en sessiz çerçeveden yapılır;
+    kelimeler ortadan bölünmez. (başlangıç, bitiş) örnek indeksleri döner.
+    """
+    samples = pcm_to_float(frames, sample_width)
+    total = len(samples)
+    max_length = int(max_seconds * sample_rate)
+    if total <= max_length:
+        return [(0, total)] if total else []
+
+    frame_length = max(1, sample_rate * frame_ms // 1000)
+    rms = frame_rms(samples, frame_length)
+    min_frames = int(min_seconds * sample_rate) // frame_length
+    max_frames = max_length // frame_length
+
+    ranges = []
+    start_frame = 0
+    while (len(samples) - start_frame * frame_length) > max_length:
+        window = rms[start_frame + min_frames:start_frame + max_frames]
+        cut_frame = start_frame + min_frames + int(np.argmin(window)) if len(window) else start_frame + max_frames
+        ranges.append((start_frame * frame_length, cut_frame * frame_length))
+        start_frame = cut_frame
+    ranges.append((start_frame * frame_length, total))
+    return ranges
@@ -0,0 +1,300 @@
+"""
+Türkiye il/ilçe gazetteer'ı - token trie ile tek geçişte yer adı çıkarma
+"""
+
+import re
+from typing import Optional, Dict, Any, List, NamedTuple, Tuple
+
+# 81 il ve ilçeleri (merkez ilçeler il adıyla aynı olduğundan listelenmez)
+TURKEY_PROVINCES: Dict[str, List[str]] = {
+    "Adana": ["Aladağ", "Ceyhan", "Çukurova", "Feke", "İmamoğlu", "Karaisalı", "Karataş", "Kozan", "Pozantı", "Saimbeyli", "Sarıçam", "Seyhan", "Tufanbeyli", "Yumurtalık", "Yüreğir"],
+    "Adıyaman": ["Besni", "Çelikhan", "Gerger", "Gölbaşı", "Kahta", "Samsat", "Sincik", "Tut"],
+    "Afyonkarahisar": ["Başmakçı", "Bayat", "Bolvadin", "Çay", "Çobanlar", "Dazkırı", "Dinar", "Emirdağ", "Evciler", "Hocalar", "İhsaniye", "İscehisar", "Kızılören", "Sandıklı", "Sinanpaşa", "Sultandağı", "Şuhut"],
+    "Ağrı": ["Diyadin", "Doğubayazıt", "Eleşkirt", "Hamur", "Patnos", "Taşlıçay", "Tutak"],
+    "Amasya": ["Göynücek", "Gümüşhacıköy", "Hamamözü", "Merzifon", "Suluova", "Taşova"],
+    "Ankara": ["Akyurt", "Altındağ", "Ayaş", "Bala", "Beypazarı", "Çamlıdere", "Çankaya", "Çubuk", "Elmadağ", "Etimesgut", "Evren", "Gölbaşı", "Güdül", "Haymana", "Kahramankazan", "Kalecik", "Keçiören", "Kızılcahamam", "Mamak", "Nallıhan", "Polatlı", "Pursaklar", "Sincan", "Şereflikoçhisar", "Yenimahalle"],
+    "Antalya": ["Akseki", "Aksu", "Alanya", "Demre", "Döşemealtı", "Elmalı", "Finike", "Gazipaşa", "Gündoğmuş", "İbradı", "Kaş", "Kemer", "Kepez", "Konyaaltı", "Korkuteli", "Kumluca", "Manavgat", "Muratpaşa", "Serik"],
+    "Artvin": ["Ardanuç", "Arhavi", "Borçka", "Hopa", "Kemalpaşa", "Murgul", "Şavşat", "Yusufeli"],
+    "Aydın": ["Bozdoğan", "Buharkent", "Çine", "Didim", "Efeler", "Germencik", "İncirliova", "Karacasu", "Karpuzlu", "Koçarlı", "Köşk", "Kuşadası", "Kuyucak", "Nazilli", "Söke", "Sultanhisar", "Yenipazar"],
+    "Balıkesir": ["Altıeylül", "Ayvalık", "Balya", "Bandırma", "Bigadiç", "Burhaniye", "Dursunbey", "Edremit", "Erdek", "Gömeç", "Gönen", "Havran", "İvrindi", "Karesi", "Kepsut", "Manyas", "Marmara", "Savaştepe", "Sındırgı", "Susurluk"],
+    "Bilecik": ["Bozüyük", "Gölpazarı", "İnhisar", "Osmaneli", "Pazaryeri", "Söğüt", "Yenipazar"],
+    "Bingöl": ["Adaklı", "Genç", "Karlıova", "Kiğı", "Solhan", "Yayladere", "Yedisu"],
+    "Bitlis": ["Adilcevaz", "Ahlat", "Güroymak", "Hizan", "Mutki", "Tatvan"],
+    "Bolu": ["Dörtdivan", "Gerede", "Göynük", "Kıbrıscık", "Mengen", "Mudurnu", "Seben", "Yeniçağa"],
+    "Burdur": ["Ağlasun", "Altınyayla", "Bucak", "Çavdır", "Çeltikçi", "Gölhisar", "Karamanlı", "Kemer", "Tefenni", "Yeşilova"],
+    "Bursa": ["Büyükorhan", "Gemlik", "Gürsu", "Harmancık", "İnegöl", "İznik", "Karacabey", "Keles", "Kestel", "Mudanya", "Mustafakemalpaşa", "Nilüfer", "Orhaneli", "Orhangazi", "Osmangazi", "Yenişehir", "Yıldırım"],
+    "Çanakkale": ["Ayvacık", "Bayramiç", "Biga", "Bozcaada", "Çan", "Eceabat", "Ezine", "Gelibolu", "Gökçeada", "Lapseki", "Yenice"],
+    "Çankırı": ["Atkaracalar", "Bayramören", "Çerkeş", "Eldivan", "Ilgaz", "Kızılırmak", "Korgun", "Kurşunlu", "Orta", "Şabanözü", "Yapraklı"],
+    "Çorum": ["Alaca", "Bayat", "Boğazkale", "Dodurga", "İskilip", "Kargı", "Laçin", "Mecitözü", "Oğuzlar", "Ortaköy", "Osmancık", "Sungurlu", "Uğurludağ"],
+    "Denizli": ["Acıpayam", "Babadağ", "Baklan", "Bekilli", "Beyağaç", "Bozkurt", "Buldan", "Çal", "Çameli", "Çardak", "Çivril", "Güney", "Honaz", "Kale", "Merkezefendi", "Pamukkale", "Sarayköy", "Serinhisar", "Tavas"],
+    "Diyarbakır": ["Bağlar", "Bismil", "Çermik", "Çınar", "Çüngüş", "Dicle", "Eğil", "Ergani", "Hani", "Hazro", "Kayapınar", "Kocaköy", "Kulp", "Lice", "Silvan", "Sur", "Yenişehir"],
+    "Edirne": ["Enez", "Havsa", "İpsala", "Keşan", "Lalapaşa", "Meriç", "Süloğlu", "Uzunköprü"],
+    "Elazığ": ["Ağın", "Alacakaya", "Arıcak", "Baskil", "Karakoçan", "Keban", "Kovancılar", "Maden", "Palu", "Sivrice"],
+    "Erzincan": ["Çayırlı", "İliç", "Kemah", "Kemaliye", "Otlukbeli", "Refahiye", "Tercan", "Üzümlü"],
+    "Erzurum": ["Aşkale", "Aziziye", "Çat", "Hınıs", "Horasan", "İspir", "Karaçoban", "Karayazı", "Köprüköy", "Narman", "Oltu", "Olur", "Palandöken", "Pasinler", "Pazaryolu", "Şenkaya", "Tekman", "Tortum", "Uzundere", "Yakutiye"],
+    "Eskişehir": ["Alpu", "Beylikova", "Çifteler", "Günyüzü", "Han", "İnönü", "Mahmudiye", "Mihalgazi", "Mihalıççık", "Odunpazarı", "Sarıcakaya", "Seyitgazi", "Sivrihisar", "Tepebaşı"],
+    "Gaziantep": ["Araban", "İslahiye", "Karkamış", "Nizip", "Nurdağı", "Oğuzeli", "Şahinbey", "Şehitkamil", "Yavuzeli"],
+    "Giresun": ["Alucra", "Bulancak", "Çamoluk", "Çanakçı", "Dereli", "Doğankent", "Espiye", "Eynesil", "Görele", "Güce", "Keşap", "Piraziz", "Şebinkarahisar", "Tirebolu", "Yağlıdere"],
+    "Gümüşhane": ["Kelkit", "Köse", "Kürtün", "Şiran", "Torul"],
+    "Hakkari": ["Çukurca", "Derecik", "Şemdinli", "Yüksekova"],
+    "Hatay": ["Altınözü", "Antakya", "Arsuz", "Belen", "Defne", "Dörtyol", "Erzin", "Hassa", "İskenderun", "Kırıkhan", "Kumlu", "Payas", "Reyhanlı", "Samandağ", "Yayladağı"],
+    "Isparta": ["Aksu", "Atabey", "Eğirdir", "Gelendost", "Gönen", "Keçiborlu", "Senirkent", "Sütçüler", "Şarkikaraağaç", "Uluborlu", "Yalvaç", "Yenişarbademli"],
+    "Mersin": ["Akdeniz", "Anamur", "Aydıncık", "Bozyazı", "Çamlıyayla", "Erdemli", "Gülnar", "Mezitli", "Mut", "Silifke", "Tarsus", "Toroslar", "Yenişehir"],
+    "İstanbul": ["Adalar", "Arnavutköy", "Ataşehir", "Avcılar", "Bağcılar", "Bahçelievler", "Bakırköy", "Başakşehir", "Bayrampaşa", "Beşiktaş", "Beykoz", "Beylikdüzü", "Beyoğlu", "Büyükçekmece", "Çatalca", "Çekmeköy", "Esenler", "Esenyurt", "Eyüpsultan", "Fatih", "Gaziosmanpaşa", "Güngören", "Kadıköy", "Kağıthane", "Kartal", "Küçükçekmece", "Maltepe", "Pendik", "Sancaktepe", "Sarıyer", "Silivri", "Sultanbeyli", "Sultangazi", "Şile", "Şişli", "Tuzla", "Ümraniye", "Üsküdar", "Zeytinburnu"],
+    "İzmir": ["Aliağa", "Balçova", "Bayındır", "Bayraklı", "Bergama", "Beydağ", "Bornova", "Buca", "Çeşme", "Çiğli", "Dikili", "Foça", "Gaziemir", "Güzelbahçe", "Karabağlar", "Karaburun", "Karşıyaka", "Kemalpaşa", "Kınık", "Kiraz", "Konak", "Menderes", "Menemen", "Narlıdere", "Ödemiş", "Seferihisar", "Selçuk", "Tire", "Torbalı", "Urla"],
+    "Kars": ["Akyaka", "Arpaçay", "Digor", "Kağızman", "Sarıkamış", "Selim", "Susuz"],
+    "Kastamonu": ["Abana", "Ağlı", "Araç", "Azdavay", "Bozkurt", "Cide", "Çatalzeytin", "Daday", "Devrekani", "Doğanyurt", "Hanönü", "İhsangazi", "İnebolu", "Küre", "Pınarbaşı", "Seydiler", "Şenpazar", "Taşköprü", "Tosya"],
+    "Kayseri": ["Akkışla", "Bünyan", "Develi", "Felahiye", "Hacılar", "İncesu", "Kocasinan", "Melikgazi", "Özvatan", "Pınarbaşı", "Sarıoğlan", "Sarız", "Talas", "Tomarza", "Yahyalı", "Yeşilhisar"],
+    "Kırklareli": ["Babaeski", "Demirköy", "Kofçaz", "Lüleburgaz", "Pehlivanköy", "Pınarhisar", "Vize"],
+    "Kırşehir": ["Akçakent", "Akpınar", "Boztepe", "Çiçekdağı", "Kaman", "Mucur"],
+    "Kocaeli": ["Başiskele", "Çayırova", "Darıca", "Derince", "Dilovası", "Gebze", "Gölcük", "İzmit", "Kandıra", "Karamürsel", "Kartepe", "Körfez"],
+    "Konya": ["Ahırlı", "Akören", "Akşehir", "Altınekin", "Beyşehir", "Bozkır", "Cihanbeyli", "Çeltik", "Çumra", "Derbent", "Derebucak", "Doğanhisar", "Emirgazi", "Ereğli", "Güneysınır", "Hadim", "Halkapınar", "Hüyük", "Ilgın", "Kadınhanı", "Karapınar", "Karatay", "Kulu", "Meram", "Sarayönü", "Selçuklu", "Seydişehir", "Taşkent", "Tuzlukçu", "Yalıhüyük", "Yunak"],
+    "Kütahya": ["Altıntaş", "Aslanapa", "Çavdarhisar", "Domaniç", "Dumlupınar", "Emet", "Gediz", "Hisarcık", "Pazarlar", "Simav", "Şaphane", "Tavşanlı"],
+    "Malatya": ["Akçadağ", "Arapgir", "Arguvan", "Battalgazi", "Darende", "Doğanşehir", "Doğanyol", "Hekimhan", "Kale", "Kuluncak", "Pütürge", "Yazıhan", "Yeşilyurt"],
+    "Manisa": ["Ahmetli", "Akhisar", "Alaşehir", "Demirci", "Gölmarmara", "Gördes", "Kırkağaç", "Köprübaşı", "Kula", "Salihli", "Sarıgöl", "Saruhanlı", "Selendi", "Soma", "Şehzadeler", "Turgutlu", "Yunusemre"],
+    "Kahramanmaraş": ["Afşin", "Andırın", "Çağlayancerit", "Dulkadiroğlu", "Ekinözü", "Elbistan", "Göksun", "Nurhak", "Onikişubat", "Pazarcık", "Türkoğlu"],
+    "Mardin": ["Artuklu", "Dargeçit", "Derik", "Kızıltepe", "Mazıdağı", "Midyat", "Nusaybin", "Ömerli", "Savur", "Yeşilli"],
+    "Muğla": ["Bodrum", "Dalaman", "Datça", "Fethiye", "Kavaklıdere", "Köyceğiz", "Marmaris", "Menteşe", "Milas", "Ortaca", "Seydikemer", "Ula", "Yatağan"],
+    "Muş": ["Bulanık", "Hasköy", "Korkut", "Malazgirt", "Varto"],
+    "Nevşehir": ["Acıgöl", "Avanos", "Derinkuyu", "Gülşehir", "Hacıbektaş", "Kozaklı", "Ürgüp"],
+    "Niğde": ["Altunhisar", "Bor", "Çamardı", "Çiftlik", "Ulukışla"],
+    "Ordu": ["Akkuş", "Altınordu", "Aybastı", "Çamaş", "Çatalpınar", "Çaybaşı", "Fatsa", "Gölköy", "Gülyalı", "Gürgentepe", "İkizce", "Kabadüz", "Kabataş", "Korgan", "Kumru", "Mesudiye", "Perşembe", "Ulubey", "Ünye"],
+    "Rize": ["Ardeşen", "Çamlıhemşin", "Çayeli", "Derepazarı", "Fındıklı", "Güneysu", "Hemşin", "İkizdere", "İyidere", "Kalkandere", "Pazar"],
+    "Sakarya": ["Adapazarı", "Akyazı", "Arifiye", "Erenler", "Ferizli", "Geyve", "Hendek", "Karapürçek", "Karasu", "Kaynarca", "Kocaali", "Pamukova", "Sapanca", "Serdivan", "Söğütlü", "Taraklı"],
+    "Samsun": ["Alaçam", "Asarcık", "Atakum", "Ayvacık", "Bafra", "Canik", "Çarşamba", "Havza", "İlkadım", "Kavak", "Ladik", "Ondokuzmayıs", "Salıpazarı", "Tekkeköy", "Terme", "Vezirköprü", "Yakakent"],
+    "Siirt": ["Baykan", "Eruh", "Kurtalan", "Pervari", "Şirvan", "Tillo"],
+    "Sinop": ["Ayancık", "Boyabat", "Dikmen", "Durağan", "Erfelek", "Gerze", "Saraydüzü", "Türkeli"],
+    "Sivas": ["Akıncılar", "Altınyayla", "Divriği", "Doğanşar", "Gemerek", "Gölova", "Gürün", "Hafik", "İmranlı", "Kangal", "Koyulhisar", "Suşehri", "Şarkışla", "Ulaş", "Yıldızeli", "Zara"],
+    "Tekirdağ": ["Çerkezköy", "Çorlu", "Ergene", "Hayrabolu", "Kapaklı", "Malkara", "Marmaraereğlisi", "Muratlı", "Saray", "Süleymanpaşa", "Şarköy"],
+    "Tokat": ["Almus", "Artova", "Başçiftlik", "Erbaa", "Niksar", "Pazar", "Reşadiye", "Sulusaray", "Turhal", "Yeşilyurt", "Zile"],
+    "Trabzon": ["Akçaabat", "Araklı", "Arsin", "Beşikdüzü", "Çarşıbaşı", "Çaykara", "Dernekpazarı", "Düzköy", "Hayrat", "Köprübaşı", "Maçka", "Of", "Ortahisar", "Şalpazarı", "Sürmene", "Tonya", "Vakfıkebir", "Yomra"],
+    "Tunceli": ["Çemişgezek", "Hozat", "Mazgirt", "Nazımiye", "Ovacık", "Pertek", "Pülümür"],
+    "Şanlıurfa": ["Akçakale", "Birecik", "Bozova", "Ceylanpınar", "Eyyübiye", "Halfeti", "Haliliye", "Harran", "Hilvan", "Karaköprü", "Siverek", "Suruç", "Viranşehir"],
+    "Uşak": ["Banaz", "Eşme", "Karahallı", "Sivaslı", "Ulubey"],
+    "Van": ["Bahçesaray", "Başkale", "Çaldıran", "Çatak", "Edremit", "Erciş", "Gevaş", "Gürpınar", "İpekyolu", "Muradiye", "Özalp", "Saray", "Tuşba"],
+    "Yozgat": ["Akdağmadeni", "Aydıncık", "Boğazlıyan", "Çandır", "Çayıralan", "Çekerek", "Kadışehri", "Saraykent", "Sarıkaya", "Sorgun", "Şefaatli", "Yenifakılı", "Yerköy"],
+    "Zonguldak": ["Alaplı", "Çaycuma", "Devrek", "Ereğli", "Gökçebey", "Kilimli", "Kozlu"],
+    "Aksaray": ["Ağaçören", "Eskil", "Gülağaç", "Güzelyurt", "Ortaköy", "Sarıyahşi", "Sultanhanı"],
+    "Bayburt": ["Aydıntepe", "Demirözü"],
+    "Karaman": ["Ayrancı", "Başyayla", "Ermenek", "Kazımkarabekir", "Sarıveliler"],
+    "Kırıkkale": ["Bahşılı", "Balışeyh", "Çelebi", "Delice", "Karakeçili", "Keskin", "Sulakyurt", "Yahşihan"],
+    "Batman": ["Beşiri", "Gercüş", "Hasankeyf", "Kozluk", "Sason"],
+    "Şırnak": ["Beytüşşebap", "Cizre", "Güçlükonak", "İdil", "Silopi", "Uludere"],
+    "Bartın": ["Amasra", "Kurucaşile", "Ulus"],
+    "Ardahan": ["Çıldır", "Damal", "Göle", "Hanak", "Posof"],
+    "Iğdır": ["Aralık", "Karakoyunlu", "Tuzluca"],
+    "Yalova": ["Altınova", "Armutlu", "Çınarcık", "Çiftlikköy", "Termal"],
+    "Karabük": ["Eflani", "Eskipazar", "Ovacık", "Safranbolu", "Yenice"],
+    "Kilis": ["Elbeyli", "Musabeyli", "Polateli"],
+    "Osmaniye": ["Bahçe", "Düziçi", "Hasanbeyli", "Kadirli", "Sumbas", "Toprakkale"],
+    "Düzce": ["Akçakoca", "Cumayeri", "Çilimli", "Gölyaka", "Gümüşova", "Kaynaşlı", "Yığılca"],
+}
+
+# Halk arasında kullanılan kısa/eski il adları
+PROVINCE_ALIASES: Dict[str, str] = {
+    "Antep": "Gaziantep",
+    "Maraş": "Kahramanmaraş",
+    "Urfa": "Şanlıurfa",
+    "Afyon": "Afyonkarahisar",
+    "İçel": "Mersin",
+}
+
+# Günlük dilde sık geçen kelimelerle (gün adları, cins isimler, kişi adları) çakışan
+# ilçe adları - yanlış eşleşmeyi önlemek için atlanır
+AMBIGUOUS_DISTRICTS = {
+    # Gün ve ay adları
+    "Aralık", "Çarşamba", "Pazar", "Perşembe",
+    # Cins isim, sıfat ve fiil çekimleri
+    "Adalar", "Akdeniz", "Aksu", "Araban", "Araç", "Armutlu", "Bağlar", "Bahçe", "Bala",
+    "Balya", "Bayat", "Bodrum", "Bor", "Bozkır", "Bulanık", "Bünyan", "Çal", "Çan", "Çat",
+    "Çay", "Çeltik", "Çeşme", "Çiftlik", "Çobanlar", "Çubuk", "Delice", "Derince", "Dikili",
+    "Dinar", "Eğil", "Elmalı", "Fındıklı", "Göle", "Güce", "Güney", "Hacılar", "Hamur",
+    "Han", "Hani", "Havza", "Hendek", "Hocalar", "Kale", "Kangal", "Kartal", "Kaş", "Kavak",
+    "Kemer", "Keskin", "Kiraz", "Konak", "Körfez", "Köşk", "Kula", "Kulp", "Kulu", "Kumlu",
+    "Küre", "Maden", "Marmara", "Menemen", "Meram", "Mut", "Of", "Olur", "Orta", "Ovacık",
+    "Saray", "Savur", "Sur", "Susuz", "Taşkent", "Termal", "Tire", "Tut", "Tuzla", "Ula",
+    "Ulus", "Vize", "Yenice", "Yıldırım", "Zara", "Zile",
+    # Kişi adları ve soyadları
+    "Baykan", "Belen", "Bozkurt", "Çelebi", "Çınar", "Defne", "Demirci", "Dicle", "Evren",
+    "Fatih", "Genç", "İdil", "Ilgın", "İnönü", "Korkut", "Kumru", "Menderes", "Nilüfer",
+    "Özalp", "Selçuk", "Selim", "Ulaş",
+}
+
+# İsim hal ve iyelik ekleri - ASCII'ye indirgenmiş (kesme işareti olmadan yazıldığında ayıklanır)
+TURKISH_SUFFIXES = sorted({
+    "da", "de", "ta", "te", "dan", "den", "tan", "ten",
+    "daki", "deki", "taki", "teki",
+    "a", "e", "ya", "ye", "i", "u", "yi", "yu",
+    "in", "un", "nin", "nun", "yla", "yle", "la", "le",
+    "li", "lu", "liler", "lular", "lilar",
+}, key=len, reverse=True)
+
+_TURKISH_CHARS = "çğıöşüâîû"
+_ASCII_FOLD = str.maketrans(_TURKISH_CHARS, "cgiosuaiu")
+_TOKEN_RE = re.compile(r"[a-zçğıöşüâîû0-9]+(?:'[a-zçğıöşüâîû]+)?")
+
+def turkish_lower(text: str) -> str:
+    """Türkçe kurallara göre küçük harfe çevir (I→ı, İ→i)"""
+    return text.replace("I", "ı").replace("İ", "i").lower()
+
+def fold(text: str) -> str:
+    """Türkçe karakterleri ASCII karşılıklarına indir"""
+    return turkish_lower(text).translate(_ASCII_FOLD)
+
+def has_turkish_chars(text: str) -> bool:
+    """Metin Türkçe karakterlerle mi yazılmış (ş, ğ, ı, ...) - büyük I sayılmaz"""
+    return any(ch in _TURKISH_CHARS for ch in turkish_lower(text.replace("I", "i")))
+
+def tokenize(text: str, folded: bool = True) -> List[str]:
+    """Metni normalize edilmiş token'lara ayır - kesme işaretli ekler ayrılır"""
+    text = turkish_lower(text).replace("’", "'").replace("`", "'")
+    tokens = []
+    for match in _TOKEN_RE.finditer(text):
+        token = match.group(0).split("'", 1)[0]
+        tokens.append(token.translate(_ASCII_FOLD) if folded else token)
+    return tokens
+
+class Place(NamedTuple):
+    name: str
+    province: str
+    kind: str  # "province" veya "district"
+
+    @property
+    def ascii_name(self) -> str:
+        """Hava durumu API'si için ASCII isim (İzmir → Izmir)"""
+        return self.name.replace("İ", "I").translate(str.maketrans("çğıöşüÇĞÖŞÜ", "cgiosuCGOSU"))
+
+    @property
+    def weather_query(self) -> str:
+        """OpenWeatherMap sorgu metni"""
+        return f"{self.ascii_name},TR"
+
+class Gazetteer:
+    """Token trie tabanlı yer adı eşleştirici"""
+
+    _END = "$"
+
+    def __init__(self, provinces: Dict[str, List[str]], aliases: Dict[str, str] = None,
+                 skip_districts: set = None):
+        # Yazıldığı gibi (Türkçe karakterli) ve ASCII'ye indirgenmiş token'lar için ayrı trie'ler
+        self._exact: Dict[str, Any] = {}
+        self._folded: Dict[str, Any] = {}
+        self.provinces = {}
+        skip = {fold(name) for name in (skip_districts or set())}
+
+        for province, districts in provinces.items():
+            place = Place(province, province, "province")
+            self.provinces[fold(province)] = place
+            self._insert(province, place)
+            for district in districts:
+                if fold(district) in skip:
+                    continue
+                self._insert(district, Place(district, province, "district"))
+
+        for alias, province in (aliases or {}).items():
+            self._insert(alias, self.provinces[fold(province)])
+
+    def _insert(self, name: str, place: Place):
+        for root, folded in ((self._exact, False), (self._folded, True)):
+            node = root
+            for token in tokenize(name, folded=folded):
+                node = node.setdefault(token, {})
+            candidates = node.setdefault(self._END, [])
+            # İl her zaman aynı isimli ilçeden önce gelir
+            if place.kind == "province":
+                candidates.insert(0, place)
+            elif place not in candidates:
+                candidates.append(place)
+
+    def _match_suffixed(self, node: Dict[str, Any], token: str) -> Optional[Dict[str, Any]]:
+        """Ekli yazılmış token için ek ayıklayarak eşleşen düğümü bul ("izmirde" → izmir)"""
+        # Ekler ASCII yazıldığından karşılaştırma indirgenmiş token üzerinde yapılır ("ankaranın")
+        folded = token.translate(_ASCII_FOLD)
+        for suffix in TURKISH_SUFFIXES:
+            if folded.endswith(suffix) and len(token) - len(suffix) >= 3:
+                child = node.get(token[:-len(suffix)])
+                if child is not None and self._END in child:
+                    return child
+        return None
+
+    def _longest_match(self, root: Dict[str, Any], tokens: List[str], i: int) -> Optional[Tuple[int, List[Place]]]:
+        """i. token'dan başlayan en uzun eşleşmeyi bul"""
+        node = root
+        best = None
+        j = i
+        while j < len(tokens):
+            child = node.get(tokens[j])
+            if child is None:
+                # Ek almış son token olabilir
+                child = self._match_suffixed(node, tokens[j])
+                if child is not None:
+                    best = (j + 1, child[self._END])
+                break
+            node = child
+            j += 1
+            if self._END in node:
+                best = (j, node[self._END])
+        return best
+
+    def _scan(self, text: str) -> List[List[Place]]:
+        """Token'lar üzerinde tek geçişte en uzun eşleşmeleri bul
+
+        Önce yazıldığı gibi eşleştirilir. ASCII'ye indirgenmiş eşleşme yalnızca mesaj
+        Türkçe karakter kullanmadan yazılmışsa denenir; aksi halde "kas" → Kaş,
+        "köşe" → Köse gibi farklı kelimeler çakışırdı.
+        """
+        exact = tokenize(text, folded=False)
+        # İngilizce klavyede "Istanbul", "Izmir" yazılır - büyük I noktalı i olarak da denenir
+        dotted = tokenize(text.replace("I", "i"), folded=False) if "I" in text else None
+        folded = None if has_turkish_chars(text) else tokenize(text)
+        matches = []
+        i = 0
+        while i < len(exact):
+            best = self._longest_match(self._exact, exact, i)
+            if best is None and dotted is not None:
+                best = self._longest_match(self._exact, dotted, i)
+            if best is None and folded is not None:
+                best = self._longest_match(self._folded, folded, i)
+            if best:
+                matches.append(best[1])
+                i = best[0]
+            else:
+                i += 1
+        return matches
+
+    def find_all(self, text: str) -> List[Place]:
+        """Metindeki tüm yer adlarını sırayla döndür"""
+        if not text:
+            return []
+        matches = self._scan(text)
+        mentioned = {c[0].province for c in matches if c[0].kind == "province"}
+
+        places = []
+        for candidates in matches:
+            # Aynı isimli ilçelerde mesajda geçen ili tercih et
+            chosen = next((p for p in candidates if p.province in mentioned and p.kind == "district"), candidates[0])
+            places.append(chosen)
+        return places
+
+    def find(self, text: str) -> Optional[Place]:
+        """Metindeki en belirgin yer adını döndür
+
+        Öncelik: mesajda geçen ile ait ilçe > il > tek başına geçen ilçe.
+        """
+        places = self.find_all(text)
+        if not places:
+            return None
+        provinces = [p for p in places if p.kind == "province"]
+        mentioned = {p.province for p in provinces}
+        for place in places:
+            if place.kind == "district" and place.province in mentioned:
+                return place
+        return provinces[0] if provinces else places[0]
+
+    def lookup(self, name: str) -> Optional[Place]:
+        """Tek bir yer adını çöz ("izmir'de" → İzmir)"""
+        places = self.find_all(name)
+        return places[0] if places else None
+
+# Global gazetteer instance
+gazetteer = Gazetteer(TURKEY_PROVINCES, PROVINCE_ALIASES, AMBIGUOUS_DISTRICTS)
@@ -2,6 +2,7 @@ from datetime import datetime, timezone
 from typing import Optional, Dict, Any
 import re
 import uuid
+from utils.gazetteer import gazetteer
 
 def generate_unique_id() -> str:
     """Benzersiz ID üret"""
@@ -69,12 +70,12 @@ def extract_entities_from_text(text: str) -> Dict[str, Any]:
             entities['times'] = matches
             break
     
-    # Şehir isimleri (basit liste)
-    cities = ['istanbul', 'ankara', 'izmir', 'bursa', 'antalya', 'adana', 'konya', 'gaziantep']
-    for city in cities:
-        if city in text.lower():
-            entities['city'] = city.title()
-            break
+    # Şehir/ilçe isimleri (81 il gazetteer'ı)
+    place = gazetteer.find(text)
+    if place:
+        entities['city'] = place.province
+        if place.kind == "district":
+            entities['district'] = place.name
     
     return entities
 
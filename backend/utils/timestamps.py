@@ -0,0 +1,60 @@
+"""
+Etkinlik ve hatırlatıcı zamanları için Firestore Timestamp dönüşümleri.
+
+Tek konvansiyon: saat dilimli UTC. Saat dilimsiz girdi UTC kabul edilir, saat dilimli girdi
+UTC'ye çevrilir; yazılan ve okunan değerler, sorgu sınırları ve `utc_now()` aynı türdedir, böylece
+karşılaştırmalar sunucunun saat diliminden bağımsızdır.
+Eski dokümanlardaki ISO string değerler de okunabilir (bkz. migrate_timestamps.py).
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+# Koleksiyon -> Timestamp olarak saklanan zaman alanı
+TIME_FIELDS = {
+    'events': 'datetime',
+    'reminders': 'reminder_time'
+}
+
+def utc_now() -> datetime:
+    """Şu an (saat dilimli UTC) - saklanan zamanlarla karşılaştırmak için"""
+    return datetime.now(timezone.utc)
+
+def to_timestamp(value: Union[str, datetime]) -> datetime:
+    """ISO string veya datetime'ı saat dilimli UTC datetime'a çevir (saat dilimsiz girdi UTC kabul edilir)"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+def from_timestamp(value: Any) -> Optional[datetime]:
+    """Firestore'dan okunan Timestamp'i (veya eski ISO string'i) saat dilimli UTC datetime'a çevir"""
+    if value is None or value == "":
+        return None
+    value = to_timestamp(value)
+    # DatetimeWithNanoseconds yerine düz datetime
+    return datetime(value.year, value.month, value.day, value.hour, value.minute,
+                    value.second, value.microsecond, tzinfo=timezone.utc)
+
+def normalize_time_field(data: Dict[str, Any], field: str) -> Dict[str, Any]:
+    """Doküman verisindeki zaman alanını saat dilimli UTC datetime yap"""
+    if field in data:
+        try:
+            data[field] = from_timestamp(data[field])
+        except (TypeError, ValueError):
+            # Bozuk değer okumayı engellemez
+            data[field] = None
+    return data
+
+def in_range(documents: Iterable[Dict[str, Any]], field: str, start: datetime = None,
+             end: datetime = None) -> List[Dict[str, Any]]:
+    """Önbellekten/aynadan okunan dokümanlara zaman aralığını uygula (start <= alan <= end)"""
+    if start is None and end is None:
+        return list(documents)
+    return [
+        doc for doc in documents
+        if doc.get(field) is not None
+        and (start is None or doc[field] >= start)
+        and (end is None or doc[field] <= end)
+    ]
@@ -0,0 +1,105 @@
+import audioop
+from collections import deque
+from typing import List, Optional
+
+class EnergyVAD:
+    """
+    Enerji tabanlı ses aktivitesi algılama (16-bit mono PCM).
+    Gelen PCM parçalarını çerçevelere böler; konuşma başlayınca segment açar,
+    yeterince uzun sessizlikte veya en fazla uzunlukta segmenti kapatır.
+    Eşik, konuşma olmayan çerçevelerden hesaplanan gürültü tabanına göre uyarlanır.
+    """
+
+    def __init__(self, sample_rate: int = 16000, frame_ms: int = 30, silence_ms: int = 600,
+                 min_speech_ms: int = 200, max_segment_ms: int = 15000, pre_roll_ms: int = 200,
+                 threshold_ratio: float = 3.0, min_threshold: int = 300):
+        self.sample_rate = sample_rate
+        self.frame_bytes = sample_rate * frame_ms // 1000 * 2
+        self.silence_frames = max(1, silence_ms // frame_ms)
+        self.min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self.max_segment_frames = max(1, max_segment_ms // frame_ms)
+        self.threshold_ratio = threshold_ratio
+        self.min_threshold = min_threshold
+
+        self.noise_floor: Optional[float] = None
+        self._buffer = b""
+        self._pre_roll = deque(maxlen=max(1, pre_roll_ms // frame_ms))
+        self._segment: List[bytes] = []
+        self._speech_frames = 0
+        self._trailing_silence = 0
+
+    @property
+    def threshold(self) -> float:
+        if self.noise_floor is None:
+            return self.min_threshold
+        return max(self.min_threshold, self.noise_floor * self.threshold_ratio)
+
+    @property
+    def in_speech(self) -> bool:
+        return bool(self._segment)
+
+    def feed(self, pcm: bytes) -> List[bytes]:
+        """PCM ekle - kapanan segmentleri döndür"""
+        self._buffer += pcm
+        closed = []
+        while len(self._buffer) >= self.frame_bytes:
+            frame = self._buffer[:self.frame_bytes]
+            self._buffer = self._buffer[self.frame_bytes:]
+            segment = self._process_frame(frame)
+            if segment:
+                closed.append(segment)
+        return closed
+
+    def flush(self) -> Optional[bytes]:
+        """Akış bitti - açık segmenti kapat"""
+        if self._buffer and self._segment:
+            self._segment.append(self._buffer)
+        self._buffer = b""
+        return self._close_segment()
+
+    def _process_frame(self, frame: bytes) -> Optional[bytes]:
+        energy = audioop.rms(frame, 2)
+        is_speech = energy > self.threshold
+
+        if not self._segment:
+            if is_speech:
+                # Konuşma başlangıcını kaçırmamak için önceki çerçeveleri ekle
+                self._segment = list(self._pre_roll)
+                self._pre_roll.clear()
+                self._segment.append(frame)
+                self._speech_frames = 1
+                self._trailing_silence = 0
+            else:
+                self._update_noise_floor(energy)
+                self._pre_roll.append(frame)
+            return None
+
+        self._segment.append(frame)
+        if is_speech:
+            self._speech_frames += 1
+            self._trailing_silence = 0
+        else:
+            self._trailing_silence += 1
+
+        if self._trailing_silence >= self.silence_frames or len(self._segment) >= self.max_segment_frames:
+            return self._close_segment()
+        return None
+
+    def _update_noise_floor(self, energy: float):
+        if self.noise_floor is None:
+            self.noise_floor = float(energy)
+        else:
+            self.noise_floor = 0.95 * self.noise_floor + 0.05 * energy
+
+    def _close_segment(self) -> Optional[bytes]:
+        segment, speech_frames = self._segment, self._speech_frames
+        # Sondaki sessizliği pre-roll kadar bırakıp kırp
+        extra_silence = self._trailing_silence - self._pre_roll.maxlen
+        if extra_silence > 0:
+            segment = segment[:-extra_silence]
+        self._segment = []
+        self._speech_frames = 0
+        self._trailing_silence = 0
+        if speech_frames < self.min_speech_frames:
+            return None
+        return b"".join(segment)